@@ -30,6 +30,7 @@ def main():
     if tools_system.iniciar_ollama_servidor():
         # Proceed with the rest of the application logic
         tela.mainloop()
+        tela.encerrar()
 
 
 if __name__ == "__main__":
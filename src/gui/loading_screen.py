@@ -12,7 +12,7 @@ class LoadingScreen(tk.Tk):
         super().__init__()
         self.transcritor = transcritor
         self.title("Transcrição em Andamento")
-        self.geometry("300x170")
+        self.geometry("420x325")
         self.configure(bg="#f0f0f0")
         self.resizable(False, False)
 
@@ -50,6 +50,24 @@ class LoadingScreen(tk.Tk):
         )
         self.status_label.pack(pady=5)
 
+        # Velocidade (RTF) e tempo restante estimado
+        self.desempenho_label = tk.Label(
+            self, text="", font=("Helvetica", 9), fg="gray", bg="#f0f0f0"
+        )
+        self.desempenho_label.pack()
+
+        # Trecho mais recente da transcrição, atualizado a cada segmento
+        self.parcial_text = tk.Text(
+            self,
+            height=6,
+            width=50,
+            wrap="word",
+            font=("Helvetica", 9),
+            bg="#ffffff",
+            state="disabled",
+        )
+        self.parcial_text.pack(padx=10, pady=5)
+
         # Botão Cancelar
         self.btn_cancelar = tk.Button(
             self,
@@ -60,12 +78,58 @@ class LoadingScreen(tk.Tk):
         )
         self.btn_cancelar.pack(pady=10)
 
+        # Fechar a janela também interrompe a transcrição
+        self.protocol("WM_DELETE_WINDOW", self.cancelar)
+
+    def _na_interface(self, funcao, *args):
+        """
+        Agenda `funcao` na thread do Tk. Os métodos públicos de atualização
+        são chamados pela thread de transcrição, e o Tk não é thread-safe.
+        """
+        try:
+            self.after(0, funcao, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Janela já fechada
+
     def atualizar_progresso(self, valor, mensagem):
         """Atualiza a barra, a porcentagem e o status."""
+        self._na_interface(self._atualizar_progresso, valor, mensagem)
+
+    def _atualizar_progresso(self, valor, mensagem):
         self.progresso["value"] = valor
         self.percent_label.config(text=f"{int(valor)}%")
         self.status_label.config(text=mensagem)
-        self.update_idletasks()
+
+    def atualizar_desempenho(self, rtf, eta):
+        """
+        Mostra o fator de tempo real e o tempo restante estimado.
+
+        Args:
+            rtf (float | None): Segundos de processamento por segundo de áudio.
+            eta (float | None): Segundos estimados até o fim.
+        """
+        self._na_interface(self._atualizar_desempenho, rtf, eta)
+
+    def _atualizar_desempenho(self, rtf, eta):
+        if rtf is None:
+            self.desempenho_label.config(text="")
+            return
+        minutos, segundos = divmod(int(eta or 0), 60)
+        self.desempenho_label.config(
+            text=f"RTF {rtf:.2f}x · restante ~{minutos:02d}:{segundos:02d}"
+        )
+
+    def mostrar_parcial(self, texto):
+        """Acrescenta um segmento recém-transcrito à área de texto parcial."""
+        self._na_interface(self._mostrar_parcial, texto)
+
+    def _mostrar_parcial(self, texto):
+        self.parcial_text.config(state="normal")
+        if self.parcial_text.get("1.0", "end-1c"):
+            texto = " " + texto
+        self.parcial_text.insert("end", texto)
+        self.parcial_text.see("end")
+        self.parcial_text.config(state="disabled")
 
     def iniciar_transcricao(self):
         """Inicia a transcrição em thread paralela."""
@@ -73,15 +137,32 @@ class LoadingScreen(tk.Tk):
         threading.Thread(target=self.executar_transcricao, daemon=True).start()
 
     def executar_transcricao(self):
-        """Executa a transcrição e fecha após concluir."""
+        """Executa a transcrição (fora da thread do Tk) e fecha após concluir."""
         texto = self.transcritor.transcrever_audio()
-        if texto:
-            self.status_label.config(text="Transcrição concluída!")
+        sucesso = bool(texto or self.transcritor.transcription_success)
+        if self.transcritor.cancelamento.cancelado:
+            mensagem, espera = "Cancelado pelo usuário.", 500
+        elif sucesso:
+            mensagem, espera = "Transcrição concluída!", 2000
         else:
-            self.status_label.config(text="Erro na transcrição.")
-        self.after(2000, self.destroy)
+            mensagem, espera = "Erro na transcrição.", 2000
+        self._na_interface(self._encerrar, mensagem, espera)
+        self.transcritor.concluir_execucao(sucesso)
+
+    def fechar(self):
+        """Fecha a janela a partir de qualquer thread."""
+        self._na_interface(self.destroy)
+
+    def _encerrar(self, mensagem, espera):
+        self.status_label.config(text=mensagem)
+        self.after(espera, self.destroy)
 
     def cancelar(self):
-        """Cancela a transcrição e fecha a janela."""
-        self.status_label.config(text="Cancelado pelo usuário.")
-        self.after(1000, self.destroy)
+        """
+        Pede o cancelamento à thread de transcrição. A janela fecha quando
+        ela parar (ver executar_transcricao), depois de devolver o modelo e
+        abortar a requisição ao Ollama.
+        """
+        self.btn_cancelar.config(state="disabled")
+        self.status_label.config(text="Cancelando...")
+        self.transcritor.cancelamento.cancelar()
@@ -1,6 +1,7 @@
 import os
 import json
 import shutil
+import queue
 import logging
 import tempfile
 import subprocess
@@ -9,20 +10,50 @@ from pathlib import Path
 from tkinter import messagebox
 from src.tools.ia_preenche_forms import OllamaClient
 from src.tools.redis_connection import RedisConnection
+from src.tools.importacao_tardia import InstanciaTardia
+from src.tools.cancelamento import OperacaoCancelada
 
 
 logger = logging.getLogger(__name__)
-llm_question = OllamaClient()
+llm_question = InstanciaTardia(OllamaClient)
 
 
 class Questionario:
-    def __init__(self, uuid: str, loading_screen_instance=None):
+    def __init__(
+        self,
+        uuid: str,
+        loading_screen_instance=None,
+        respostas=None,
+        cancelamento=None,
+        reextrair=None,
+    ):
+        """
+        Args:
+            uuid (str): Chave do questionário no Redis.
+            loading_screen_instance (LoadingScreen, opcional): Fechada ao abrir.
+            respostas (queue.Queue, opcional): Respostas (id, texto) do LLM
+                ainda em andamento, que preenchem a tela à medida que chegam;
+                None marca o fim, e uma exceção, a falha da extração.
+            cancelamento (TokenCancelamento, opcional): Interrompe a extração
+                em andamento (botão Cancelar ou ao fechar a tela).
+            reextrair (callable, opcional): Inicia a extração de novo depois
+                de uma falha; retorna (respostas, cancelamento) da nova.
+        """
         self.uuid = uuid
         self.loading_screen = loading_screen_instance
         self.entry_widgets = {}  # Armazena os widgets de entrada
         self.perguntas = self.carrega_info_redis()  # Carrega perguntas do Redis
         self.questao_salva = False
         self.relatorio_button = None
+        self.regerar_button = None
+        self.respostas = respostas
+        self.cancelamento = cancelamento
+        self.reextrair = reextrair
+        self.salvar_button = None
+        self.cancelar_button = None
+        self.tentar_button = None
+        self.status_label = None
+        self._valores_llm = {}  # Último valor colocado pelo LLM em cada campo
 
     def carrega_info_redis(self) -> dict:
         """
@@ -55,6 +86,90 @@ class Questionario:
                 resposta = dados.get("resposta", "NDA")
                 entry.insert(0, resposta)
 
+    def _receber_respostas(self, root):
+        """
+        Coloca nos campos as respostas que chegaram do LLM. Campos editados
+        pelo usuário não são sobrescritos.
+        """
+        if self.respostas is None:
+            return
+        try:
+            while True:
+                item = self.respostas.get_nowait()
+                if isinstance(item, Exception):
+                    self.respostas = None
+                    self._falha_preenchimento(item)
+                    return
+                if item is None:
+                    self.respostas = None
+                    self.status_label.config(text="Preenchimento pelo LLM concluído.")
+                    self.salvar_button["state"] = tk.NORMAL
+                    self.cancelar_button["state"] = tk.DISABLED
+                    return
+                pergunta_id, resposta = item
+                entry = self.entry_widgets.get(pergunta_id)
+                if entry is None:
+                    continue
+                if entry.get() == self._valores_llm.get(pergunta_id, entry.get()):
+                    entry.delete(0, tk.END)
+                    entry.insert(0, resposta)
+                self._valores_llm[pergunta_id] = resposta
+                self.perguntas[pergunta_id]["resposta"] = resposta
+        except queue.Empty:
+            pass
+        preenchidas = len(self._valores_llm)
+        self.status_label.config(
+            text=f"Preenchendo com o LLM... {preenchidas} resposta(s) recebida(s)."
+        )
+        root.after(200, self._receber_respostas, root)
+
+    def _falha_preenchimento(self, erro: Exception):
+        """
+        Mostra que a extração não terminou. As respostas recebidas ficam na
+        tela e o questionário pode ser completado à mão e salvo (campos
+        vazios são salvos como NDA), ou a extração pode ser refeita.
+        """
+        if isinstance(erro, OperacaoCancelada):
+            mensagem = "Preenchimento pelo LLM cancelado."
+        else:
+            mensagem = f"Falha no preenchimento pelo LLM: {erro}"
+        logger.error(mensagem)
+        self.status_label.config(text=mensagem, fg="red")
+        self.salvar_button["state"] = tk.NORMAL
+        self.cancelar_button["state"] = tk.DISABLED
+        if self.reextrair is not None:
+            self.tentar_button["state"] = tk.NORMAL
+        if isinstance(erro, OperacaoCancelada):
+            return  # Pedido pelo usuário; o status já basta
+        messagebox.showerror(
+            "Erro",
+            f"{mensagem}\n\nAs respostas recebidas até aqui estão na tela. "
+            "Complete as que faltam e salve, ou use 'Tentar novamente'.",
+        )
+
+    def cancelar_preenchimento(self):
+        """Interrompe a extração em andamento; o que já chegou fica na tela."""
+        if self.respostas is None or self.cancelamento is None:
+            return
+        self.cancelar_button["state"] = tk.DISABLED
+        self.status_label.config(text="Cancelando o preenchimento...")
+        self.cancelamento.cancelar()
+
+    def tentar_novamente(self, root):
+        """Refaz a extração pelo LLM depois de uma falha ou cancelamento."""
+        self.tentar_button["state"] = tk.DISABLED
+        self.salvar_button["state"] = tk.DISABLED
+        self.cancelar_button["state"] = tk.NORMAL
+        self.status_label.config(text="Preenchendo com o LLM...", fg="gray")
+        self.respostas, self.cancelamento = self.reextrair()
+        self._receber_respostas(root)
+
+    def fechar(self, root):
+        """Fecha a tela, cancelando a extração se ela ainda estiver em andamento."""
+        if self.respostas is not None and self.cancelamento is not None:
+            self.cancelamento.cancelar()
+        root.destroy()
+
     def salvar_respostas(self):
         """
         Salva as respostas dos campos de entrada no Redis.
@@ -72,16 +187,21 @@ class Questionario:
             logger.info(f"Respostas salvas no Redis para UUID: {self.uuid}")
             messagebox.showinfo("Sucesso", "Respostas salvas com sucesso!")
             self.questao_salva = True
-            # Habilita o botão de relatório após o salvamento
+            # Habilita os botões de relatório após o salvamento
             if self.relatorio_button:
                 self.relatorio_button["state"] = tk.NORMAL
+                self.regerar_button["state"] = tk.NORMAL
         except Exception as e:
             logger.error(f"Erro ao salvar respostas no Redis: {e}")
             messagebox.showerror("Erro", "Falha ao salvar respostas.")
 
-    def gerar_relatorio(self):
+    def gerar_relatorio(self, usar_cache: bool = True):
         """
         Gera um relatório com base nas respostas atuais e salva em um arquivo.
+
+        Args:
+            usar_cache (bool): False gera o relatório de novo, mesmo que o
+                das mesmas respostas esteja no cache do LLM.
         """
         try:
             key_redis_llm = llm_question.inicio_llm(
@@ -89,6 +209,7 @@ class Questionario:
                 Path("/tmp/"),
                 Path("/tmp/"),
                 True,
+                usar_cache=usar_cache,
             )
             if key_redis_llm:
                 self._abrir_relatorio_no_libreoffice(key_redis_llm)
@@ -154,7 +275,7 @@ class Questionario:
             messagebox.showerror("Erro", "Nenhuma pergunta encontrada no Redis.")
             root.destroy()
             if self.loading_screen:
-                self.loading_screen.destroy()
+                self.loading_screen.fechar()
             return
 
         canvas = tk.Canvas(root)
@@ -181,6 +302,8 @@ class Questionario:
             self.entry_widgets[pergunta_id] = entry
 
         self._fill_entries_from_redis()
+        for pergunta_id, entry in self.entry_widgets.items():
+            self._valores_llm[pergunta_id] = entry.get()
 
         button_frame = tk.Frame(root)
         button_frame.pack(pady=10)
@@ -194,15 +317,52 @@ class Questionario:
         )
         self.relatorio_button.pack(padx=5, pady=2)
 
-        tk.Button(
+        self.regerar_button = tk.Button(
+            button_frame,
+            text="Gerar novamente",
+            width=16,
+            command=lambda: self.gerar_relatorio(usar_cache=False),
+            state=tk.DISABLED,
+        )
+        self.regerar_button.pack(padx=5, pady=2)
+
+        self.salvar_button = tk.Button(
             button_frame, text="Salvar", width=16, command=self.salvar_respostas
-        ).pack(padx=5, pady=2)
+        )
+        self.salvar_button.pack(padx=5, pady=2)
+
+        self.cancelar_button = tk.Button(
+            button_frame,
+            text="Cancelar",
+            width=16,
+            command=self.cancelar_preenchimento,
+            state=tk.DISABLED,
+        )
+        self.cancelar_button.pack(padx=5, pady=2)
 
-        tk.Button(button_frame, text="Fechar", width=16, command=root.destroy).pack(
-            padx=5, pady=2
+        self.tentar_button = tk.Button(
+            button_frame,
+            text="Tentar novamente",
+            width=16,
+            command=lambda: self.tentar_novamente(root),
+            state=tk.DISABLED,
         )
+        self.tentar_button.pack(padx=5, pady=2)
+
+        tk.Button(
+            button_frame, text="Fechar", width=16, command=lambda: self.fechar(root)
+        ).pack(padx=5, pady=2)
+        root.protocol("WM_DELETE_WINDOW", lambda: self.fechar(root))
+
+        self.status_label = tk.Label(button_frame, text="", fg="gray")
+        self.status_label.pack(padx=5, pady=2)
+        if self.respostas is not None:
+            # Salvar só depois que o LLM terminar de preencher
+            self.salvar_button["state"] = tk.DISABLED
+            self.cancelar_button["state"] = tk.NORMAL
+            self._receber_respostas(root)
 
         if self.loading_screen:
-            self.loading_screen.destroy()
+            self.loading_screen.fechar()
 
         root.mainloop()
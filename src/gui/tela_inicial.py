@@ -1,17 +1,20 @@
+import time
 import logging
 import platform
 import tkinter as tk
 from tkinter import messagebox, ttk
 from src.gui.questionario import Questionario
 from src.tools.transcricao import TranscricaoAudio
+from src.tools.modelo_whisper import modelo_whisper
 from src.setup_audio.rec_audio import GravadorAudio
 from src.tools.redis_connection import RedisConnection
+from src.tools.importacao_tardia import InstanciaTardia
 
 
 logger = logging.getLogger(__name__)
 
-redis = RedisConnection()
-transcricao = TranscricaoAudio()
+redis = InstanciaTardia(RedisConnection)
+transcricao = InstanciaTardia(TranscricaoAudio)
 
 
 class Application(tk.Tk):
@@ -19,10 +22,16 @@ class Application(tk.Tk):
     def __init__(self):
         self.tempo_segundos = 0
         self.timer_id = None
+        # Sessões paradas esperando a transcrição em andamento: (key, usar_cache_llm)
+        self.fila_transcricao = []
         super().__init__()
         self.gravador = GravadorAudio()
+        if transcricao.incremental is not None:
+            # Cada parte gravada já segue para a transcrição em segundo plano
+            self.gravador.ao_concluir_trecho = transcricao.incremental.enfileirar
+            self.gravador.ao_finalizar_sessao = transcricao.incremental.finalizar_sessao
         self.title("Gravação de Sessão - Acupuntura")
-        self.geometry("495x360")
+        self.geometry("495x420")
         self.configure(bg="#f0f0f0")
         self.resizable(False, False)
         self.sexo_options = ["Masculino", "Feminino", "Outro"]
@@ -121,6 +130,16 @@ class Application(tk.Tk):
         self.btn_parar.config(command=self.parar_gravacao)  # Vincular comando
         self.btn_parar.grid(row=1, column=1, padx=5, pady=10)
 
+        # Ignora o cache do LLM na próxima transcrição (respostas ruins)
+        self.regerar_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            self.botoes_frame,
+            text="Gerar respostas novamente (ignorar cache do LLM)",
+            variable=self.regerar_var,
+            font=("Helvetica", 10),
+            bg="#f0f0f0",
+        ).grid(row=2, column=0, columnspan=2)
+
         # Status da gravação
         self.status_label = tk.Label(
             self,
@@ -138,6 +157,15 @@ class Application(tk.Tk):
             bg="#f0f0f0",
         )
         self.tempo_label.pack(pady=5)
+        # Estado do pré-carregamento do modelo de transcrição
+        self.modelo_label = tk.Label(
+            self,
+            text="",
+            font=("Helvetica", 10, "italic"),
+            fg="gray",
+            bg="#f0f0f0",
+        )
+        self.modelo_label.pack()
 
     def iniciar_gravacao(self):
         nome_paciente = self.nome_entry.get().strip()
@@ -163,10 +191,18 @@ class Application(tk.Tk):
         self.status_label.config(text="Status: Gravando...", fg="green")
         self.tempo_segundos = 0
         self.atualizar_tempo()
+        # Carrega o modelo de transcrição enquanto a consulta é gravada
+        transcricao.precarregar_modelo()
+        self.atualizar_estado_modelo()
         self.btn_gravar.config(state="disabled")
         self.btn_pausar.config(state="normal")
         self.btn_parar.config(state="normal")
 
+    def encerrar(self):
+        """Finaliza o que ainda roda em segundo plano antes de sair."""
+        if transcricao.criado:
+            transcricao.encerrar()
+
     def atualizar_tempo(self):
         minutos = self.tempo_segundos // 60
         segundos = self.tempo_segundos % 60
@@ -174,6 +210,26 @@ class Application(tk.Tk):
         self.tempo_segundos += 1
         self.timer_id = self.after(1000, self.atualizar_tempo)
 
+    def atualizar_estado_modelo(self):
+        """Mostra o andamento do pré-carregamento do modelo WhisperX."""
+        estado = modelo_whisper.estado
+        if estado == "carregando":
+            inicio = modelo_whisper.inicio_carga or time.monotonic()
+            decorrido = time.monotonic() - inicio
+            self.modelo_label.config(
+                text=f"🧠 Carregando modelo de transcrição... ({decorrido:.0f}s)",
+                fg="gray",
+            )
+            self.after(500, self.atualizar_estado_modelo)
+        elif estado == "carregado":
+            self.modelo_label.config(text="🧠 Modelo de transcrição pronto", fg="green")
+        elif estado == "erro":
+            self.modelo_label.config(
+                text="🧠 Falha no pré-carregamento (será carregado ao parar)", fg="red"
+            )
+        else:
+            self.modelo_label.config(text="")
+
     def parar_tempo(self):
         if self.timer_id:
             self.after_cancel(self.timer_id)
@@ -216,7 +272,7 @@ class Application(tk.Tk):
             "Qual é a ocupação/profissão do paciente?": profissao_paciente,
         }
 
-        self.gravador.parar_gravacao(self.nome_entry.get().strip())
+        caminho_completo = self.gravador.parar_gravacao(self.nome_entry.get().strip())
         self.status_label.config(text="Status: Parado", fg="gray")
         self.parar_tempo()
         # Reabilitar "Iniciar" e desabilitar "Pausar", "Retomar" e "Parar"
@@ -230,12 +286,59 @@ class Application(tk.Tk):
         self.sexo_combobox.set("Selecione...")
         self.nome_entry.focus()
 
+        if self.gravador.erro is not None:
+            if caminho_completo:
+                messagebox.showwarning(
+                    "Aviso",
+                    f"Falha na gravação em disco: {self.gravador.erro}\n\n"
+                    f"O áudio recuperado foi salvo em {caminho_completo}.",
+                )
+            else:
+                messagebox.showerror(
+                    "Erro", f"Falha na gravação do áudio: {self.gravador.erro}"
+                )
+                self.status_label.config(text="Erro na gravação do áudio.", fg="red")
+                return
+
         key = redis.set_value(dados_paciente)
         logger.info(f"Dados salvos no Redis com chave: {key}")
         if not key:
             self.status_label.config(text="Erro ao salvar dados no Redis.", fg="red")
             return
-        try:
-            transcricao.carregar_modelo(key)
-        finally:
-            self.destroy()
+        # A janela continua aberta para a próxima consulta, e o modelo
+        # WhisperX continua carregado entre elas.
+        self.fila_transcricao.append((key, not self.regerar_var.get()))
+        self.regerar_var.set(False)
+        self.iniciar_proxima_transcricao()
+
+    def iniciar_proxima_transcricao(self):
+        """Transcreve a próxima sessão parada, se nenhuma estiver em andamento."""
+        if not self.fila_transcricao:
+            return
+        if transcricao.em_andamento:
+            self._status_transcricao(
+                f"Status: {len(self.fila_transcricao)} sessão(ões) na fila", "gray"
+            )
+            return
+        key, usar_cache_llm = self.fila_transcricao.pop(0)
+        self._status_transcricao("Status: Transcrevendo...", "gray")
+        transcricao.carregar_modelo(
+            key,
+            usar_cache_llm,
+            ao_concluir=lambda sucesso: self.after(
+                0, self.transcricao_concluida, sucesso
+            ),
+        )
+
+    def transcricao_concluida(self, sucesso: bool):
+        """Mostra o resultado da transcrição e inicia a próxima da fila."""
+        if sucesso:
+            self._status_transcricao("Status: Aguardando", "gray")
+        else:
+            self._status_transcricao("Erro na transcrição.", "red")
+        self.iniciar_proxima_transcricao()
+
+    def _status_transcricao(self, texto: str, cor: str):
+        """Mostra o estado da transcrição, sem cobrir o de uma nova gravação."""
+        if not self.gravador.gravando:
+            self.status_label.config(text=texto, fg=cor)
@@ -0,0 +1,87 @@
+import os
+import json
+import queue
+import logging
+import threading
+import soundfile as sf
+from src.setup_audio import formatos_audio
+
+logger = logging.getLogger(__name__)
+
+
+class ArquivadorSessao:
+    """
+    Compacta, em segundo plano, as sessões que já foram transcritas.
+
+    O '_completo.wav' é recodificado em FLAC (sem perdas) e, depois de
+    conferido o número de frames, o WAV e as partes listadas no manifesto
+    '_partes.json' são apagados.
+
+    O FLAC é escrito com o sufixo '.parcial' e só ganha o nome final quando
+    está completo: se a aplicação fechar no meio, o WAV continua intacto.
+    Chame `aguardar` antes de encerrar (ver TranscricaoAudio.encerrar).
+    """
+
+    def __init__(self, formato: str = "flac"):
+        self.formato = formato
+        self.fila = queue.Queue()
+        self._thread = None
+
+    def arquivar(self, caminho_completo: str):
+        """Agenda o arquivamento de uma sessão já transcrita."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._executar, daemon=True)
+            self._thread.start()
+        self.fila.put(caminho_completo)
+
+    def aguardar(self):
+        """Bloqueia até que todas as sessões agendadas sejam arquivadas."""
+        if self.fila.unfinished_tasks:
+            logger.info("Aguardando o arquivamento das sessões...")
+        self.fila.join()
+
+    def _executar(self):
+        while True:
+            caminho = self.fila.get()
+            try:
+                self._arquivar_sessao(caminho)
+            except Exception as e:
+                logger.error(f"Erro ao arquivar {caminho}: {e}")
+            finally:
+                self.fila.task_done()
+
+    def _arquivar_sessao(self, caminho_completo: str):
+        base, extensao = os.path.splitext(caminho_completo)
+
+        if extensao == ".wav":
+            destino = base + formatos_audio.FORMATOS[self.formato]["extensao"]
+            parcial = destino + ".parcial"
+            try:
+                frames = formatos_audio.comprimir(
+                    caminho_completo, parcial, self.formato
+                )
+                if frames != sf.info(caminho_completo).frames:
+                    raise ValueError(f"Compactação incompleta de {caminho_completo}")
+                os.replace(parcial, destino)
+            finally:
+                if os.path.exists(parcial):
+                    os.remove(parcial)
+            tamanho_wav = os.path.getsize(caminho_completo)
+            os.remove(caminho_completo)
+            logger.info(
+                f"[🗜️] {os.path.basename(destino)} salvo "
+                f"({os.path.getsize(destino) / tamanho_wav:.0%} do WAV)."
+            )
+            caminho_completo = destino
+
+        caminho_manifesto = base + "_partes.json"
+        if not os.path.exists(caminho_manifesto):
+            return
+        with open(caminho_manifesto, "r", encoding="utf-8") as f:
+            manifesto = json.load(f)
+
+        for item in manifesto:
+            parte = item["arquivo"]
+            if parte != caminho_completo and os.path.exists(parte):
+                os.remove(parte)
+                logger.info(f"[🗑️] Parte removida: {os.path.basename(parte)}")
@@ -0,0 +1,100 @@
+import threading
+import numpy as np
+
+
+class BufferAudio:
+    """
+    Buffer de captura em blocos pré-alocados (arena) para o GravadorAudio.
+
+    O callback do sounddevice copia cada bloco recebido para a posição
+    corrente da arena, sem criar arrays novos a cada chamada. Quando um
+    bloco da arena enche, o próximo é reaproveitado (ou reservado com
+    np.empty, que só compromete memória quando as páginas são escritas).
+    Os dados já gravados nunca são copiados ao crescer.
+    """
+
+    def __init__(self, taxa_amostragem=44100, canais=1, segundos_por_bloco=30):
+        self.fs = taxa_amostragem
+        self.canais = canais
+        self.frames_por_bloco = int(taxa_amostragem * segundos_por_bloco)
+        self._blocos = [self._novo_bloco()]
+        self._bloco_atual = 0
+        self._posicao = 0
+        self._lock = threading.Lock()
+        self.overruns = 0
+
+    def _novo_bloco(self):
+        return np.empty((self.frames_por_bloco, self.canais), dtype=np.int16)
+
+    def escrever(self, indata):
+        """
+        Copia um bloco do callback para a arena. Chamado na thread de áudio.
+
+        Args:
+            indata (np.ndarray): Bloco int16 com formato (frames, canais).
+        """
+        with self._lock:
+            restante = len(indata)
+            origem = 0
+            while restante > 0:
+                if self._posicao == self.frames_por_bloco:
+                    self._bloco_atual += 1
+                    self._posicao = 0
+                    if self._bloco_atual == len(self._blocos):
+                        self._blocos.append(self._novo_bloco())
+
+                bloco = self._blocos[self._bloco_atual]
+                n = min(restante, self.frames_por_bloco - self._posicao)
+                bloco[self._posicao : self._posicao + n] = indata[origem : origem + n]
+                self._posicao += n
+                origem += n
+                restante -= n
+
+    def registrar_status(self, status):
+        """Contabiliza overruns reportados pelo PortAudio no callback."""
+        if status and status.input_overflow:
+            self.overruns += 1
+
+    def visoes(self):
+        """
+        Retorna as fatias preenchidas da arena, em ordem, sem copiar dados.
+
+        Returns:
+            list[np.ndarray]: Visões (views) int16 de cada bloco usado.
+        """
+        with self._lock:
+            visoes = [bloco for bloco in self._blocos[: self._bloco_atual]]
+            visoes.append(self._blocos[self._bloco_atual][: self._posicao])
+        return [v for v in visoes if len(v)]
+
+    def limpar(self):
+        """Volta a posição de escrita ao início, mantendo os blocos alocados."""
+        with self._lock:
+            self._bloco_atual = 0
+            self._posicao = 0
+
+    @property
+    def frames(self):
+        """Número de frames gravados desde o último limpar()."""
+        return self._bloco_atual * self.frames_por_bloco + self._posicao
+
+    @property
+    def capacidade(self):
+        """Número de frames que a arena comporta sem reservar novos blocos."""
+        return len(self._blocos) * self.frames_por_bloco
+
+    def __len__(self):
+        return self.frames
+
+    def get_stats(self):
+        """Retorna estatísticas de ocupação do buffer."""
+        frames = self.frames
+        capacidade = self.capacidade
+        return {
+            "frames": frames,
+            "duracao": frames / self.fs,
+            "capacidade": capacidade,
+            "ocupacao": frames / capacidade if capacidade else 0,
+            "blocos_alocados": len(self._blocos),
+            "overruns": self.overruns,
+        }
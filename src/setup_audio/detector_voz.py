@@ -0,0 +1,136 @@
+import os
+import json
+import numpy as np
+
+
+class DetectorVoz:
+    """
+    Detector de atividade de voz (VAD) por energia e espectro, aplicado
+    bloco a bloco no callback de captura.
+
+    Um bloco é considerado fala quando a energia fica acima do piso de
+    ruído estimado e a maior parte dela está na faixa da voz (300-3400 Hz).
+    Os trechos de fala são indexados na linha do tempo do arquivo salvo.
+    No modo "descartar", silêncios mais longos que `silencio_max` segundos
+    deixam de ser gravados; no modo "marcar" tudo é gravado e só o índice
+    é gerado.
+    """
+
+    MODOS = ("marcar", "descartar")
+
+    def __init__(
+        self,
+        taxa_amostragem: int,
+        modo: str = "marcar",
+        silencio_max: float = 3.0,
+        margem: float = 0.3,
+        limiar_db: float = 9.0,
+    ):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de VAD inválido: {modo}")
+        self.fs = taxa_amostragem
+        self.modo = modo
+        self.silencio_max = silencio_max
+        self.margem = margem
+        self.limiar_db = limiar_db
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Zera o estado para uma nova sessão."""
+        self.frames_saida = 0  # Frames entregues ao arquivo
+        self.frames_descartados = 0
+        self.trechos_fala = []
+        self._piso_db = None
+        self._inicio_fala = None
+        self._desde_fala = 0.0  # Segundos desde o último bloco com fala
+        self._silencio = 0.0  # Segundos contínuos sem fala
+
+    def _eh_fala(self, mono: np.ndarray, duracao: float) -> bool:
+        energia = float(np.mean(mono * mono)) + 1e-10
+        energia_db = 10 * np.log10(energia / (32768.0**2))
+
+        # Piso de ruído: acompanha quedas na hora e sobe 0,5 dB por segundo
+        if self._piso_db is None or energia_db < self._piso_db:
+            self._piso_db = energia_db
+        else:
+            self._piso_db += 0.5 * duracao
+
+        if energia_db < self._piso_db + self.limiar_db or energia_db < -60:
+            return False
+
+        espectro = np.abs(np.fft.rfft(mono)) ** 2
+        freqs = np.fft.rfftfreq(len(mono), 1 / self.fs)
+        faixa_voz = espectro[(freqs >= 300) & (freqs <= 3400)].sum()
+        return faixa_voz > 0.5 * (espectro.sum() + 1e-10)
+
+    def processar(self, bloco: np.ndarray):
+        """
+        Classifica um bloco e atualiza o índice de fala.
+
+        Args:
+            bloco (np.ndarray): Bloco int16 com formato (frames, canais).
+
+        Returns:
+            np.ndarray | None: O próprio bloco, ou None se ele deve ser
+            descartado (modo "descartar").
+        """
+        n = len(bloco)
+        if n == 0:
+            return bloco
+        duracao = n / self.fs
+        mono = bloco.mean(axis=1, dtype=np.float32)
+
+        if self._eh_fala(mono, duracao):
+            self._desde_fala = 0.0
+            self._silencio = 0.0
+            if self._inicio_fala is None:
+                recuo = min(int(self.margem * self.fs), self.frames_saida)
+                self._inicio_fala = self.frames_saida - recuo
+        else:
+            self._desde_fala += duracao
+            self._silencio += duracao
+            if self._inicio_fala is not None and self._desde_fala > self.margem:
+                self._fechar_trecho()
+
+        if self.modo == "descartar" and self._silencio > self.silencio_max:
+            self.frames_descartados += n
+            return None
+
+        self.frames_saida += n
+        return bloco
+
+    def _fechar_trecho(self):
+        self.trechos_fala.append(
+            [self._inicio_fala / self.fs, self.frames_saida / self.fs]
+        )
+        self._inicio_fala = None
+
+    def finalizar(self):
+        """Fecha o trecho de fala em aberto no fim da gravação."""
+        if self._inicio_fala is not None:
+            self._fechar_trecho()
+
+    def salvar_indice(self, caminho_audio: str) -> str:
+        """
+        Salva o índice de trechos de fala ao lado do arquivo de áudio.
+
+        Args:
+            caminho_audio (str): Caminho do arquivo _completo.wav.
+
+        Returns:
+            str: Caminho do arquivo de índice (_fala.json).
+        """
+        self.finalizar()
+        caminho_indice = os.path.splitext(caminho_audio)[0] + "_fala.json"
+        indice = {
+            "modo": self.modo,
+            "duracao": self.frames_saida / self.fs,
+            "silencio_descartado": self.frames_descartados / self.fs,
+            "trechos": [[round(a, 3), round(b, 3)] for a, b in self.trechos_fala],
+        }
+        with open(caminho_indice, "w", encoding="utf-8") as f:
+            json.dump(indice, f, indent=2)
+        print(
+            f"[🗣️] {len(self.trechos_fala)} trechos de fala indexados em: {caminho_indice}"
+        )
+        return caminho_indice
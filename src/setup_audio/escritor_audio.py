@@ -0,0 +1,154 @@
+import os
+import time
+import queue
+import threading
+from src.setup_audio import wav_pcm, formatos_audio
+
+_FIM = object()
+
+
+class EscritorAudio(threading.Thread):
+    """
+    Thread que grava em disco, de forma contínua, os blocos recebidos do
+    callback de áudio.
+
+    O callback apenas coloca cópias dos blocos em uma fila limitada; esta
+    thread anexa os blocos ao arquivo (WAV, FLAC ou Opus) e, a cada
+    `intervalo_sync` segundos, atualiza o cabeçalho e força a escrita no
+    disco. Assim o uso de memória fica constante e o áudio sobrevive a uma
+    queda do programa.
+
+    Se `ao_concluir_trecho` for informado, ele é chamado com
+    (caminho, frame_inicial, frames) cada vez que `segundos_por_trecho`
+    de áudio já estão sincronizados no disco, e uma última vez ao fechar.
+    Em FLAC/Opus o aviso acontece apenas ao fechar o arquivo.
+
+    Se a escrita falhar (pasta inexistente, disco cheio), a exceção fica em
+    `erro`, a thread termina e `ativo` passa a ser False: os blocos seguintes
+    não são mais aceitos e devem ir para outro destino.
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        taxa_amostragem: int,
+        canais: int,
+        max_blocos: int = 256,
+        intervalo_sync: float = 5.0,
+        ao_concluir_trecho=None,
+        segundos_por_trecho: float = 60.0,
+        formato: str = "wav",
+    ):
+        super().__init__(daemon=True)
+        self.caminho = caminho
+        self.fs = taxa_amostragem
+        self.canais = canais
+        self.formato = formato
+        self.intervalo_sync = intervalo_sync
+        self.ao_concluir_trecho = ao_concluir_trecho
+        self.frames_por_trecho = int(segundos_por_trecho * taxa_amostragem)
+        self.fila = queue.Queue(maxsize=max_blocos)
+        self.frames_gravados = 0
+        self._bytes_dados = 0
+        self._frames_notificados = 0
+        self.blocos_descartados = 0
+        self.erro = None
+
+    @property
+    def ativo(self) -> bool:
+        """True enquanto a thread está gravando sem erro."""
+        return self.erro is None and self.is_alive()
+
+    def enfileirar(self, bloco):
+        """
+        Entrega um bloco para a thread de escrita. Chamado no callback de
+        áudio; nunca bloqueia.
+
+        Args:
+            bloco (np.ndarray): Bloco int16 com formato (frames, canais).
+        """
+        if not self.ativo:
+            self.blocos_descartados += 1
+            return
+        try:
+            self.fila.put_nowait(bloco.copy())
+        except queue.Full:
+            self.blocos_descartados += 1
+
+    def run(self):
+        ultimo_sync = time.monotonic()
+        try:
+            with self._abrir() as arquivo:
+                while True:
+                    try:
+                        bloco = self.fila.get(timeout=0.5)
+                        if bloco is _FIM:
+                            break
+                        self._escrever(arquivo, bloco)
+                    except queue.Empty:
+                        pass
+
+                    if time.monotonic() - ultimo_sync >= self.intervalo_sync:
+                        self._sincronizar(arquivo)
+                        ultimo_sync = time.monotonic()
+
+                self._sincronizar(arquivo)
+            self._notificar(final=True)
+        except (OSError, RuntimeError) as e:
+            self.erro = e
+            print(f"[❌] Erro ao gravar {self.caminho}: {e}")
+
+    def _abrir(self):
+        if self.formato == "wav":
+            f = open(self.caminho, "wb")
+            wav_pcm.escrever_cabecalho(f, self.fs, self.canais)
+            return f
+        return formatos_audio.abrir_escrita(
+            self.caminho, self.formato, self.fs, self.canais
+        )
+
+    def _escrever(self, arquivo, bloco):
+        arquivo.write(bloco)
+        self._bytes_dados += bloco.nbytes
+        self.frames_gravados += len(bloco)
+
+    def _sincronizar(self, arquivo):
+        if self.formato != "wav":
+            # Os quadros FLAC/Opus já escritos continuam decodificáveis
+            arquivo.flush()
+            return
+
+        wav_pcm.atualizar_cabecalho(arquivo, self._bytes_dados)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+        self._notificar()
+
+    def _notificar(self, final=False):
+        if self.ao_concluir_trecho is None:
+            return
+        pendentes = self.frames_gravados - self._frames_notificados
+        if pendentes >= self.frames_por_trecho or (final and pendentes > 0):
+            self.ao_concluir_trecho(self.caminho, self._frames_notificados, pendentes)
+            self._frames_notificados = self.frames_gravados
+
+    def fechar(self):
+        """
+        Esvazia a fila, finaliza o cabeçalho e aguarda a thread terminar.
+        Não bloqueia se a thread já terminou por erro com a fila cheia.
+        """
+        while self.is_alive():
+            try:
+                self.fila.put(_FIM, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+        self.join()
+
+    def get_stats(self):
+        """Retorna estatísticas da escrita em disco."""
+        return {
+            "frames": self.frames_gravados,
+            "duracao": self.frames_gravados / self.fs,
+            "fila_ocupacao": self.fila.qsize() / self.fila.maxsize,
+            "blocos_descartados": self.blocos_descartados,
+        }
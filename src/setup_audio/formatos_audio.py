@@ -0,0 +1,110 @@
+import soundfile as sf
+from src.setup_audio import wav_pcm
+
+FORMATOS = {
+    "wav": {"extensao": ".wav", "format": "WAV", "subtype": "PCM_16"},
+    "flac": {"extensao": ".flac", "format": "FLAC", "subtype": "PCM_16"},
+    "opus": {"extensao": ".ogg", "format": "OGG", "subtype": "OPUS"},
+}
+
+EXTENSOES_AUDIO = tuple(f["extensao"] for f in FORMATOS.values())
+
+# Taxas aceitas pelo codificador Opus
+TAXAS_OPUS = (8000, 12000, 16000, 24000, 48000)
+
+
+def validar_formato(formato: str, taxa_amostragem: int):
+    """
+    Verifica se o formato é conhecido e compatível com a taxa de amostragem.
+
+    Raises:
+        ValueError: Se o formato for desconhecido ou a taxa não for aceita.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(
+            f"Formato de gravação inválido: {formato} (use {', '.join(FORMATOS)})"
+        )
+    if formato == "opus" and taxa_amostragem not in TAXAS_OPUS:
+        raise ValueError(
+            f"Opus não aceita {taxa_amostragem} Hz. "
+            "Use GRAVACAO_TAXA_SAIDA=16000 ou o formato flac."
+        )
+
+
+def abrir_escrita(caminho: str, formato: str, taxa_amostragem: int, canais: int):
+    """Abre um arquivo de áudio para escrita no formato indicado."""
+    config = FORMATOS[formato]
+    return sf.SoundFile(
+        caminho,
+        "w",
+        samplerate=taxa_amostragem,
+        channels=canais,
+        format=config["format"],
+        subtype=config["subtype"],
+    )
+
+
+def concatenar(
+    partes: list, destino: str, formato: str, frames_por_bloco: int = 65536
+) -> list:
+    """
+    Concatena arquivos de áudio em um único arquivo no formato indicado.
+
+    Em WAV os frames PCM são copiados sem decodificar (wav_pcm.concatenar).
+    Nos formatos comprimidos as partes são decodificadas e recodificadas
+    bloco a bloco, com memória limitada ao tamanho do bloco.
+
+    Returns:
+        list: Manifesto no mesmo formato de wav_pcm.concatenar.
+
+    Raises:
+        ValueError: Se as partes tiverem taxas ou canais diferentes.
+    """
+    if formato == "wav":
+        return wav_pcm.concatenar(partes, destino)
+
+    infos = [sf.info(parte) for parte in partes]
+    formato_partes = {(i.samplerate, i.channels) for i in infos}
+    if len(formato_partes) != 1:
+        raise ValueError(f"Partes com formatos diferentes: {formato_partes}")
+    taxa, canais = formato_partes.pop()
+
+    manifesto = []
+    frame_inicial = 0
+    with abrir_escrita(destino, formato, taxa, canais) as saida:
+        for parte in partes:
+            frames = 0
+            for bloco in sf.blocks(parte, blocksize=frames_por_bloco, dtype="int16"):
+                saida.write(bloco)
+                frames += len(bloco)
+
+            manifesto.append(
+                {
+                    "arquivo": parte,
+                    "frame_inicial": frame_inicial,
+                    "frames": frames,
+                    "inicio": frame_inicial / taxa,
+                    "duracao": frames / taxa,
+                }
+            )
+            frame_inicial += frames
+
+    return manifesto
+
+
+def comprimir(
+    origem: str, destino: str, formato: str = "flac", frames_por_bloco: int = 65536
+) -> int:
+    """
+    Recodifica um arquivo de áudio bloco a bloco no formato indicado.
+
+    Returns:
+        int: Número de frames escritos.
+    """
+    info = sf.info(origem)
+    frames = 0
+    with abrir_escrita(destino, formato, info.samplerate, info.channels) as saida:
+        for bloco in sf.blocks(origem, blocksize=frames_por_bloco, dtype="int16"):
+            saida.write(bloco)
+            frames += len(bloco)
+    return frames
@@ -1,9 +1,12 @@
 import os
+import time
 import shutil
 import numpy as np
 import soundfile as sf
 from pydub import AudioSegment
-from scipy.signal import butter, sosfilt
+from functools import lru_cache
+from scipy.signal import butter, sosfilt, zpk2sos
+from src.setup_audio.reducao_ruido import RedutorRuido
 
 
 class PreprocessadorAudio:
@@ -12,15 +15,30 @@ class PreprocessadorAudio:
     Foca apenas em melhorar a clareza da voz humana.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, reducao_ruido: bool = None):
+        """
+        Args:
+            reducao_ruido (bool, opcional): Ativa a etapa de redução de ruído
+                (filtro de Wiener). Se None, usa PREPROCESSAMENTO_REDUCAO_RUIDO.
+        """
+        if reducao_ruido is None:
+            reducao_ruido = os.getenv(
+                "PREPROCESSAMENTO_REDUCAO_RUIDO", "false"
+            ).lower() in ("1", "true", "sim")
+        self.reducao_ruido = reducao_ruido
+        self.tempos = {}  # Segundos gastos em cada etapa do último processamento
 
-    def processar(self, caminho_audio: str) -> str:
+    def processar(
+        self, caminho_audio: str, streaming: bool = False, tamanho_bloco: int = 65536
+    ) -> str:
         """
         Processa o áudio para realçar a voz humana.
 
         Args:
             caminho_audio (str): Caminho do arquivo original WAV.
+            streaming (bool): Processa o arquivo em blocos, com memória
+                limitada pelo tamanho do bloco e não pela duração do áudio.
+            tamanho_bloco (int): Frames por bloco no modo streaming.
 
         Returns:
             str: Caminho do arquivo processado.
@@ -32,27 +50,50 @@ class PreprocessadorAudio:
         nome, ext = os.path.splitext(caminho_audio)
         caminho_saida = f"{nome}_normalizado{ext}"
 
+        self.tempos = {}
         try:
+            if streaming:
+                self._processar_em_blocos(caminho_audio, caminho_saida, tamanho_bloco)
+                self._exibir_tempos()
+                print(f"[✅] Voz realçada salva em: {caminho_saida}")
+                return caminho_saida
+
             # 1. Carregar áudio
-            data, rate = sf.read(caminho_audio)
+            inicio = time.perf_counter()
+            data, rate = sf.read(caminho_audio, dtype="float32")
 
             # Converter para mono se necessário
             if len(data.shape) > 1:
-                data = np.mean(data, axis=1)
+                data = np.mean(data, axis=1, dtype=np.float32)
+            self._medir("leitura", inicio)
 
             print(f"[📊] Taxa: {rate}Hz, Duração: {len(data)/rate:.1f}s")
 
-            # 2. Aplicar filtro para realce de voz
+            # 2. Redução de ruído (opcional)
+            if self.reducao_ruido:
+                print("[🔇] Reduzindo ruído de fundo...")
+                inicio = time.perf_counter()
+                data = RedutorRuido(rate).reduzir(data)
+                self._medir("reducao_ruido", inicio)
+
+            # 3. Aplicar filtro para realce de voz
             print("[�] Realçando frequências da voz...")
+            inicio = time.perf_counter()
             voz_realcada = self._realcar_voz(data, rate)
+            self._medir("realce", inicio)
 
-            # 3. Normalização suave
+            # 4. Normalização suave
             print("[📢] Ajustando volume...")
+            inicio = time.perf_counter()
             voz_normalizada = self._normalizar_suave(voz_realcada)
+            self._medir("normalizacao", inicio)
 
-            # 4. Salvar
+            # 5. Salvar
+            inicio = time.perf_counter()
             sf.write(caminho_saida, voz_normalizada, rate)
+            self._medir("escrita", inicio)
 
+            self._exibir_tempos()
             print(f"[✅] Voz realçada salva em: {caminho_saida}")
             return caminho_saida
 
@@ -62,48 +103,109 @@ class PreprocessadorAudio:
             shutil.copy2(caminho_audio, caminho_saida)
             return caminho_saida
 
-    def _realcar_voz(self, data, rate):
+    def _processar_em_blocos(self, caminho_audio, caminho_saida, tamanho_bloco):
         """
-        Aplica filtros para realçar a voz humana (300-3400 Hz).
+        Realça a voz lendo o arquivo em blocos, em duas passadas: a primeira
+        mede o pico do sinal filtrado e a segunda aplica ganho e compressão.
+        O estado dos filtros (zi) é levado de um bloco para o outro, então o
+        resultado é o mesmo do processamento do arquivo inteiro.
         """
-        # Filtro passa-faixa para voz
-        voz_filtrada = self._filtro_voz(data, rate, 300, 3400)
+        info = sf.info(caminho_audio)
+        rate = info.samplerate
+        print(f"[📊] Taxa: {rate}Hz, Duração: {info.duration:.1f}s (em blocos)")
 
-        # Realce adicional na faixa crítica da voz (1000-2000 Hz)
-        realce = self._filtro_realce(data, rate, 1000, 2000)
+        redutor = None
+        if self.reducao_ruido:
+            print("[🔇] Estimando o perfil de ruído...")
+            inicio = time.perf_counter()
+            redutor = RedutorRuido(rate)
+            amostras, _ = sf.read(
+                caminho_audio,
+                frames=int(redutor.segundos_perfil * rate),
+                dtype="float32",
+                always_2d=True,
+            )
+            redutor.estimar_perfil(amostras.mean(axis=1, dtype=np.float32))
+            self._medir("reducao_ruido", inicio)
 
-        # Combinar: 70% filtro principal + 30% realce
-        resultado = 0.7 * voz_filtrada + 0.3 * realce
+        # 1ª passada: pico do sinal realçado
+        print("[🔊] Medindo o pico do sinal realçado...")
+        peak = 0.0
+        for voz_realcada in self._realcar_em_blocos(
+            caminho_audio, rate, tamanho_bloco, redutor
+        ):
+            peak = max(peak, float(np.max(np.abs(voz_realcada), initial=0.0)))
 
-        return resultado
+        # 2ª passada: ganho e compressão, gravando bloco a bloco
+        print("[📢] Ajustando volume...")
+        with sf.SoundFile(
+            caminho_saida, "w", samplerate=rate, channels=1, format=info.format
+        ) as saida:
+            for voz_realcada in self._realcar_em_blocos(
+                caminho_audio, rate, tamanho_bloco, redutor
+            ):
+                inicio = time.perf_counter()
+                voz_normalizada = self._aplicar_ganho(voz_realcada, peak)
+                self._medir("normalizacao", inicio)
 
-    def _filtro_voz(self, data, rate, freq_baixa, freq_alta):
-        """
-        Filtro passa-faixa para isolar frequências da voz.
-        """
-        nyq = rate / 2
-        low = freq_baixa / nyq
-        high = freq_alta / nyq
+                inicio = time.perf_counter()
+                saida.write(voz_normalizada)
+                self._medir("escrita", inicio)
+
+    def _realcar_em_blocos(self, caminho_audio, rate, tamanho_bloco, redutor=None):
+        """Gera os blocos realçados, mantendo o estado dos filtros."""
+        sos = sos_realce_voz(rate)
+        zi = np.zeros((sos.shape[0], 2), dtype=np.float32)
+        if redutor is not None:
+            redutor.reiniciar()
 
-        # Usar SOS (Second-Order Sections) - mais estável
-        sos = butter(4, [low, high], btype="band", output="sos")
-        filtrado = sosfilt(sos, data)
+        inicio = time.perf_counter()
+        for bloco in sf.blocks(caminho_audio, blocksize=tamanho_bloco, dtype="float32"):
+            if bloco.ndim > 1:
+                bloco = np.mean(bloco, axis=1, dtype=np.float32)
+            self._medir("leitura", inicio)
+            yield from self._realcar_bloco(bloco, sos, zi, redutor)
+            inicio = time.perf_counter()
 
-        return filtrado
+        if redutor is not None:
+            yield from self._realcar_bloco(None, sos, zi, redutor)
 
-    def _filtro_realce(self, data, rate, freq_baixa, freq_alta):
+    def _realcar_bloco(self, bloco, sos, zi, redutor):
         """
-        Filtro para realçar frequências específicas da voz.
+        Realça um bloco (com redução de ruído, se houver redutor). Com
+        `bloco=None`, esvazia o redutor no fim do arquivo. `zi` é atualizado
+        no próprio array.
         """
-        nyq = rate / 2
-        low = freq_baixa / nyq
-        high = freq_alta / nyq
+        if redutor is not None:
+            inicio = time.perf_counter()
+            bloco = redutor.finalizar() if bloco is None else redutor.processar(bloco)
+            self._medir("reducao_ruido", inicio)
+        if len(bloco) == 0:
+            return
+
+        inicio = time.perf_counter()
+        realcado, zi[:] = sosfilt(sos, bloco, zi=zi)
+        self._medir("realce", inicio)
+        yield realcado
+
+    def _medir(self, etapa, inicio):
+        """Acumula o tempo gasto em uma etapa desde `inicio`."""
+        self.tempos[etapa] = self.tempos.get(etapa, 0.0) + time.perf_counter() - inicio
 
-        # Filtro mais suave para realce
-        sos = butter(2, [low, high], btype="band", output="sos")
-        realcado = sosfilt(sos, data)
+    def _exibir_tempos(self):
+        total = sum(self.tempos.values())
+        etapas = ", ".join(f"{etapa} {t:.2f}s" for etapa, t in self.tempos.items())
+        print(f"[⏱️] Tempo por etapa: {etapas} (total {total:.2f}s)")
 
-        return realcado
+    def _realcar_voz(self, data, rate):
+        """
+        Aplica filtros para realçar a voz humana (300-3400 Hz).
+
+        Os dois filtros (voz e realce) e a mistura 70/30 são aplicados numa
+        única passada pelo filtro combinado de `sos_realce_voz`, em float32.
+        """
+        data = np.asarray(data, dtype=np.float32)
+        return sosfilt(sos_realce_voz(rate), data)
 
     def _normalizar_suave(self, data):
         """
@@ -111,19 +213,67 @@ class PreprocessadorAudio:
         """
         # Encontrar o pico
         peak = np.max(np.abs(data))
+        return self._aplicar_ganho(data, peak)
 
+    def _aplicar_ganho(self, data, peak):
+        """
+        Normaliza pelo pico informado e comprime suavemente os excessos.
+        """
         if peak == 0:
             return data
 
         # Normalizar para 70% do máximo (-3dB aproximadamente)
         target = 0.7
-        normalized = data * (target / peak)
+        normalized = data * np.float32(target / peak)
 
-        # Aplicar compressão suave nos picos
+        # Aplicar compressão suave nos picos: acima do limiar sobra só 30%
+        # do excesso, ou seja, |x| - 0.7 * (|x| - threshold)
         threshold = 0.8
-        mask = np.abs(normalized) > threshold
-        normalized[mask] = np.sign(normalized[mask]) * (
-            threshold + (np.abs(normalized[mask]) - threshold) * 0.3
-        )
+        excesso = np.abs(normalized)
+        excesso -= threshold
+        np.maximum(excesso, 0, out=excesso)
+        excesso *= np.copysign(np.float32(0.7), normalized)
+        normalized -= excesso
 
         return normalized
+
+
+# Bandas do realce: (frequência baixa, frequência alta, ordem, peso na mistura)
+BANDAS_REALCE = ((300, 3400, 4, 0.7), (1000, 2000, 2, 0.3))
+
+
+@lru_cache(maxsize=32)
+def sos_realce_voz(rate, bandas=BANDAS_REALCE):
+    """
+    Projeta um único filtro equivalente à soma ponderada dos passa-faixas
+    de `bandas` (por padrão 0.7 * voz + 0.3 * realce).
+
+    A soma de filtros em paralelo vira um filtro só com todos os polos e um
+    numerador comum. Os zeros de um Butterworth passa-faixa de ordem N
+    ficam em +1 e -1 (N de cada); os que são comuns a todas as bandas são
+    separados antes de procurar as raízes, o que mantém a precisão.
+
+    Returns:
+        np.ndarray: Coeficientes SOS em float32 (compartilhados pelo cache;
+        não altere o array).
+    """
+    nyq = rate / 2
+    projetos = [
+        (butter(ordem, [baixa / nyq, alta / nyq], btype="band", output="zpk"), peso, ordem)
+        for baixa, alta, ordem, peso in bandas
+    ]
+    comum = min(ordem for _, _, ordem in projetos)
+
+    numerador = np.zeros(1)
+    for i, ((_, _, k), peso, ordem) in enumerate(projetos):
+        raizes = [np.ones(ordem - comum), -np.ones(ordem - comum)]
+        raizes += [p for j, ((_, p, _), _, _) in enumerate(projetos) if j != i]
+        termo = peso * k * np.real(np.poly(np.concatenate(raizes)))
+        numerador = np.polyadd(numerador, termo)
+
+    zeros = np.concatenate(
+        [np.ones(comum), -np.ones(comum), np.roots(numerador)]
+    )
+    polos = np.concatenate([p for (_, p, _), _, _ in projetos])
+    sos = zpk2sos(zeros, polos, numerador[0]).astype(np.float32)
+    return sos
@@ -0,0 +1,69 @@
+from math import gcd
+import numpy as np
+
+
+def _passa_baixa(n_taps: int, corte: float, beta: float = 8.0) -> np.ndarray:
+    """
+    FIR passa-baixa por janela de Kaiser com ganho 1 em DC, igual a
+    scipy.signal.firwin(n_taps, corte, window=("kaiser", beta)). Feito em
+    numpy para a tela de gravação não importar o scipy.signal.
+    """
+    m = np.arange(n_taps) - (n_taps - 1) / 2
+    h = corte * np.sinc(corte * m) * np.kaiser(n_taps, beta)
+    return h / h.sum()
+
+
+class ReamostradorPolifasico:
+    """
+    Reamostrador polifásico por blocos, para uso no callback de captura.
+
+    Converte blocos int16 (frames, canais) para mono na taxa de saída,
+    mantendo entre chamadas o histórico do filtro e a fase, de modo que a
+    saída concatenada é a mesma que a de uma reamostragem do sinal inteiro.
+    """
+
+    def __init__(self, taxa_entrada: int, taxa_saida: int, taps_por_fase: int = 64):
+        divisor = gcd(taxa_entrada, taxa_saida)
+        self.up = taxa_saida // divisor
+        self.down = taxa_entrada // divisor
+        self.taps_por_fase = taps_por_fase
+
+        # Filtro passa-baixa anti-aliasing, dividido em `up` fases
+        n_taps = self.up * taps_por_fase
+        h = _passa_baixa(n_taps, 1.0 / max(self.up, self.down))
+        h *= self.up
+        # banco[p, k] = h[p + k * up]
+        self._banco = h.reshape(taps_por_fase, self.up).T.astype(np.float32)
+        self._k = np.arange(taps_por_fase)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta o histórico, para começar um sinal novo."""
+        self._historico = np.zeros(self.taps_por_fase - 1, dtype=np.float32)
+        # Instante da próxima amostra de saída, na escala sobreamostrada
+        self._t = (self.taps_por_fase - 1) * self.up
+
+    def processar(self, bloco: np.ndarray) -> np.ndarray:
+        """
+        Reamostra um bloco de entrada.
+
+        Args:
+            bloco (np.ndarray): Bloco int16 com formato (frames, canais).
+
+        Returns:
+            np.ndarray: Bloco int16 mono com formato (frames_saida, 1).
+        """
+        mono = bloco.mean(axis=1, dtype=np.float32)
+        x = np.concatenate((self._historico, mono))
+
+        t = np.arange(self._t, len(x) * self.up, self.down)
+        i, fase = np.divmod(t, self.up)
+        y = np.einsum("nk,nk->n", self._banco[fase], x[i[:, None] - self._k])
+
+        # Guarda o fim do bloco como histórico e reposiciona o instante
+        consumidos = len(x) - (self.taps_por_fase - 1)
+        self._historico = x[consumidos:]
+        proximo = t[-1] + self.down if len(t) else self._t
+        self._t = proximo - consumidos * self.up
+
+        return np.clip(np.rint(y), -32768, 32767).astype(np.int16)[:, None]
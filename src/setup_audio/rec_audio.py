@@ -1,26 +1,77 @@
 import os
-import numpy as np
+import json
+import wave
+import soundfile as sf
 import sounddevice as sd
 from datetime import datetime
-from pydub import AudioSegment
-import scipy.io.wavfile as wavfile
 from src.tools.tools_system import SetupSystem
+from src.setup_audio import formatos_audio
+from src.setup_audio.buffer_audio import BufferAudio
+from src.setup_audio.escritor_audio import EscritorAudio
+from src.setup_audio.detector_voz import DetectorVoz
+from src.setup_audio.reamostrador import ReamostradorPolifasico
 
 
 system_control = SetupSystem()
 
 
 class GravadorAudio:
-    def __init__(self, taxa_amostragem=44100, canais=1):
+    def __init__(
+        self, taxa_amostragem=44100, canais=1, modo_streaming=None, taxa_saida=None
+    ):
         self.fs = taxa_amostragem
         self.canais = canais
+        # Taxa dos arquivos salvos. Ex.: GRAVACAO_TAXA_SAIDA=16000 grava em
+        # 16 kHz mono, o formato que o WhisperX usa internamente.
+        if taxa_saida is None:
+            taxa_saida = int(os.getenv("GRAVACAO_TAXA_SAIDA") or taxa_amostragem)
+        if taxa_saida != taxa_amostragem:
+            self.fs_saida = taxa_saida
+            self.canais_saida = 1
+            self.reamostrador = ReamostradorPolifasico(self.fs, self.fs_saida)
+        else:
+            self.fs_saida = taxa_amostragem
+            self.canais_saida = canais
+            self.reamostrador = None
+        # Formato dos arquivos gravados: wav, flac (sem perdas) ou opus
+        self.formato = os.getenv("GRAVACAO_FORMATO", "wav").strip().lower()
+        formatos_audio.validar_formato(self.formato, self.fs_saida)
+        self.extensao = formatos_audio.FORMATOS[self.formato]["extensao"]
         self.gravando = False
         self.pausado = False
-        self.audio_data = []
+        self.audio_data = BufferAudio(self.fs_saida, self.canais_saida)
         self.stream = None
+        self.escritor = None
+        self.erro = None  # Falha de gravação em disco da última sessão
+        # Modo streaming: grava direto em disco durante a sessão (opt-in)
+        if modo_streaming is None:
+            modo_streaming = os.getenv("GRAVACAO_STREAMING", "false").lower() in (
+                "1",
+                "true",
+                "sim",
+            )
+        self.modo_streaming = modo_streaming
+        # VAD_MODO=marcar indexa os trechos de fala; VAD_MODO=descartar também
+        # deixa de gravar silêncios maiores que VAD_SILENCIO_MAX segundos.
+        modo_vad = os.getenv("VAD_MODO", "").strip().lower()
+        if modo_vad in DetectorVoz.MODOS:
+            self.detector = DetectorVoz(
+                self.fs_saida,
+                modo=modo_vad,
+                silencio_max=float(os.getenv("VAD_SILENCIO_MAX", "3.0")),
+            )
+        else:
+            self.detector = None
         self.nome_paciente = None
         self.output_dir = os.getenv("FOLDER_AUDIO", "audio")
         self.arquivos_gravados = []  # Lista de arquivos da sessão
+        self.manifesto_partes = []  # Posição de cada parte no _completo.wav
+        # Ganchos para transcrição incremental:
+        # ao_concluir_trecho(caminho, frame_inicial, frames) a cada parte ou
+        # trecho já gravado; ao_finalizar_sessao(caminho_completo, arquivos)
+        # quando a sessão termina.
+        self.ao_concluir_trecho = None
+        self.ao_finalizar_sessao = None
 
     def iniciar_gravacao(self, nome_paciente: str):
         if self.gravando:
@@ -28,14 +79,56 @@ class GravadorAudio:
             return
 
         self.nome_paciente = system_control.text_underline(nome_paciente)
-        self.audio_data = []  # Limpar dados anteriores
+        self.audio_data.limpar()  # Limpar dados anteriores
+        self.audio_data.overruns = 0
         self.pausado = False
         self.arquivos_gravados = []  # Reset da lista de arquivos
+        self.manifesto_partes = []
+        self.erro = None
         self.gravando = True
 
+        if self.modo_streaming:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            nome_arquivo = f"{self.nome_paciente}_{timestamp}_stream"
+            nome_arquivo += self.extensao
+            self.escritor = EscritorAudio(
+                os.path.join(self.output_dir, nome_arquivo),
+                self.fs_saida,
+                self.canais_saida,
+                ao_concluir_trecho=self.ao_concluir_trecho,
+                segundos_por_trecho=float(os.getenv("TRANSCRICAO_TRECHO_S", "60")),
+                formato=self.formato,
+            )
+            self.escritor.start()
+            escritor = self.escritor
+
+            def destino(bloco):
+                # Se a escrita em disco falhar, o restante fica na memória
+                if escritor.ativo:
+                    escritor.enfileirar(bloco)
+                else:
+                    self.audio_data.escrever(bloco)
+
+        else:
+            destino = self.audio_data.escrever
+
+        reamostrador = self.reamostrador
+        if reamostrador is not None:
+            reamostrador.reiniciar()
+        detector = self.detector
+        if detector is not None:
+            detector.reiniciar()
+
         def callback(indata, frames, time, status):
+            self.audio_data.registrar_status(status)
             if self.gravando and not self.pausado:
-                self.audio_data.append(indata.copy())
+                if reamostrador is not None:
+                    indata = reamostrador.processar(indata)
+                if detector is not None:
+                    indata = detector.processar(indata)
+                    if indata is None:
+                        return
+                destino(indata)
 
         self.stream = sd.InputStream(
             samplerate=self.fs, channels=self.canais, dtype="int16", callback=callback
@@ -54,13 +147,19 @@ class GravadorAudio:
 
         self.pausado = True
 
+        if self.modo_streaming:
+            # No modo streaming o áudio já está em disco; basta parar de enfileirar
+            print("[⏸️] Gravação pausada.")
+            return
+
         # Salvar o áudio capturado até agora
         arquivo_salvo = self._salvar_audio()
         if arquivo_salvo:
             self.arquivos_gravados.append(arquivo_salvo)
+            self._notificar_trecho(arquivo_salvo)
 
         # Limpar buffer para próxima gravação
-        self.audio_data = []
+        self.audio_data.limpar()
         print("[⏸️] Gravação pausada e áudio salvo.")
 
     def retomar_gravacao(self, nome_paciente: str):
@@ -88,73 +187,148 @@ class GravadorAudio:
             self.stream.close()
             self.stream = None
 
+        if self.escritor is not None:
+            self.escritor.fechar()
+            if self.escritor.erro is None:
+                self.arquivos_gravados.append(self.escritor.caminho)
+            else:
+                self.erro = self.escritor.erro
+                print(
+                    f"[❌] Falha na gravação em disco ({self.erro}); "
+                    "o áudio seguinte ficou na memória."
+                )
+                # O que já foi sincronizado no disco continua legível
+                if self.escritor.frames_gravados and os.path.exists(
+                    self.escritor.caminho
+                ):
+                    self.arquivos_gravados.append(self.escritor.caminho)
+            self.escritor = None
+
         # Salvar o áudio final se houver dados
-        if self.audio_data:
-            arquivo_salvo = self._salvar_audio()
+        if len(self.audio_data):
+            try:
+                arquivo_salvo = self._salvar_audio()
+            except (OSError, RuntimeError) as e:
+                self.erro = e
+                arquivo_salvo = None
+                print(f"[❌] Erro ao salvar o áudio: {e}")
             if arquivo_salvo:
                 self.arquivos_gravados.append(arquivo_salvo)
+                self._notificar_trecho(arquivo_salvo)
 
         # Limpar dados após salvar
-        self.audio_data = []
+        self.audio_data.limpar()
         print(f"[⏹️] Gravação parada. {len(self.arquivos_gravados)} arquivos salvos.")
 
         # Opcionalmente combinar todos os arquivos em um só
         if len(self.arquivos_gravados) > 1:
             print("[🔄] Combinando arquivos...")
-            self._combinar_audio(nome_paciente)
+            caminho_completo = self._combinar_audio(nome_paciente)
+        elif self.arquivos_gravados:
+            caminho_completo = self._renomear_arquivo_unico(nome_paciente)
         else:
-            caminho_arquivo_original = self.arquivos_gravados[0]
+            print("[!] Nenhum áudio gravado na sessão.")
+            caminho_completo = None
 
-            # Verificar se o arquivo existe
-            if not os.path.exists(caminho_arquivo_original):
-                print(f"[❌] Arquivo único não encontrado: {caminho_arquivo_original}")
-                return None
+        if caminho_completo:
+            self._salvar_manifesto(caminho_completo)
+        if caminho_completo and self.detector is not None:
+            self.detector.salvar_indice(caminho_completo)
 
-            print("[✅] Apenas um arquivo de áudio encontrado. Renomeando...")
+        if caminho_completo and self.ao_finalizar_sessao is not None:
+            self.ao_finalizar_sessao(caminho_completo, list(self.arquivos_gravados))
 
-            # Gerar o novo nome com '_completo' e o timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            nome_tratado = system_control.text_underline(nome_paciente)
+        return caminho_completo
 
-            # Separar o nome do arquivo da extensão para adicionar o sufixo
-            nome_base, extensao = os.path.splitext(
-                os.path.basename(caminho_arquivo_original)
-            )
+    def _salvar_manifesto(self, caminho_completo: str):
+        """
+        Salva ao lado do arquivo completo o manifesto '_partes.json', com as
+        partes que o originaram (usado pelo arquivador para apagá-las).
+        """
+        if not self.manifesto_partes:
+            frames = sf.info(caminho_completo).frames
+            self.manifesto_partes = [
+                {
+                    "arquivo": self.arquivos_gravados[0],
+                    "frame_inicial": 0,
+                    "frames": frames,
+                    "inicio": 0.0,
+                    "duracao": frames / self.fs_saida,
+                }
+            ]
+        caminho_manifesto = os.path.splitext(caminho_completo)[0] + "_partes.json"
+        with open(caminho_manifesto, "w", encoding="utf-8") as f:
+            json.dump(self.manifesto_partes, f, indent=2, ensure_ascii=False)
+
+    def _notificar_trecho(self, caminho_arquivo: str):
+        """Avisa o gancho de transcrição incremental que uma parte foi salva."""
+        if self.ao_concluir_trecho is not None:
+            self.ao_concluir_trecho(caminho_arquivo, 0, None)
+
+    def _renomear_arquivo_unico(self, nome_paciente: str):
+        """
+        Renomeia o único arquivo da sessão para o padrão '_completo'.
+        """
+        caminho_arquivo_original = self.arquivos_gravados[0]
 
-            novo_nome = f"{nome_tratado}_{timestamp}_completo.wav"
-            novo_caminho = os.path.join(self.output_dir, novo_nome)
+        # Verificar se o arquivo existe
+        if not os.path.exists(caminho_arquivo_original):
+            print(f"[❌] Arquivo único não encontrado: {caminho_arquivo_original}")
+            return None
 
-            # Renomear o arquivo
-            try:
-                os.rename(caminho_arquivo_original, novo_caminho)
-                print(f"[✅] Áudio renomeado e salvo em: {novo_caminho}")
-                return novo_caminho
-            except OSError as e:
-                print(f"[❌] Erro ao renomear o arquivo: {e}")
-                return None
+        print("[✅] Apenas um arquivo de áudio encontrado. Renomeando...")
+
+        # Gerar o novo nome com '_completo' e o timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        nome_tratado = system_control.text_underline(nome_paciente)
+
+        novo_nome = f"{nome_tratado}_{timestamp}_completo{self.extensao}"
+        novo_caminho = os.path.join(self.output_dir, novo_nome)
+
+        # Renomear o arquivo
+        try:
+            os.rename(caminho_arquivo_original, novo_caminho)
+            print(f"[✅] Áudio renomeado e salvo em: {novo_caminho}")
+            return novo_caminho
+        except OSError as e:
+            print(f"[❌] Erro ao renomear o arquivo: {e}")
+            return None
 
     def _salvar_audio(self):
-        if not self.audio_data:
+        if not len(self.audio_data):
             print("[!] Nenhum áudio para salvar.")
             return None
 
-        # Concatenar os dados de áudio
-        audio_array = np.concatenate(self.audio_data, axis=0)
-
         # Gerar nome do arquivo com paciente e timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         parte = len(self.arquivos_gravados) + 1
-        nome_arquivo = f"{self.nome_paciente}_{timestamp}_parte{parte}.wav"
+        nome_arquivo = f"{self.nome_paciente}_{timestamp}_parte{parte}"
+        nome_arquivo += self.extensao
         caminho_arquivo = os.path.join(self.output_dir, nome_arquivo)
 
-        # Salvar como arquivo WAV
-        wavfile.write(caminho_arquivo, self.fs, audio_array)
+        # Salvar escrevendo as fatias do buffer, sem concatenar
+        if self.formato == "wav":
+            with wave.open(caminho_arquivo, "wb") as wf:
+                wf.setnchannels(self.canais_saida)
+                wf.setsampwidth(2)
+                wf.setframerate(self.fs_saida)
+                for fatia in self.audio_data.visoes():
+                    wf.writeframes(fatia)
+        else:
+            with formatos_audio.abrir_escrita(
+                caminho_arquivo, self.formato, self.fs_saida, self.canais_saida
+            ) as arquivo:
+                for fatia in self.audio_data.visoes():
+                    arquivo.write(fatia)
         print(f"[💾] Áudio salvo em: {caminho_arquivo}")
         return caminho_arquivo
 
     def _combinar_audio(self, nome_paciente: str):
         """
         Combina múltiplos arquivos de áudio em um único arquivo.
+
+        A posição de cada parte no arquivo combinado fica em
+        self.manifesto_partes.
         """
         if not self.arquivos_gravados:
             print("[!] Nenhum arquivo para combinar.")
@@ -162,32 +336,37 @@ class GravadorAudio:
 
         print(f"[🔄] Combinando {len(self.arquivos_gravados)} arquivos...")
 
-        # Carregar todos os arquivos
-        segmentos = []
+        # Verificar os arquivos existentes
+        partes = []
         for arquivo in self.arquivos_gravados:
             if os.path.exists(arquivo):
-                segmento = AudioSegment.from_wav(arquivo)
-                segmentos.append(segmento)
-                print(f"[📂] Carregado: {os.path.basename(arquivo)}")
+                partes.append(arquivo)
             else:
                 print(f"[❌] Arquivo não encontrado: {arquivo}")
 
-        if not segmentos:
+        if not partes:
             print("[❌] Nenhum segmento válido para combinar.")
             return
 
-        # Combinar todos os segmentos
-        audio_combinado = segmentos[0]
-        for segmento in segmentos[1:]:
-            audio_combinado += segmento
-
-        # Salvar arquivo combinado
+        # Salvar arquivo combinado (em WAV, copiando os frames PCM de cada parte)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         nome_tratado = system_control.text_underline(nome_paciente)
-        nome_combinado = f"{nome_tratado}_{timestamp}_completo.wav"
+        nome_combinado = f"{nome_tratado}_{timestamp}_completo{self.extensao}"
         caminho_combinado = os.path.join(self.output_dir, nome_combinado)
 
-        audio_combinado.export(caminho_combinado, format="wav")
+        try:
+            self.manifesto_partes = formatos_audio.concatenar(
+                partes, caminho_combinado, self.formato
+            )
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"[❌] Erro ao combinar arquivos: {e}")
+            return
+
+        for item in self.manifesto_partes:
+            print(
+                f"[📂] {os.path.basename(item['arquivo'])}: "
+                f"{item['inicio']:.1f}s + {item['duracao']:.1f}s"
+            )
         print(f"[✅] Áudio combinado salvo em: {caminho_combinado}")
 
         # Opcional: remover arquivos individuais
@@ -209,12 +388,26 @@ class GravadorAudio:
 
     def get_stats(self):
         """Retorna estatísticas da gravação atual."""
-        return {
+        buffer_stats = self.audio_data.get_stats()
+        stats = {
             "status": self.get_status(),
             "arquivos_gravados": len(self.arquivos_gravados),
-            "duracao_buffer": len(self.audio_data) / self.fs if self.audio_data else 0,
+            "duracao_buffer": buffer_stats["duracao"],
+            "buffer_ocupacao": buffer_stats["ocupacao"],
+            "buffer_capacidade": buffer_stats["capacidade"],
+            "overruns": buffer_stats["overruns"],
             "nome_paciente": self.nome_paciente,
         }
+        if self.detector is not None:
+            descartados = self.detector.frames_descartados
+            stats["trechos_fala"] = len(self.detector.trechos_fala)
+            stats["silencio_descartado"] = descartados / self.fs_saida
+        if self.escritor is not None:
+            escritor_stats = self.escritor.get_stats()
+            stats["duracao_gravada"] = escritor_stats["duracao"]
+            stats["fila_ocupacao"] = escritor_stats["fila_ocupacao"]
+            stats["blocos_descartados"] = escritor_stats["blocos_descartados"]
+        return stats
 
     def limpar_sessao(self):
         """Limpa todos os dados da sessão atual."""
@@ -222,8 +415,9 @@ class GravadorAudio:
             print("[!] Pare a gravação antes de limpar a sessão.")
             return
 
-        self.audio_data = []
+        self.audio_data.limpar()
         self.arquivos_gravados = []
+        self.manifesto_partes = []
         self.nome_paciente = None
         self.pausado = False
         print("[🧹] Sessão limpa com sucesso.")
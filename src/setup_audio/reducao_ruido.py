@@ -0,0 +1,167 @@
+import numpy as np
+from scipy.signal import lfilter
+
+
+class RedutorRuido:
+    """
+    Redução de ruído estacionário (ventilador, ar-condicionado, rua) por
+    filtro de Wiener no domínio da frequência.
+
+    O áudio é analisado por STFT (janela raiz de Hann, 50% de sobreposição)
+    e reconstruído por overlap-add. O perfil de ruído é a média do espectro
+    dos quadros de menor energia do início da gravação. Os quadros são
+    processados em lote (todos os quadros de um bloco de uma vez), e o
+    estado entre blocos é mantido, então `processar` pode ser chamado bloco
+    a bloco com o mesmo resultado do áudio inteiro.
+    """
+
+    def __init__(
+        self,
+        taxa_amostragem: int,
+        janela_ms: float = 32.0,
+        segundos_perfil: float = 2.0,
+        percentil_ruido: float = 20.0,
+        reducao_max_db: float = 15.0,
+        suavizacao: float = 0.9,
+    ):
+        """
+        Args:
+            taxa_amostragem (int): Taxa do áudio (Hz).
+            janela_ms (float): Duração da janela da STFT.
+            segundos_perfil (float): Trecho inicial usado para o perfil de ruído.
+            percentil_ruido (float): Quadros com energia até este percentil
+                entram no perfil de ruído.
+            reducao_max_db (float): Atenuação máxima de cada faixa, para
+                evitar o "ruído musical" de ganhos muito baixos.
+            suavizacao (float): Suavização temporal da potência (0 a 1).
+        """
+        self.fs = taxa_amostragem
+        n = int(2 ** np.ceil(np.log2(taxa_amostragem * janela_ms / 1000)))
+        self.n_fft = n
+        self.hop = n // 2
+        # Raiz de Hann periódica: análise * síntese soma 1 com 50% de sobreposição
+        self.janela = np.sqrt(np.hanning(n + 1)[:-1]).astype(np.float32)
+        self.segundos_perfil = segundos_perfil
+        self.percentil_ruido = percentil_ruido
+        self.ganho_min = np.float32(10 ** (-reducao_max_db / 20))
+        self.suavizacao = suavizacao
+        self.perfil = None
+        self.reiniciar()
+
+    def reiniciar(self, manter_perfil: bool = True):
+        """Zera o estado do overlap-add para processar outro sinal."""
+        self._entrada = np.zeros(self.hop, dtype=np.float32)
+        self._cauda = np.zeros(self.hop, dtype=np.float32)
+        self._zi = None
+        self._descartar = self.hop  # Atraso introduzido pelo primeiro quadro
+        self._amostras_entrada = 0
+        self._amostras_saida = 0
+        if not manter_perfil:
+            self.perfil = None
+
+    def _quadros(self, sinal: np.ndarray) -> np.ndarray:
+        janelas = np.lib.stride_tricks.sliding_window_view(sinal, self.n_fft)
+        return janelas[:: self.hop] * self.janela
+
+    def estimar_perfil(self, amostras: np.ndarray) -> np.ndarray:
+        """
+        Estima o espectro de potência do ruído a partir dos quadros de menor
+        energia do início do áudio.
+
+        Args:
+            amostras (np.ndarray): Áudio mono (float); só os primeiros
+                `segundos_perfil` segundos são usados.
+
+        Returns:
+            np.ndarray: Potência média do ruído por faixa de frequência.
+        """
+        inicio = np.asarray(amostras[: int(self.segundos_perfil * self.fs)], np.float32)
+        if len(inicio) < self.n_fft:
+            inicio = np.pad(inicio, (0, self.n_fft - len(inicio)))
+
+        potencia = np.abs(np.fft.rfft(self._quadros(inicio), axis=1)) ** 2
+        energia = potencia.sum(axis=1)
+        silenciosos = energia <= np.percentile(energia, self.percentil_ruido)
+        self.perfil = potencia[silenciosos].mean(axis=0) + 1e-12
+        return self.perfil
+
+    def processar(self, bloco: np.ndarray) -> np.ndarray:
+        """
+        Reduz o ruído de um bloco de áudio mono.
+
+        A saída é devolvida assim que fica pronta: como a janela tem atraso,
+        o primeiro bloco sai um pouco menor e o restante sai em `finalizar`.
+
+        Args:
+            bloco (np.ndarray): Amostras mono (float).
+
+        Returns:
+            np.ndarray: Amostras processadas (float32).
+        """
+        bloco = np.asarray(bloco, dtype=np.float32)
+        if self.perfil is None:
+            self.estimar_perfil(bloco)
+        self._amostras_entrada += len(bloco)
+        return self._consumir(np.concatenate([self._entrada, bloco]))
+
+    def finalizar(self) -> np.ndarray:
+        """Processa o que restou na entrada e devolve o fim do sinal."""
+        restante = self._amostras_entrada - self._amostras_saida
+        saida = self._consumir(
+            np.concatenate([self._entrada, np.zeros(self.n_fft, np.float32)])
+        )
+        return saida[: max(restante, 0)]
+
+    def reduzir(self, data: np.ndarray, amostras_por_lote: int = 1 << 20) -> np.ndarray:
+        """
+        Reduz o ruído de um áudio inteiro, em lotes de `amostras_por_lote`.
+
+        Returns:
+            np.ndarray: Áudio processado, com o mesmo tamanho da entrada.
+        """
+        self.reiniciar()
+        if self.perfil is None:
+            self.estimar_perfil(data)
+        partes = [
+            self.processar(data[i : i + amostras_por_lote])
+            for i in range(0, len(data), amostras_por_lote)
+        ]
+        partes.append(self.finalizar())
+        return np.concatenate(partes)
+
+    def _consumir(self, buffer: np.ndarray) -> np.ndarray:
+        n_quadros = (len(buffer) - self.n_fft) // self.hop + 1
+        if n_quadros <= 0:
+            self._entrada = buffer
+            return np.zeros(0, dtype=np.float32)
+
+        espectro = np.fft.rfft(self._quadros(buffer)[:n_quadros], axis=1)
+        espectro *= self._ganho_wiener(espectro)
+        sintese = np.fft.irfft(espectro, n=self.n_fft, axis=1).astype(np.float32)
+        sintese *= self.janela
+
+        # Overlap-add: 1ª metade de cada quadro + 2ª metade do anterior
+        anteriores = np.concatenate([self._cauda[None, :], sintese[:-1, self.hop :]])
+        saida = (sintese[:, : self.hop] + anteriores).ravel()
+        self._cauda = sintese[-1, self.hop :].copy()
+        self._entrada = buffer[n_quadros * self.hop :].copy()
+
+        if self._descartar:
+            corte = min(self._descartar, len(saida))
+            saida = saida[corte:]
+            self._descartar -= corte
+        self._amostras_saida += len(saida)
+        return saida
+
+    def _ganho_wiener(self, espectro: np.ndarray) -> np.ndarray:
+        potencia = espectro.real**2 + espectro.imag**2
+
+        # Potência suavizada no tempo (filtro de 1ª ordem ao longo dos quadros)
+        a = self.suavizacao
+        if self._zi is None:
+            self._zi = (a * potencia[:1]).astype(potencia.dtype)
+        suavizada, self._zi = lfilter([1 - a], [1, -a], potencia, axis=0, zi=self._zi)
+
+        snr = np.maximum(suavizada / self.perfil - 1.0, 0.0)
+        ganho = snr / (1.0 + snr)
+        return np.maximum(ganho, self.ganho_min).astype(np.float32)
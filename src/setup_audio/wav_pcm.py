@@ -0,0 +1,173 @@
+import os
+import struct
+
+TAMANHO_CABECALHO = 44
+
+
+def escrever_cabecalho(f, taxa_amostragem: int, canais: int, bytes_dados: int = 0):
+    """
+    Escreve um cabeçalho WAV PCM 16 bits no início do arquivo.
+
+    Args:
+        f: Arquivo aberto em modo binário de escrita.
+        taxa_amostragem (int): Taxa de amostragem em Hz.
+        canais (int): Número de canais.
+        bytes_dados (int): Tamanho do bloco 'data' em bytes.
+    """
+    largura = 2
+    f.seek(0)
+    f.write(
+        struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF",
+            36 + bytes_dados,
+            b"WAVE",
+            b"fmt ",
+            16,
+            1,  # PCM
+            canais,
+            taxa_amostragem,
+            taxa_amostragem * canais * largura,
+            canais * largura,
+            largura * 8,
+            b"data",
+            bytes_dados,
+        )
+    )
+
+
+def atualizar_cabecalho(f, bytes_dados: int):
+    """
+    Atualiza os campos de tamanho do cabeçalho escrito por escrever_cabecalho,
+    mantendo a posição de escrita no fim do arquivo.
+    """
+    posicao = f.tell()
+    f.seek(4)
+    f.write(struct.pack("<I", 36 + bytes_dados))
+    f.seek(40)
+    f.write(struct.pack("<I", bytes_dados))
+    f.seek(posicao)
+
+
+def ler_info(caminho: str) -> dict:
+    """
+    Lê o cabeçalho de um arquivo WAV PCM sem carregar o áudio.
+
+    Se o tamanho do bloco 'data' estiver zerado ou maior que o arquivo
+    (gravação interrompida antes do cabeçalho final), usa o tamanho real.
+
+    Args:
+        caminho (str): Caminho do arquivo WAV.
+
+    Returns:
+        dict: taxa, canais, largura, offset_dados, bytes_dados e frames.
+
+    Raises:
+        ValueError: Se o arquivo não for um WAV PCM válido.
+    """
+    tamanho_arquivo = os.path.getsize(caminho)
+    with open(caminho, "rb") as f:
+        inicio = f.read(12)
+        if len(inicio) < 12:
+            raise ValueError(f"Arquivo não é WAV: {caminho}")
+        riff, _, wave_id = struct.unpack("<4sI4s", inicio)
+        if riff != b"RIFF" or wave_id != b"WAVE":
+            raise ValueError(f"Arquivo não é WAV: {caminho}")
+
+        info = {}
+        while True:
+            cabecalho = f.read(8)
+            if len(cabecalho) < 8:
+                raise ValueError(f"Bloco 'data' não encontrado em: {caminho}")
+            id_bloco, tamanho = struct.unpack("<4sI", cabecalho)
+
+            if id_bloco == b"fmt ":
+                campos = f.read(16)
+                if len(campos) < 16:
+                    raise ValueError(f"Bloco 'fmt ' incompleto em: {caminho}")
+                formato, canais, taxa, _, _, bits = struct.unpack("<HHIIHH", campos)
+                f.seek(tamanho - 16 + (tamanho % 2), os.SEEK_CUR)
+                if formato not in (1, 0xFFFE):
+                    raise ValueError(f"WAV não é PCM: {caminho}")
+                info.update(taxa=taxa, canais=canais, largura=bits // 8)
+            elif id_bloco == b"data":
+                if "taxa" not in info:
+                    raise ValueError(f"Bloco 'fmt ' ausente em: {caminho}")
+                offset = f.tell()
+                disponivel = tamanho_arquivo - offset
+                if tamanho == 0 or tamanho > disponivel:
+                    tamanho = disponivel
+                bytes_frame = info["canais"] * info["largura"]
+                tamanho -= tamanho % bytes_frame
+                info.update(
+                    offset_dados=offset,
+                    bytes_dados=tamanho,
+                    frames=tamanho // bytes_frame,
+                )
+                return info
+            else:
+                f.seek(tamanho + (tamanho % 2), os.SEEK_CUR)
+
+
+def concatenar(partes: list, destino: str, tamanho_bloco: int = 1 << 20) -> list:
+    """
+    Concatena arquivos WAV PCM copiando os frames brutos de cada parte para
+    um único arquivo, com um só cabeçalho. Não decodifica o áudio: o tempo
+    é linear no tamanho total e a memória usada é a de um bloco de cópia.
+
+    Args:
+        partes (list): Caminhos dos arquivos WAV, na ordem de gravação.
+        destino (str): Caminho do arquivo combinado.
+        tamanho_bloco (int): Tamanho do bloco de cópia em bytes.
+
+    Returns:
+        list: Manifesto com, para cada parte, o arquivo de origem, o frame
+        inicial e o número de frames no arquivo combinado, e os mesmos
+        valores em segundos.
+
+    Raises:
+        ValueError: Se as partes tiverem formatos diferentes.
+    """
+    infos = [ler_info(parte) for parte in partes]
+    formato = {(i["taxa"], i["canais"], i["largura"]) for i in infos}
+    if len(formato) != 1:
+        raise ValueError(f"Partes com formatos diferentes: {formato}")
+    taxa, canais, largura = formato.pop()
+    if largura != 2:
+        raise ValueError(f"Apenas PCM 16 bits é suportado (largura {largura}).")
+
+    manifesto = []
+    buffer = memoryview(bytearray(tamanho_bloco))
+    bytes_frame = canais * largura
+    bytes_total = 0
+    frame_inicial = 0
+    with open(destino, "wb") as saida:
+        escrever_cabecalho(saida, taxa, canais)
+        for parte, info in zip(partes, infos):
+            copiados = 0
+            with open(parte, "rb") as entrada:
+                entrada.seek(info["offset_dados"])
+                while copiados < info["bytes_dados"]:
+                    n = min(info["bytes_dados"] - copiados, tamanho_bloco)
+                    lidos = entrada.readinto(buffer[:n])
+                    if not lidos:
+                        break
+                    saida.write(buffer[:lidos])
+                    copiados += lidos
+
+            frames = copiados // bytes_frame
+            manifesto.append(
+                {
+                    "arquivo": parte,
+                    "frame_inicial": frame_inicial,
+                    "frames": frames,
+                    "inicio": frame_inicial / taxa,
+                    "duracao": frames / taxa,
+                }
+            )
+            frame_inicial += frames
+            bytes_total += copiados
+
+        atualizar_cabecalho(saida, bytes_total)
+
+    return manifesto
@@ -0,0 +1,279 @@
+import os
+import json
+import bisect
+import logging
+import numpy as np
+import soundfile as sf
+from typing import Optional
+from src.setup_audio import wav_pcm
+from src.tools.importacao_tardia import ModuloTardio
+
+
+logger = logging.getLogger(__name__)
+
+whisperx = ModuloTardio("whisperx")  # Só para os formatos lidos pelo ffmpeg
+signal = ModuloTardio("scipy.signal")
+
+TAXA_WHISPER = 16000  # whisperx.audio.SAMPLE_RATE, sem importar o whisperx
+
+# Maior segmento do WhisperX: os trechos do VAD são agrupados até 30 s
+CHUNK_WHISPER_S = 30.0
+
+
+def carregar_audio(caminho: str) -> np.ndarray:
+    """
+    Carrega o áudio no formato esperado pelo WhisperX (float32, 16 kHz, mono).
+
+    Arquivos WAV PCM 16 bits já gravados em 16 kHz mono são lidos
+    diretamente do disco, e FLAC/Opus são decodificados pelo soundfile,
+    sem o subprocesso do ffmpeg usado por whisperx.load_audio. Os demais
+    formatos seguem pelo ffmpeg.
+
+    Args:
+        caminho (str): Caminho do arquivo de áudio.
+
+    Returns:
+        np.ndarray: Amostras float32 normalizadas em [-1, 1).
+    """
+    try:
+        info = wav_pcm.ler_info(caminho)
+    except (OSError, ValueError):
+        info = None
+
+    if info and (info["taxa"], info["canais"], info["largura"]) == (
+        TAXA_WHISPER,
+        1,
+        2,
+    ):
+        logger.info(f"Carregando {caminho} direto do WAV (16 kHz mono).")
+        return carregar_trecho(caminho)
+
+    if caminho.endswith((".flac", ".ogg")):
+        logger.info(f"Decodificando {caminho} com soundfile.")
+        return carregar_trecho(caminho)
+
+    return whisperx.load_audio(caminho)
+
+
+def carregar_trecho(
+    caminho: str, frame_inicial: int = 0, frames: Optional[int] = None
+) -> np.ndarray:
+    """
+    Lê um trecho de um arquivo de áudio e o converte para float32 mono em
+    16 kHz. WAV PCM 16 bits é lido direto do disco (inclusive arquivos
+    ainda em gravação, no modo streaming); FLAC/Opus pelo soundfile.
+
+    Args:
+        caminho (str): Caminho do arquivo de áudio.
+        frame_inicial (int): Primeiro frame do trecho.
+        frames (int, opcional): Número de frames; até o fim se None.
+
+    Returns:
+        np.ndarray: Amostras float32 normalizadas em [-1, 1).
+    """
+    try:
+        info = wav_pcm.ler_info(caminho)
+    except ValueError:
+        info = None
+
+    if info is not None and info["largura"] == 2:
+        if frames is None:
+            frames = info["frames"] - frame_inicial
+        amostras = np.memmap(
+            caminho,
+            dtype="<i2",
+            mode="r",
+            offset=info["offset_dados"] + frame_inicial * info["canais"] * 2,
+            shape=(frames, info["canais"]),
+        )
+        if info["canais"] > 1:
+            audio = amostras.mean(axis=1, dtype=np.float32)
+        else:
+            audio = amostras[:, 0].astype(np.float32)
+        audio /= 32768.0
+        taxa_origem = info["taxa"]
+    else:
+        dados, taxa_origem = sf.read(
+            caminho,
+            start=frame_inicial,
+            frames=-1 if frames is None else frames,
+            dtype="float32",
+            always_2d=True,
+        )
+        audio = dados.mean(axis=1) if dados.shape[1] > 1 else dados[:, 0]
+
+    taxa = TAXA_WHISPER
+    if taxa_origem != taxa:
+        audio = signal.resample_poly(audio, taxa, taxa_origem).astype(np.float32)
+    return audio
+
+
+def recortar_fala(audio: np.ndarray, caminho: str):
+    """
+    Mantém apenas os trechos de fala indicados no índice '_fala.json'
+    gerado na gravação, se ele existir.
+
+    Args:
+        audio (np.ndarray): Áudio completo (16 kHz).
+        caminho (str): Caminho do arquivo de áudio.
+
+    Returns:
+        tuple: (áudio só com fala, mapa de tempos). O mapa é uma lista de
+        (início no recorte, início no original) em segundos; fica vazio
+        quando não há índice e o áudio é devolvido inteiro.
+    """
+    caminho_indice = os.path.splitext(caminho)[0] + "_fala.json"
+    if not os.path.exists(caminho_indice):
+        return audio, []
+
+    with open(caminho_indice, "r", encoding="utf-8") as f:
+        trechos = json.load(f).get("trechos", [])
+    if not trechos:
+        return audio, []
+
+    taxa = TAXA_WHISPER
+    recortes, mapa, posicao = [], [], 0
+    for inicio, fim in trechos:
+        a, b = int(inicio * taxa), min(int(fim * taxa), len(audio))
+        if b <= a:
+            continue
+        mapa.append((posicao / taxa, a / taxa))
+        recortes.append(audio[a:b])
+        posicao += b - a
+
+    if not recortes:
+        return audio, []
+
+    logger.info(
+        f"Índice de fala: {posicao / taxa:.1f}s de {len(audio) / taxa:.1f}s "
+        f"serão transcritos ({len(recortes)} trechos)."
+    )
+    return np.concatenate(recortes), mapa
+
+
+def restaurar_tempos(result: dict, mapa: list):
+    """Converte os tempos dos segmentos do recorte para o áudio original."""
+    inicios = [inicio_recorte for inicio_recorte, _ in mapa]
+
+    def converter(t):
+        idx = max(bisect.bisect_right(inicios, t) - 1, 0)
+        inicio_recorte, inicio_original = mapa[idx]
+        return inicio_original + (t - inicio_recorte)
+
+    for segment in result.get("segments", []):
+        for campo in ("start", "end"):
+            if campo in segment:
+                segment[campo] = converter(segment[campo])
+
+
+def pontos_de_corte(
+    audio: np.ndarray, janela_s: float = 120.0, busca_s: float = 3.0
+) -> list:
+    """
+    Divide o áudio em janelas de ~`janela_s` segundos, cortando cada uma no
+    ponto de menor energia a até `busca_s` segundos do limite, para não
+    partir palavras ao meio.
+
+    Args:
+        audio (np.ndarray): Áudio float32 em 16 kHz.
+        janela_s (float): Duração alvo das janelas.
+        busca_s (float): Tolerância em torno de cada limite.
+
+    Returns:
+        list: Pares (início, fim) em amostras, cobrindo o áudio todo.
+    """
+    taxa = TAXA_WHISPER
+    passo = int(janela_s * taxa)
+    if len(audio) <= passo:
+        return [(0, len(audio))]
+
+    # Energia em quadros de 20 ms
+    quadro = taxa // 50
+    n_quadros = len(audio) // quadro
+    energia = np.square(audio[: n_quadros * quadro].reshape(n_quadros, quadro)).mean(
+        axis=1
+    )
+    busca = int(busca_s * taxa) // quadro
+
+    cortes, inicio = [], 0
+    while len(audio) - inicio > passo + busca * quadro:
+        alvo = (inicio + passo) // quadro
+        a, b = max(alvo - busca, inicio // quadro + 1), min(alvo + busca, n_quadros)
+        corte = (a + int(np.argmin(energia[a:b]))) * quadro
+        cortes.append((inicio, corte))
+        inicio = corte
+    cortes.append((inicio, len(audio)))
+    return cortes
+
+
+def duracao_audio(caminho: str):
+    """
+    Duração do arquivo em segundos, lida do cabeçalho.
+
+    Returns:
+        float | None: Duração, ou None se o soundfile não ler o formato.
+    """
+    try:
+        return sf.info(caminho).duration
+    except RuntimeError:
+        return None
+
+
+def janelas_do_arquivo(
+    caminho: str, janela_s: float = 120.0, sobreposicao_s: float = CHUNK_WHISPER_S
+):
+    """
+    Lê o arquivo do disco em janelas, sem carregá-lo inteiro: a memória fica
+    limitada ao tamanho de uma janela.
+
+    Se houver índice '_fala.json', cada janela termina, de preferência, num
+    silêncio entre trechos de fala (no último quarto da janela). Sem um
+    silêncio próximo, a janela é lida `sobreposicao_s` (no mínimo um chunk
+    de 30 s do WhisperX) além do corte: um segmento que começa antes do
+    corte sai inteiro desta janela, e não cortado ao meio.
+
+    O consumidor deve enviar (`send`) o fim do último segmento que manteve:
+    se ele passou do corte, a janela seguinte começa ali, sem perder nem
+    repetir fala. Sem envio (None), ela começa no corte.
+
+    Yields:
+        tuple: (áudio float32 16 kHz, início da janela em s, corte inicial
+        em s, corte final em s). Só os segmentos que começam entre os cortes
+        devem ser mantidos.
+    """
+    info = sf.info(caminho)
+    taxa, duracao = info.samplerate, info.duration
+    sobreposicao_s = max(sobreposicao_s, CHUNK_WHISPER_S)
+
+    silencios = []
+    caminho_indice = os.path.splitext(caminho)[0] + "_fala.json"
+    if os.path.exists(caminho_indice):
+        with open(caminho_indice, "r", encoding="utf-8") as f:
+            trechos = json.load(f).get("trechos", [])
+        silencios = [
+            (a[1] + b[0]) / 2 for a, b in zip(trechos, trechos[1:]) if b[0] > a[1]
+        ]
+
+    corte_inicial = 0.0
+    while corte_inicial < duracao:
+        alvo = corte_inicial + janela_s
+        if alvo >= duracao:
+            corte_final = leitura_final = duracao
+        else:
+            candidatos = [s for s in silencios if alvo - janela_s / 4 <= s <= alvo]
+            if candidatos:
+                corte_final = leitura_final = candidatos[-1]
+            else:
+                corte_final = alvo
+                leitura_final = min(alvo + sobreposicao_s, duracao)
+
+        frame_inicial = int(corte_inicial * taxa)
+        frames = int(leitura_final * taxa) - frame_inicial
+        audio = carregar_trecho(caminho, frame_inicial, frames)
+        inicio = frame_inicial / taxa
+        fim_coberto = yield audio, inicio, inicio, corte_final
+
+        if corte_final >= duracao:
+            break
+        # Se o último segmento mantido passou do corte, continua no fim dele
+        corte_inicial = max(corte_final, fim_coberto or 0.0)
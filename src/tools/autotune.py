@@ -0,0 +1,254 @@
+"""
+Ajuste automático do perfil de inferência do WhisperX na CPU.
+
+Uso:
+    python -m src.tools.autotune [--audio clip.wav] [--modelos large,medium]
+        [--batch 4,8,16,32] [--threads 2,4,8] [--compute int8,float32]
+        [--limite-memoria-mb 6000]
+
+Cada combinação roda num subprocesso próprio, que carrega o modelo,
+transcreve o clipe de referência e informa o fator de tempo real (RTF) e o
+pico de memória (RSS). O melhor perfil de cada modelo é salvo em
+WHISPER_PERFIL (padrão: perfil_whisper.json) e aplicado pelo
+TranscricaoAudio ao iniciar.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import itertools
+import subprocess
+import tempfile
+import numpy as np
+from datetime import datetime
+from dotenv import load_dotenv
+
+
+logger = logging.getLogger(__name__)
+
+TAXA_WHISPER = 16000
+
+
+def caminho_perfil() -> str:
+    """Arquivo onde o perfil ajustado é salvo."""
+    load_dotenv()
+    return os.getenv("WHISPER_PERFIL", "perfil_whisper.json")
+
+
+def carregar_perfil(nome_modelo: str):
+    """
+    Lê o melhor perfil salvo para o modelo.
+
+    Args:
+        nome_modelo (str): Modelo WhisperX (ex.: "large").
+
+    Returns:
+        dict | None: {"compute_type", "threads", "batch_size", ...}, ou None
+        se o autotune ainda não foi rodado para esse modelo.
+    """
+    caminho = caminho_perfil()
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f).get("perfis", {}).get(nome_modelo)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Perfil do WhisperX inválido em {caminho}: {e}")
+        return None
+
+
+def gerar_clipe_sintetico(caminho: str, segundos: float = 60.0):
+    """
+    Gera um clipe com cara de fala (harmônicos com entonação e sílabas de
+    ~4 Hz) para medir desempenho quando não há gravação de referência.
+    """
+    import soundfile as sf
+
+    t = np.arange(int(segundos * TAXA_WHISPER)) / TAXA_WHISPER
+    f0 = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    fase = 2 * np.pi * np.cumsum(f0) / TAXA_WHISPER
+    sinal = sum(np.sin(k * fase) / k for k in range(1, 12))
+    silabas = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    pausas = (np.sin(2 * np.pi * 0.15 * t) > -0.6).astype(float)
+    ruido = 0.01 * np.random.default_rng(0).standard_normal(len(t))
+    audio = 0.3 * sinal / np.max(np.abs(sinal)) * silabas * pausas + ruido
+    sf.write(caminho, audio.astype(np.float32), TAXA_WHISPER, subtype="PCM_16")
+
+
+def medir(config: dict, caminho_audio: str) -> dict:
+    """
+    Executa uma medição no processo atual (chamado pelo subprocesso).
+
+    Returns:
+        dict: config + tempo_carga, tempo, duracao_audio, rtf e pico_rss_mb.
+    """
+    os.environ["OMP_NUM_THREADS"] = str(config["threads"])
+    import whisperx
+    from src.tools import audio_transcricao
+
+    inicio = time.perf_counter()
+    modelo = whisperx.load_model(
+        config["modelo"],
+        device="cpu",
+        compute_type=config["compute_type"],
+        language=config["idioma"],
+        threads=config["threads"],
+    )
+    tempo_carga = time.perf_counter() - inicio
+
+    audio = audio_transcricao.carregar_audio(caminho_audio)
+    inicio = time.perf_counter()
+    modelo.transcribe(audio, batch_size=config["batch_size"])
+    tempo = time.perf_counter() - inicio
+    duracao = len(audio) / TAXA_WHISPER
+
+    return {
+        **config,
+        "tempo_carga": round(tempo_carga, 2),
+        "tempo": round(tempo, 2),
+        "duracao_audio": round(duracao, 2),
+        "rtf": round(tempo / duracao, 4),
+        "pico_rss_mb": _pico_rss_mb(),
+    }
+
+
+def _pico_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return round(pico / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _medir_em_subprocesso(config, caminho_audio, timeout):
+    comando = [
+        sys.executable,
+        "-m",
+        "src.tools.autotune",
+        "--medir",
+        json.dumps(config),
+        "--audio",
+        caminho_audio,
+    ]
+    try:
+        saida = subprocess.run(
+            comando, capture_output=True, text=True, timeout=timeout, check=True
+        )
+        return json.loads(saida.stdout.strip().splitlines()[-1])
+    except subprocess.TimeoutExpired:
+        logger.error(f"Tempo esgotado em {config}.")
+    except (subprocess.CalledProcessError, ValueError, IndexError) as e:
+        detalhe = getattr(e, "stderr", "") or str(e)
+        logger.error(f"Falha ao medir {config}: {detalhe.strip()[-500:]}")
+    return None
+
+
+def escolher_melhores(medicoes: list, limite_memoria_mb: float = None) -> dict:
+    """
+    Escolhe, para cada modelo, a combinação de menor RTF que respeita o
+    limite de memória.
+
+    Returns:
+        dict: nome do modelo -> melhor medição.
+    """
+    melhores = {}
+    for m in medicoes:
+        if limite_memoria_mb and (m.get("pico_rss_mb") or 0) > limite_memoria_mb:
+            continue
+        atual = melhores.get(m["modelo"])
+        if atual is None or m["rtf"] < atual["rtf"]:
+            melhores[m["modelo"]] = m
+    return melhores
+
+
+def executar(args):
+    load_dotenv()
+    nucleos = os.cpu_count() or 1
+    modelos = args.modelos or [os.getenv("WHISPER_MODEL", "large")]
+    threads = args.threads or sorted({max(1, nucleos // 4), max(1, nucleos // 2), nucleos})
+    grade = list(itertools.product(modelos, args.compute, threads, args.batch))
+    idioma = os.getenv("WHISPER_LANGUAGE", "pt")
+
+    caminho_audio = args.audio
+    if caminho_audio is None:
+        caminho_audio = os.path.join(tempfile.gettempdir(), "autotune_whisper.wav")
+        gerar_clipe_sintetico(caminho_audio, args.segundos)
+        print(f"[🎧] Clipe sintético de {args.segundos:.0f}s gerado em {caminho_audio}")
+
+    print(f"[⚙️] {len(grade)} combinações a medir ({nucleos} núcleos).")
+    medicoes = []
+    for i, (modelo, compute_type, n_threads, batch_size) in enumerate(grade, 1):
+        config = {
+            "modelo": modelo,
+            "idioma": idioma,
+            "compute_type": compute_type,
+            "threads": n_threads,
+            "batch_size": batch_size,
+        }
+        print(f"[{i}/{len(grade)}] {config}", end=" ", flush=True)
+        medicao = _medir_em_subprocesso(config, caminho_audio, args.timeout)
+        if medicao is None:
+            print("❌")
+            continue
+        print(f"→ RTF {medicao['rtf']:.3f}, pico {medicao['pico_rss_mb']} MB")
+        medicoes.append(medicao)
+
+    melhores = escolher_melhores(medicoes, args.limite_memoria_mb)
+    if not melhores:
+        print("[❌] Nenhuma combinação concluída; perfil não salvo.")
+        return 1
+
+    perfil = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "nucleos": nucleos,
+        "audio": caminho_audio,
+        "perfis": melhores,
+        "medicoes": medicoes,
+    }
+    destino = args.saida or caminho_perfil()
+    with open(destino, "w", encoding="utf-8") as f:
+        json.dump(perfil, f, indent=2, ensure_ascii=False)
+
+    for modelo, m in melhores.items():
+        print(
+            f"[✅] {modelo}: {m['compute_type']}, {m['threads']} threads, "
+            f"batch {m['batch_size']} → RTF {m['rtf']:.3f}"
+        )
+    print(f"[💾] Perfil salvo em: {destino}")
+    return 0
+
+
+def _lista(tipo):
+    return lambda valor: [tipo(v) for v in valor.split(",") if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--audio", help="Clipe de referência (padrão: sintético)")
+    parser.add_argument("--segundos", type=float, default=60.0)
+    parser.add_argument("--modelos", type=_lista(str), help="Padrão: WHISPER_MODEL")
+    parser.add_argument("--batch", type=_lista(int), default=[4, 8, 16, 32])
+    parser.add_argument("--threads", type=_lista(int), help="Padrão: núcleos/4, /2 e todos")
+    parser.add_argument("--compute", type=_lista(str), default=["int8", "float32"])
+    parser.add_argument("--limite-memoria-mb", type=float, default=None)
+    parser.add_argument("--timeout", type=float, default=1800)
+    parser.add_argument("--saida", help="Padrão: WHISPER_PERFIL")
+    parser.add_argument("--medir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.medir:
+        # Subprocesso de medição: imprime o resultado em JSON na última linha
+        print(json.dumps(medir(json.loads(args.medir), args.audio)))
+        return 0
+
+    logging.basicConfig(level=logging.INFO)
+    return executar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import hashlib
+import logging
+from dotenv import load_dotenv
+from typing import Dict, List, Optional
+from src.tools.redis_connection import RedisConnection
+from src.tools.importacao_tardia import InstanciaTardia
+
+logger = logging.getLogger(__name__)
+redis = InstanciaTardia(RedisConnection)
+
+
+class CacheLLM:
+    """
+    Cache das respostas do LLM no Redis. A chave é o hash de (modelo,
+    opções, mensagens): a mesma transcrição com as mesmas perguntas, ou o
+    mesmo questionário validado no relatório, não volta ao Ollama.
+
+    Cada resposta expira LLM_CACHE_TTL segundos depois do último uso, e só
+    as LLM_CACHE_MAX usadas mais recentemente são mantidas (índice em
+    sorted set, de onde as expiradas também saem).
+    Acertos e faltas ficam num hash de contadores (ver `estatisticas`).
+    """
+
+    def __init__(
+        self,
+        conexao: Optional[RedisConnection] = None,
+        prefixo: str = "llm:cache",
+        ttl: Optional[int] = None,
+        limite: Optional[int] = None,
+    ):
+        """
+        Args:
+            conexao (RedisConnection, opcional): Conexão usada; a do módulo
+                se None.
+            prefixo (str): Prefixo das chaves no Redis.
+            ttl (int, opcional): Expiração em segundos; LLM_CACHE_TTL se None.
+            limite (int, opcional): Máximo de respostas; LLM_CACHE_MAX se None.
+        """
+        load_dotenv()
+        self.redis = conexao or redis
+        self.prefixo = prefixo
+        self.ativo = os.getenv("LLM_CACHE", "true").lower() in ("1", "true", "sim")
+        self.ttl = ttl or int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+        self.limite = max(1, limite or int(os.getenv("LLM_CACHE_MAX", "200")))
+        self.indice = f"{prefixo}:indice"
+        self.contadores = f"{prefixo}:estatisticas"
+
+    def chave(
+        self, modelo: str, opcoes: dict, mensagens: List[Dict[str, str]]
+    ) -> str:
+        """
+        Calcula a chave da requisição.
+
+        Returns:
+            str: Chave no Redis com o SHA-256 de (modelo, opções, mensagens).
+        """
+        conteudo = json.dumps(
+            {"modelo": modelo, "opcoes": opcoes, "mensagens": mensagens},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return f"{self.prefixo}:{hashlib.sha256(conteudo.encode('utf-8')).hexdigest()}"
+
+    def obter(self, chave: str) -> Optional[str]:
+        """
+        Procura a resposta no cache e conta o acerto ou a falta.
+
+        Returns:
+            Optional[str]: A resposta guardada, ou None.
+        """
+        resposta = self.redis.get_texto(chave)
+        if resposta is None:
+            self.redis.incrementar(self.contadores, "faltas")
+            return None
+        self.redis.incrementar(self.contadores, "acertos")
+        # Renova a expiração e a posição no índice: a mais usada é a última a sair
+        self.redis.expirar(chave, self.ttl)
+        self._registrar(chave)
+        logger.info(f"Resposta do LLM encontrada no cache ({chave}).")
+        return resposta
+
+    def guardar(self, chave: str, resposta: str) -> None:
+        """Guarda a resposta com expiração e remove as mais antigas além do limite."""
+        if not resposta.strip():
+            return
+        if self.redis.set_texto(chave, resposta, ex=self.ttl):
+            self._registrar(chave)
+
+    def _registrar(self, chave: str) -> None:
+        # A pontuação é o último uso, quando a expiração foi renovada: abaixo
+        # de agora - ttl, a resposta já expirou e só ocuparia o limite
+        agora = time.time()
+        removidas = self.redis.registrar_em_indice(
+            self.indice, chave, agora, self.limite, pontuacao_minima=agora - self.ttl
+        )
+        if removidas:
+            self.redis.delete_keys(*removidas)
+            logger.info(f"{len(removidas)} resposta(s) antiga(s) removida(s) do cache.")
+
+    def estatisticas(self) -> dict:
+        """
+        Returns:
+            dict: acertos, faltas e taxa_acertos (0 a 1) acumulados no Redis.
+        """
+        contadores = self.redis.get_contadores(self.contadores)
+        acertos = contadores.get("acertos", 0)
+        faltas = contadores.get("faltas", 0)
+        total = acertos + faltas
+        return {
+            "acertos": acertos,
+            "faltas": faltas,
+            "taxa_acertos": round(acertos / total, 3) if total else 0.0,
+        }
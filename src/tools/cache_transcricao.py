@@ -0,0 +1,124 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class CacheTranscricao:
+    """
+    Cache em disco de transcrições, endereçado pelo conteúdo do áudio.
+
+    A chave é o SHA-256 dos bytes do arquivo de áudio (e do índice
+    '_fala.json', se houver) junto com o modelo, o idioma e as opções da
+    transcrição. Cada resultado fica em `<pasta>/<ab>/<chave>.json`. O
+    horário de modificação marca o último uso; quando a pasta passa de
+    `tamanho_max_mb`, os resultados usados há mais tempo são apagados (LRU).
+    """
+
+    def __init__(self, pasta: str, tamanho_max_mb: float = 200.0):
+        self.pasta = pasta
+        self.tamanho_max = int(tamanho_max_mb * 1024 * 1024)
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.pasta, exist_ok=True)
+
+    @staticmethod
+    def gerar_chave(caminho_audio: str, opcoes: dict, bloco: int = 1 << 20) -> str:
+        """
+        Calcula a chave de cache de um arquivo.
+
+        Args:
+            caminho_audio (str): Arquivo de áudio.
+            opcoes (dict): Modelo, idioma e opções que alteram o resultado.
+            bloco (int): Tamanho da leitura, para não carregar o arquivo todo.
+
+        Returns:
+            str: Hash hexadecimal.
+        """
+        h = hashlib.sha256()
+        h.update(json.dumps(opcoes, sort_keys=True).encode("utf-8"))
+
+        caminho_indice = os.path.splitext(caminho_audio)[0] + "_fala.json"
+        for rotulo, caminho in ((b"audio", caminho_audio), (b"fala", caminho_indice)):
+            if not os.path.exists(caminho):
+                continue
+            h.update(rotulo)
+            with open(caminho, "rb") as f:
+                while parte := f.read(bloco):
+                    h.update(parte)
+        return h.hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.pasta, chave[:2], f"{chave}.json")
+
+    def obter(self, chave: str):
+        """
+        Busca um resultado no cache.
+
+        Returns:
+            dict | None: Resultado no formato do WhisperX ({"segments": [...]}),
+            ou None se não estiver no cache.
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                entrada = json.load(f)
+            os.utime(caminho)  # Marca o uso para o LRU
+        except (OSError, ValueError):
+            self.falhas += 1
+            return None
+
+        self.acertos += 1
+        logger.info(f"Transcrição encontrada no cache ({chave[:12]}).")
+        return {"segments": entrada["segments"]}
+
+    def salvar(self, chave: str, result: dict, arquivo: str = None):
+        """Guarda os segmentos de um resultado e aplica o limite de tamanho."""
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        entrada = {
+            "chave": chave,
+            "arquivo": arquivo,
+            "criado_em": time.time(),
+            "segments": result.get("segments", []),
+        }
+        # Escreve num temporário e renomeia: leitores nunca veem meio arquivo
+        fd, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entrada, f, ensure_ascii=False, default=float)
+        os.replace(temporario, caminho)
+        self._remover_excedente()
+
+    def _remover_excedente(self):
+        with self._lock:
+            entradas = []
+            for raiz, _, arquivos in os.walk(self.pasta):
+                for nome in arquivos:
+                    if nome.endswith(".json"):
+                        caminho = os.path.join(raiz, nome)
+                        st = os.stat(caminho)
+                        entradas.append((st.st_mtime, st.st_size, caminho))
+
+            total = sum(tamanho for _, tamanho, _ in entradas)
+            for _, tamanho, caminho in sorted(entradas):
+                if total <= self.tamanho_max:
+                    break
+                os.remove(caminho)
+                total -= tamanho
+                logger.info(f"Removido do cache de transcrição: {os.path.basename(caminho)}")
+
+    def get_stats(self) -> dict:
+        """Retorna acertos, falhas e a taxa de acerto do cache."""
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+        }
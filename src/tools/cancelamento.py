@@ -0,0 +1,72 @@
+import threading
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class OperacaoCancelada(Exception):
+    """Levantada quando o usuário cancela a transcrição ou a consulta ao LLM."""
+
+
+class TokenCancelamento:
+    """
+    Sinal de cancelamento compartilhado entre a interface e as threads de
+    trabalho.
+
+    A interface chama `cancelar()`; quem trabalha chama `verificar()` entre
+    uma etapa e outra (janelas de áudio, lotes do modelo, trechos da resposta
+    do LLM) e interrompe o que está fazendo ao receber OperacaoCancelada.
+    """
+
+    def __init__(self):
+        self._evento = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def cancelar(self):
+        """Marca o cancelamento e chama as funções registradas em `ao_cancelar`."""
+        with self._lock:
+            if self._evento.is_set():
+                return
+            self._evento.set()
+            callbacks, self._callbacks = self._callbacks, []
+        logger.info("Cancelamento solicitado.")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Erro ao executar callback de cancelamento: {e}")
+
+    @property
+    def cancelado(self) -> bool:
+        return self._evento.is_set()
+
+    def verificar(self):
+        """
+        Raises:
+            OperacaoCancelada: Se o cancelamento já foi solicitado.
+        """
+        if self._evento.is_set():
+            raise OperacaoCancelada("Operação cancelada pelo usuário.")
+
+    def aguardar(self, segundos: float) -> bool:
+        """Espera até `segundos`; retorna True se houve cancelamento."""
+        return self._evento.wait(segundos)
+
+    def ao_cancelar(self, callback):
+        """
+        Registra uma função chamada (uma vez) no cancelamento. Se o
+        cancelamento já ocorreu, ela é chamada na hora.
+        """
+        with self._lock:
+            if not self._evento.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remover(self, callback):
+        """Retira uma função registrada em `ao_cancelar`."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
@@ -0,0 +1,67 @@
+import socket
+import logging
+import threading
+import contextlib
+import httpx
+import httpcore
+
+logger = logging.getLogger(__name__)
+
+
+class ConexoesAbortaveis(httpcore.SyncBackend):
+    """
+    Backend de rede do cliente síncrono do Ollama que guarda os sockets
+    abertos por cada thread.
+
+    Fechar o cliente não acorda uma thread bloqueada lendo a conexão (por
+    exemplo, enquanto o Ollama ainda avalia um prompt longo e não mandou
+    nada). `abortar` derruba os sockets da thread com shutdown: a leitura
+    falha na hora e o servidor vê a conexão fechada e para de gerar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sockets = {}  # ident da thread -> sockets abertos por ela
+
+    def connect_tcp(self, *args, **kwargs):
+        stream = super().connect_tcp(*args, **kwargs)
+        sock = stream.get_extra_info("socket")
+        with self._lock:
+            # Descarta os sockets já fechados de requisições anteriores
+            for thread in list(self._sockets):
+                abertos = [s for s in self._sockets[thread] if s.fileno() != -1]
+                if abertos:
+                    self._sockets[thread] = abertos
+                else:
+                    del self._sockets[thread]
+            self._sockets.setdefault(threading.get_ident(), []).append(sock)
+        return stream
+
+    def abortar(self, thread: int) -> None:
+        """Derruba as conexões abertas pela thread `thread` (ident)."""
+        with self._lock:
+            abertos = self._sockets.pop(thread, [])
+        for sock in abertos:
+            with contextlib.suppress(OSError):
+                sock.shutdown(socket.SHUT_RDWR)
+        if abertos:
+            logger.info("Conexão com o Ollama interrompida.")
+
+    def liberar(self, thread: int) -> None:
+        """Esquece os sockets da thread, que terminou a requisição."""
+        with self._lock:
+            self._sockets.pop(thread, None)
+
+
+def transporte(conexoes: ConexoesAbortaveis) -> httpx.HTTPTransport:
+    """
+    Transporte do httpx (parâmetro `transport` do ollama.Client) que abre as
+    conexões por `conexoes`. Sem keep-alive: cada requisição abre a sua
+    conexão na própria thread, e abortar uma não derruba as outras.
+    """
+    transporte = httpx.HTTPTransport()
+    # O HTTPTransport não recebe o backend de rede; o pool é trocado por um igual
+    transporte._pool = httpcore.ConnectionPool(
+        network_backend=conexoes, max_keepalive_connections=0
+    )
+    return transporte
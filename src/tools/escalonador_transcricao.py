@@ -0,0 +1,182 @@
+import os
+import time
+import logging
+import multiprocessing
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.tools import audio_transcricao
+from src.tools.importacao_tardia import ModuloTardio
+
+
+logger = logging.getLogger(__name__)
+
+whisperx = ModuloTardio("whisperx")  # Importado nos processos do pool
+
+TAXA_WHISPER = audio_transcricao.TAXA_WHISPER
+
+# Modelo carregado em cada processo do pool (um por processo)
+_modelo_worker = None
+_batch_size_worker = 16
+
+
+def _iniciar_worker(model_name, language, compute_type, threads, batch_size):
+    """Carrega o modelo uma vez por processo, limitado a `threads` threads."""
+    global _modelo_worker, _batch_size_worker
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    _modelo_worker = whisperx.load_model(
+        model_name,
+        device="cpu",
+        compute_type=compute_type,
+        language=language,
+        threads=threads,
+    )
+    _batch_size_worker = batch_size
+
+
+def _transcrever_arquivo(caminho: str):
+    """Transcreve um arquivo inteiro dentro de um processo do pool."""
+    inicio = time.perf_counter()
+    audio = audio_transcricao.carregar_audio(caminho)
+    duracao = len(audio) / TAXA_WHISPER
+    audio, mapa_fala = audio_transcricao.recortar_fala(audio, caminho)
+
+    result = _modelo_worker.transcribe(audio, batch_size=_batch_size_worker)
+    if mapa_fala:
+        audio_transcricao.restaurar_tempos(result, mapa_fala)
+
+    tempo = time.perf_counter() - inicio
+    metricas = {
+        "duracao_audio": duracao,
+        "tempo": tempo,
+        "rtf": tempo / duracao if duracao else 0.0,
+        "pid": os.getpid(),
+    }
+    return result, metricas
+
+
+class EscalonadorTranscricao:
+    """
+    Distribui a transcrição de vários arquivos por um pool de processos.
+
+    Cada processo carrega o próprio modelo e recebe uma fatia dos núcleos
+    (threads intra-op do CTranslate2 = núcleos // processos), para que os
+    processos não disputem as mesmas CPUs. Os resultados são entregues na
+    ordem dos arquivos, não na ordem em que terminam.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        language: str,
+        processos: int = 2,
+        compute_type: str = "int8",
+        batch_size: int = 16,
+        nucleos: int = None,
+    ):
+        """
+        Args:
+            model_name (str): Modelo WhisperX (ex.: "large").
+            language (str): Idioma da transcrição.
+            processos (int): Número de processos do pool.
+            compute_type (str): Tipo de computação do CTranslate2 na CPU.
+            batch_size (int): Batch usado em cada transcrição.
+            nucleos (int, opcional): Núcleos disponíveis; os.cpu_count() se None.
+        """
+        nucleos = nucleos or os.cpu_count() or 1
+        self.processos = max(1, min(processos, nucleos))
+        self.threads_por_processo = max(1, nucleos // self.processos)
+        self.model_name = model_name
+        self.language = language
+        self.compute_type = compute_type
+        self.batch_size = batch_size
+        self.metricas = []
+        self.rtf_total = None
+
+    def transcrever(self, caminhos: list, cancelamento=None):
+        """
+        Transcreve os arquivos em paralelo.
+
+        O RTF agregado (`rtf_total`) é registrado quando o gerador termina,
+        é fechado (close) ou sai por erro, com os arquivos concluídos até ali.
+
+        Args:
+            caminhos (list): Arquivos de áudio a transcrever.
+            cancelamento (TokenCancelamento, opcional): Ao cancelar, as
+                tarefas pendentes são descartadas e os processos encerrados.
+
+        Yields:
+            tuple: (caminho, resultado do WhisperX, métricas do arquivo), na
+            mesma ordem de `caminhos`.
+
+        Raises:
+            OperacaoCancelada: Se o cancelamento for solicitado.
+        """
+        self.metricas = []
+        processos = min(self.processos, len(caminhos))
+        logger.info(
+            f"Transcrevendo {len(caminhos)} arquivo(s) em {processos} processo(s) "
+            f"com {self.threads_por_processo} thread(s) cada."
+        )
+
+        inicio = time.perf_counter()
+        try:
+            yield from self._transcrever_no_pool(caminhos, processos, cancelamento)
+        finally:
+            self._registrar_agregado(time.perf_counter() - inicio, processos)
+
+    def _transcrever_no_pool(self, caminhos: list, processos: int, cancelamento):
+        # spawn: os processos não herdam as threads da interface nem do áudio
+        with ProcessPoolExecutor(
+            max_workers=processos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_iniciar_worker,
+            initargs=(
+                self.model_name,
+                self.language,
+                self.compute_type,
+                self.threads_por_processo,
+                self.batch_size,
+            ),
+        ) as pool:
+
+            def interromper():
+                pool.shutdown(wait=False, cancel_futures=True)
+                # O ProcessPoolExecutor só tem terminate_workers() a partir do
+                # Python 3.14; sem isso o processo termina o arquivo atual
+                for processo in list((pool._processes or {}).values()):
+                    processo.terminate()
+
+            if cancelamento is not None:
+                cancelamento.ao_cancelar(interromper)
+            try:
+                futuros = [pool.submit(_transcrever_arquivo, c) for c in caminhos]
+                for caminho, futuro in zip(caminhos, futuros):
+                    try:
+                        result, metricas = futuro.result()
+                    except (BrokenProcessPool, CancelledError):
+                        if cancelamento is not None:
+                            cancelamento.verificar()
+                        raise
+                    metricas["arquivo"] = os.path.basename(caminho)
+                    self.metricas.append(metricas)
+                    logger.info(
+                        f"{metricas['arquivo']}: {metricas['duracao_audio']:.1f}s de áudio "
+                        f"em {metricas['tempo']:.1f}s (RTF {metricas['rtf']:.2f})."
+                    )
+                    yield caminho, result, metricas
+            except GeneratorExit:
+                # Fechado antes do fim: não espera os arquivos que nem começaram
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                if cancelamento is not None:
+                    cancelamento.remover(interromper)
+
+    def _registrar_agregado(self, tempo_total: float, processos: int):
+        """Calcula e registra o RTF agregado dos arquivos concluídos."""
+        duracao_total = sum(m["duracao_audio"] for m in self.metricas)
+        self.rtf_total = tempo_total / duracao_total if duracao_total else 0.0
+        logger.info(
+            f"[📊] {duracao_total:.1f}s de áudio transcritos em {tempo_total:.1f}s "
+            f"(RTF agregado {self.rtf_total:.2f}, {processos} processo(s))."
+        )
@@ -0,0 +1,265 @@
+import re
+import json
+import logging
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Limite de cada resposta no modo JSON (o prompt de texto pede ~50 palavras)
+TAMANHO_MAXIMO_RESPOSTA = 300
+
+
+def normalizar_pergunta(texto: str) -> str:
+    """
+    Normaliza o texto de uma pergunta para comparação: sem negrito,
+    colchetes, prefixo 'Pergunta:', dois-pontos finais nem espaços extras.
+    """
+    texto = texto.replace("*", "").replace("[", "").replace("]", "")
+    texto = re.sub(r"^\s*pergunta\s*:\s*", "", texto, flags=re.IGNORECASE)
+    texto = re.sub(r"\s+", " ", texto).strip().rstrip(":").strip()
+    return texto.lower()
+
+
+class ParserRespostas:
+    """
+    Extrai pares (pergunta, resposta) da resposta do LLM à medida que os
+    trechos chegam pelo stream.
+
+    Entende o formato pedido em OllamaClient._monta_mensagem:
+
+        **Pergunta:** Qual a idade do paciente?
+        45 anos
+
+    e também as variações comuns (**Qual a idade do paciente?** 45 anos,
+    pergunta e resposta na mesma linha, blocos <think> do deepseek-r1).
+    Só linhas completas são analisadas. Uma resposta é entregue quando
+    chega a linha em branco depois dela ou a próxima pergunta; se ela
+    continuar depois da linha em branco, é entregue de novo, completa.
+    """
+
+    def __init__(self, perguntas: List[str]):
+        """
+        Args:
+            perguntas (List[str]): Textos das perguntas enviadas ao LLM.
+        """
+        self._perguntas = {normalizar_pergunta(p): p for p in perguntas}
+        # Mais longas primeiro: "Observações sobre:" não engole as demais
+        self._ordenadas = sorted(self._perguntas, key=len, reverse=True)
+        self._pendente = ""  # Linha incompleta ou tag <think> partida
+        self._pensando = False
+        self._atual = None  # Pergunta cuja resposta está sendo lida
+        self._linhas = []
+        self._entregue = None  # Última resposta entregue da pergunta atual
+        self.respostas = {}
+
+    def alimentar(self, trecho: str) -> List[Tuple[str, str]]:
+        """
+        Processa um trecho do stream.
+
+        Returns:
+            List[Tuple[str, str]]: Pares (pergunta original, resposta) que
+            ficaram completos com este trecho.
+        """
+        self._pendente += trecho
+        visivel = self._separar_pensamento()
+        if self._pensando:
+            linhas = visivel.split("\n")
+        else:
+            linhas = (visivel + self._pendente).split("\n")
+            self._pendente = linhas.pop()
+
+        prontas = []
+        for linha in linhas:
+            prontas.extend(self._processar_linha(linha))
+        return prontas
+
+    def finalizar(self) -> List[Tuple[str, str]]:
+        """Processa o que sobrou no fim do stream e entrega a última resposta."""
+        prontas = []
+        if not self._pensando and self._pendente:
+            prontas.extend(self._processar_linha(self._pendente))
+        self._pendente = ""
+        prontas.extend(self._entregar())
+        self._atual = None
+        return prontas
+
+    def _separar_pensamento(self) -> str:
+        """Remove os blocos <think>...</think>, mesmo partidos entre trechos."""
+        visivel = []
+        while True:
+            if self._pensando:
+                fim = self._pendente.find("</think>")
+                if fim < 0:
+                    # O final pode ser o começo de "</think>"
+                    self._pendente = self._pendente[-len("</think>") :]
+                    break
+                self._pendente = self._pendente[fim + len("</think>") :]
+                self._pensando = False
+            else:
+                inicio = self._pendente.find("<think>")
+                if inicio < 0:
+                    break
+                visivel.append(self._pendente[:inicio])
+                self._pendente = self._pendente[inicio + len("<think>") :]
+                self._pensando = True
+        return "".join(visivel)
+
+    def _processar_linha(self, linha: str) -> List[Tuple[str, str]]:
+        linha = linha.strip()
+        if not linha:
+            # Linha em branco fecha a resposta atual
+            return self._entregar()
+
+        pergunta, resto = self._identificar_pergunta(linha)
+        if pergunta is not None:
+            prontas = self._entregar()
+            self._atual, self._linhas, self._entregue = pergunta or None, [], None
+            if resto:
+                self._linhas.append(resto)
+            return prontas
+
+        if self._atual is not None:
+            self._linhas.append(linha)
+        return []
+
+    def _identificar_pergunta(self, linha: str):
+        """
+        Returns:
+            tuple: (pergunta original, resto da linha) ou (None, None) se a
+            linha não começa uma pergunta. Uma linha 'Pergunta:' com texto
+            desconhecido devolve ("", "") e encerra a resposta anterior.
+        """
+        limpo = linha.replace("*", "").replace("[", "").replace("]", "")
+        rotulada = re.match(r"^\s*pergunta\s*:", limpo, re.IGNORECASE)
+        limpo = re.sub(r"^\s*pergunta\s*:\s*", "", limpo, flags=re.IGNORECASE)
+        limpo = re.sub(r"\s+", " ", limpo).strip()
+        minusculo = limpo.lower()
+
+        if not (linha.startswith("**") or rotulada):
+            # Sem marcação, só aceita a linha inteira igual a uma pergunta
+            chave = minusculo.rstrip(":").strip()
+            if chave in self._perguntas:
+                return self._perguntas[chave], ""
+            return None, None
+
+        for chave in self._ordenadas:
+            if minusculo.startswith(chave):
+                return self._perguntas[chave], limpo[len(chave) :].strip(" :")
+        if rotulada:
+            return "", ""
+        return None, None
+
+    def _entregar(self) -> List[Tuple[str, str]]:
+        if self._atual is None or not self._linhas:
+            return []
+        resposta = " ".join(self._linhas).replace("[", "").replace("]", "").strip()
+        if not resposta or resposta == self._entregue:
+            return []
+        self._entregue = resposta
+        self.respostas[self._atual] = resposta
+        return [(self._atual, resposta)]
+
+
+def montar_schema_respostas(perguntas: Dict[str, dict]) -> dict:
+    """
+    Monta o JSON schema passado no parâmetro `format` do Ollama: um objeto
+    com uma resposta curta (string) para cada ID de pergunta, todas
+    obrigatórias e na ordem das perguntas.
+
+    Args:
+        perguntas (dict): ID -> {"pergunta", "resposta"}, como no JSON de
+            perguntas do LLM.
+
+    Returns:
+        dict: JSON schema do objeto de respostas.
+    """
+    return {
+        "type": "object",
+        "properties": {
+            chave_id: {
+                "type": "string",
+                "description": dados["pergunta"],
+                "maxLength": TAMANHO_MAXIMO_RESPOSTA,
+            }
+            for chave_id, dados in perguntas.items()
+        },
+        "required": list(perguntas),
+        "additionalProperties": False,
+    }
+
+
+class ParserRespostasJSON:
+    """
+    Lê a resposta no formato de `montar_schema_respostas` à medida que os
+    trechos chegam pelo stream, com a mesma interface de ParserRespostas.
+
+    Cada par "ID": "resposta" é entregue assim que a string da resposta
+    fecha. No fim, o texto inteiro passa por um único json.loads, que
+    confirma o que foi entregue (ou completa, se algo escapou).
+    """
+
+    _PAR = re.compile(r'"([^"\\]+)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+    def __init__(self, perguntas: Dict[str, str]):
+        """
+        Args:
+            perguntas (dict): ID -> texto da pergunta enviada ao LLM.
+        """
+        self._perguntas = perguntas
+        self._texto = ""
+        self._posicao = None  # Onde continuar a busca; None até sair do <think>
+        self.respostas = {}
+
+    def alimentar(self, trecho: str) -> List[Tuple[str, str]]:
+        """
+        Processa um trecho do stream.
+
+        Returns:
+            List[Tuple[str, str]]: Pares (pergunta original, resposta) que
+            ficaram completos com este trecho.
+        """
+        self._texto += trecho
+        if self._posicao is None:
+            inicio = self._texto.lstrip()
+            if "<think>".startswith(inicio):
+                return []  # Ainda pode ser o começo de "<think>"
+            if not inicio.startswith("<think>"):
+                self._posicao = 0
+            elif "</think>" in self._texto:
+                self._posicao = self._texto.index("</think>") + len("</think>")
+            else:
+                return []
+
+        prontas = []
+        for par in self._PAR.finditer(self._texto, self._posicao):
+            self._posicao = par.end()
+            try:
+                resposta = json.loads(f'"{par.group(2)}"')
+            except json.JSONDecodeError:
+                resposta = par.group(2)
+            prontas.extend(self._entregar(par.group(1), resposta))
+        return prontas
+
+    def finalizar(self) -> List[Tuple[str, str]]:
+        """Decodifica a resposta inteira e entrega o que ainda faltava."""
+        texto = re.sub(r"<think>.*?</think>", "", self._texto, flags=re.DOTALL)
+        try:
+            dados = json.loads(texto)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Resposta JSON do LLM incompleta ou inválida: {e}")
+            return []
+        if not isinstance(dados, dict):
+            return []
+
+        prontas = []
+        for chave_id, resposta in dados.items():
+            prontas.extend(self._entregar(str(chave_id), str(resposta)))
+        return prontas
+
+    def _entregar(self, chave_id: str, resposta: str) -> List[Tuple[str, str]]:
+        pergunta = self._perguntas.get(chave_id)
+        resposta = resposta.strip()
+        if pergunta is None or not resposta or self.respostas.get(pergunta) == resposta:
+            return []
+        self.respostas[pergunta] = resposta
+        return [(pergunta, resposta)]
@@ -1,16 +1,73 @@
 import os
 import re
 import json
-import ollama
+import time
+import asyncio
+import queue
 import logging
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import List, Dict, Optional
 from src.tools.redis_connection import RedisConnection
+from src.tools.cache_llm import CacheLLM
+from src.tools.cancelamento import OperacaoCancelada, TokenCancelamento
+from src.tools.importacao_tardia import InstanciaTardia, ModuloTardio
+from src.tools.extracao_streaming import (
+    ParserRespostas,
+    ParserRespostasJSON,
+    montar_schema_respostas,
+)
+from src.tools.planejador_extracao import planejar_grupos
 
 
 logger = logging.getLogger(__name__)
-redis = RedisConnection()
+ollama = ModuloTardio("ollama")
+conexao_ollama = ModuloTardio("src.tools.conexao_ollama")
+redis = InstanciaTardia(RedisConnection)
+
+# Início fixo do prompt de extração: igual byte a byte em todas as chamadas,
+# para o Ollama reaproveitar o cache KV (ver _monta_mensagem_conteudo)
+PROMPT_SISTEMA = "Responda todas as perguntas de forma concisa e direta. NUNCA inclua seu processo de pensamento ou qualquer metadado, como blocos <think>...</think>. Forneça APENAS a resposta final."
+
+INSTRUCOES_EXTRACAO = """
+Você é um assistente de IA especializado em transcrever e extrair informações de áudios de consultas de acupuntura. 
+Sua única fonte de informação é a transcrição fornecida. Não utilize conhecimento prévio ou externo. 
+Responda apenas às perguntas listadas abaixo. Se uma pergunta não puder ser respondida com base na transcrição 
+(incluindo casos de informações ambíguas ou incompletas), responda 'NDA' (No Data Available).
+
+**FORMATO DAS RESPOSTAS:**
+Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada resposta.
+**Pergunta:** [Sua resposta aqui, baseada EXCLUSIVAMENTE na transcrição, em no máximo 50 palavras]
+
+**EXEMPLO DE SAÍDA ESPERADA:**
+**Pergunta:** Qual o nome completo do paciente?  
+[Nome do paciente, se encontrado na transcrição]  
+
+**Pergunta:** Qual a idade do paciente?  
+[Idade do paciente, se encontrada na transcrição]  
+"""
+
+# Instruções do modo LLM_FORMATO=json: a saída é restrita pelo schema de
+# montar_schema_respostas e lida com um único json.loads
+INSTRUCOES_EXTRACAO_JSON = """
+Você é um assistente de IA especializado em extrair informações de transcrições de consultas de acupuntura. 
+Sua única fonte de informação é a transcrição fornecida. Não utilize conhecimento prévio ou externo. 
+Responda a cada pergunta listada abaixo. Se uma pergunta não puder ser respondida com base na transcrição 
+(incluindo casos de informações ambíguas ou incompletas), responda 'NDA' (No Data Available).
+
+**FORMATO DAS RESPOSTAS:**
+Responda APENAS com um objeto JSON. As chaves são os IDs das perguntas e os valores são as respostas, 
+baseadas EXCLUSIVAMENTE na transcrição, em no máximo 50 palavras.
+
+**EXEMPLO DE SAÍDA ESPERADA:**
+{"01": "Dor lombar há três meses, pior pela manhã", "02": "NDA"}
+"""
+
+# Template com todas as perguntas do questionário (com os dados pessoais)
+TEMPLATE_PERGUNTAS = (
+    Path(__file__).resolve().parents[1] / "models" / "perguntas_estruturadas.json"
+)
 
 
 class OllamaClient:
@@ -23,8 +80,38 @@ class OllamaClient:
         # Carregar variáveis de ambiente
         load_dotenv()
         self.ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
-        self.client = ollama.Client(host=self.ollama_url)
+        # Conexões que o cancelamento derruba na hora (ver _stream_chat)
+        self.conexoes = conexao_ollama.ConexoesAbortaveis()
+        self.client = ollama.Client(
+            host=self.ollama_url, transport=conexao_ollama.transporte(self.conexoes)
+        )
         self.model_name = os.getenv("MODEL_NAME", "deepseek-r1")
+        self.metricas = {}  # Tempos da última resposta (ver _stream_chat)
+        # Extração por grupos temáticos em requisições simultâneas
+        self.extracao_em_grupos = os.getenv("LLM_GRUPOS", "false").lower() in (
+            "1",
+            "true",
+            "sim",
+        )
+        self.concorrencia = max(1, int(os.getenv("OLLAMA_CONCORRENCIA", "2")))
+        # Ordem do prompt: "prefixo" (fixo antes da transcrição) ou "legado"
+        self.layout_prompt = os.getenv("LLM_LAYOUT_PROMPT", "prefixo").lower()
+        # Tempo que o Ollama mantém o modelo (e o cache do prefixo) carregado
+        self.keep_alive = self._converte_keep_alive(
+            os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        )
+        # Formato da extração: "texto" (**Pergunta:** livre) ou "json" (schema)
+        self.formato_json = os.getenv("LLM_FORMATO", "texto").lower() == "json"
+        # Respostas já geradas para o mesmo modelo e prompt (LLM_CACHE)
+        self.cache = CacheLLM()
+
+    @staticmethod
+    def _converte_keep_alive(valor: str):
+        """Números viram segundos (-1 = para sempre); o resto vai como duração ("30m")."""
+        try:
+            return float(valor)
+        except ValueError:
+            return valor
 
     def _converte_transcricao(self, transcricao: Path) -> str:
         """Converte o conteúdo do arquivo de transcrição em uma string.
@@ -72,8 +159,16 @@ class OllamaClient:
             raise ValueError(
                 f"Arquivo de perguntas em {caminho_perguntas} é inválido ou vazio."
             )
+        return self._formata_perguntas(dados_perguntas)
+
+    def _formata_perguntas(self, dados_perguntas: dict, com_ids: bool = False) -> str:
+        """Formata as perguntas como **Pergunta:** [texto], uma por linha.
+        Com `com_ids`, cada linha traz o ID usado como chave no modo JSON:
+        "01": [texto]."""
         perguntas_formatadas = "\n".join(
-            f"**Pergunta:** {dados['pergunta']}"
+            f'"{id_pergunta}": {dados["pergunta"]}'
+            if com_ids
+            else f"**Pergunta:** {dados['pergunta']}"
             for id_pergunta, dados in dados_perguntas.items()
         )
         return perguntas_formatadas.strip()
@@ -169,29 +264,77 @@ class OllamaClient:
         """
         conteudo_transcricao = self._converte_transcricao(transcricao)
         conteudo_perguntas = self._converte_perguntas(caminho_perguntas)
+        return self._monta_mensagem_conteudo(conteudo_transcricao, conteudo_perguntas)
 
-        instrucoes = """
-Você é um assistente de IA especializado em transcrever e extrair informações de áudios de consultas de acupuntura. 
-Sua única fonte de informação é a transcrição fornecida. Não utilize conhecimento prévio ou externo. 
-Responda apenas às perguntas listadas abaixo. Se uma pergunta não puder ser respondida com base na transcrição 
-(incluindo casos de informações ambíguas ou incompletas), responda 'NDA' (No Data Available).
-
-**FORMATO DAS RESPOSTAS:**
-Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada resposta.
-**Pergunta:** [Sua resposta aqui, baseada EXCLUSIVAMENTE na transcrição, em no máximo 50 palavras]
+    def _monta_mensagem_conteudo(
+        self,
+        conteudo_transcricao: str,
+        conteudo_perguntas: str,
+        layout: str = None,
+        instrucoes: str = INSTRUCOES_EXTRACAO,
+    ) -> str:
+        """Monta a mensagem a partir do texto da transcrição e das perguntas.
 
-**EXEMPLO DE SAÍDA ESPERADA:**
-**Pergunta:** Qual o nome completo do paciente?  
-[Nome do paciente, se encontrado na transcrição]  
+        No layout "prefixo" (padrão), as instruções e as perguntas vêm antes
+        da transcrição e não mudam de uma chamada para outra: o Ollama
+        reaproveita o cache KV desse início e só avalia a transcrição.
+        "legado" mantém a ordem antiga (transcrição antes das perguntas),
+        para comparação (ver test/teste_desempenho_prompt.py).
 
-**Pergunta:** Qual a idade do paciente?  
-[Idade do paciente, se encontrada na transcrição]  
-"""
+        Args:
+            conteudo_transcricao (str): Texto da transcrição.
+            conteudo_perguntas (str): Perguntas formatadas.
+            layout (str, opcional): "prefixo" ou "legado"; LLM_LAYOUT_PROMPT
+                se None.
+            instrucoes (str): Instruções do início do prompt.
 
-        mensagem = f"{instrucoes.strip()}\n\n**TRANSCRIÇÃO FORNECIDA:**\n{conteudo_transcricao}\n\n**PERGUNTAS A SEREM RESPONDIDAS:**\n{conteudo_perguntas}"
+        Returns:
+            str: Mensagem formatada.
+        """
+        layout = layout or self.layout_prompt
+        transcricao = f"**TRANSCRIÇÃO FORNECIDA:**\n{conteudo_transcricao}"
+        perguntas = f"**PERGUNTAS A SEREM RESPONDIDAS:**\n{conteudo_perguntas}"
+        if layout == "legado":
+            partes = [instrucoes.strip(), transcricao, perguntas]
+        else:
+            partes = [instrucoes.strip(), perguntas, transcricao]
+        mensagem = "\n\n".join(partes)
         logger.info(f"Mensagem montada com {len(mensagem)} caracteres.")
         return mensagem
 
+    def _prepara_extracao(self, conteudo_transcricao: str, perguntas: dict):
+        """
+        Monta o prompt, o parser e as opções do chat para extrair as
+        respostas de `perguntas` no formato de LLM_FORMATO.
+
+        No modo JSON, o schema vai no parâmetro `format` do Ollama e as
+        respostas chegam por ID, sem depender do texto da pergunta.
+
+        Args:
+            conteudo_transcricao (str): Texto da transcrição.
+            perguntas (dict): Perguntas do LLM (ID -> dados).
+
+        Returns:
+            tuple: (mensagens, parser, opções do chat).
+        """
+        if self.formato_json:
+            mensagem = self._monta_mensagem_conteudo(
+                conteudo_transcricao,
+                self._formata_perguntas(perguntas, com_ids=True),
+                instrucoes=INSTRUCOES_EXTRACAO_JSON,
+            )
+            parser = ParserRespostasJSON(
+                {chave_id: dados["pergunta"] for chave_id, dados in perguntas.items()}
+            )
+            opcoes = {"format": montar_schema_respostas(perguntas)}
+        else:
+            mensagem = self._monta_mensagem_conteudo(
+                conteudo_transcricao, self._formata_perguntas(perguntas)
+            )
+            parser = ParserRespostas([d["pergunta"] for d in perguntas.values()])
+            opcoes = {}
+        return self._monta_prompt(mensagem), parser, opcoes
+
     def _monta_prompt(self, mensagem: str) -> List[Dict[str, str]]:
         """Monta o prompt para o modelo a partir da mensagem fornecida.
 
@@ -204,7 +347,7 @@ Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada
         mensagens = [
             {
                 "role": "system",
-                "content": "Responda todas as perguntas de forma concisa e direta. NUNCA inclua seu processo de pensamento ou qualquer metadado, como blocos <think>...</think>. Forneça APENAS a resposta final.",
+                "content": PROMPT_SISTEMA,
             },
             {
                 "role": "user",
@@ -213,38 +356,189 @@ Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada
         ]
         return mensagens
 
-    def _ollama_talk(self, mensagens: List[Dict[str, str]]) -> str:
+    def _ollama_talk(
+        self,
+        mensagens: List[Dict[str, str]],
+        cancelamento: Optional[TokenCancelamento] = None,
+        usar_cache: bool = True,
+        **opcoes,
+    ) -> str:
         """Envia mensagens para o modelo Ollama e retorna a resposta.
 
         Args:
             mensagens (List[Dict[str, str]]): Lista de mensagens a serem enviadas.
+            cancelamento (TokenCancelamento, opcional): Interrompe a espera e
+                fecha a conexão com o Ollama, que para de gerar a resposta.
+            usar_cache (bool): False ignora o cache e gera a resposta de novo
+                (a nova resposta substitui a guardada).
+            **opcoes: Repassadas ao chat do Ollama (entram na chave do cache).
 
         Returns:
             str: Resposta do modelo.
 
         Raises:
-            ollama.OllamaError: Se houver erro na comunicação com o Ollama.
+            ollama.ResponseError: Se houver erro na comunicação com o Ollama.
+            OperacaoCancelada: Se o cancelamento for solicitado.
         """
         try:
             logger.info(
                 f"Enviando mensagem para o modelo '{self.model_name}' em {self.ollama_url}..."
             )
-            response = self.client.chat(
-                model=self.model_name,
-                messages=mensagens,
-                # stream=True,  # Descomente para resposta em tempo real, se desejar
-                # options={'temperature': 0.8}  # Ajuste a criatividade, se necessário
+            resposta_do_modelo = "".join(
+                self._chat_com_cache(mensagens, cancelamento, usar_cache, **opcoes)
             )
-            resposta_do_modelo = response["message"]["content"]
             logger.info(f"Resposta recebida: {resposta_do_modelo}")
             return resposta_do_modelo
-        except ollama.OllamaError as e:
+        except OperacaoCancelada:
+            logger.info("Consulta ao Ollama cancelada pelo usuário.")
+            raise
+        except (ollama.ResponseError, ollama.RequestError) as e:
             logger.error(f"Erro ao interagir com o Ollama: {e}")
             raise
         except Exception as e:
             logger.error(f"Erro inesperado em _ollama_talk: {e}")
             raise
 
+    def _stream_chat(
+        self,
+        mensagens: List[Dict[str, str]],
+        cancelamento: Optional[TokenCancelamento] = None,
+        **opcoes,
+    ):
+        """
+        Faz o chat com stream=True e entrega os trechos da resposta à medida
+        que chegam.
+
+        A leitura da conexão roda numa thread auxiliar: quem consome verifica
+        o cancelamento a cada 0,1 s, mesmo enquanto o Ollama ainda avalia o
+        prompt e nenhum trecho chegou. Ao cancelar (ou ao sair antes do fim),
+        quem consome derruba a conexão da thread (ver ConexoesAbortaveis), e
+        o Ollama para de avaliar o prompt ou de gerar.
+
+        Yields:
+            str: Trechos do conteúdo da resposta.
+
+        Raises:
+            OperacaoCancelada: Se o cancelamento for solicitado.
+        """
+        cancelamento = cancelamento or TokenCancelamento()
+        inicio = time.perf_counter()
+        self.metricas = {"modelo": self.model_name}
+        fila = queue.Queue()
+        parar = threading.Event()  # Consumidor saiu antes do fim
+
+        def consumir():
+            try:
+                stream = self.client.chat(
+                    model=self.model_name,
+                    messages=mensagens,
+                    stream=True,
+                    keep_alive=self.keep_alive,
+                    **opcoes,
+                )
+                try:
+                    for parte in stream:
+                        if cancelamento.cancelado or parar.is_set():
+                            logger.info("Requisição ao Ollama interrompida.")
+                            break
+                        fila.put(("parte", parte["message"]["content"]))
+                finally:
+                    stream.close()
+                fila.put(("fim", None))
+            except Exception as e:
+                fila.put(("erro", e))
+            finally:
+                self.conexoes.liberar(threading.get_ident())
+
+        leitor = threading.Thread(target=consumir, daemon=True)
+        leitor.start()
+        concluido = False
+        try:
+            while True:
+                try:
+                    tipo, valor = fila.get(timeout=0.1)
+                except queue.Empty:
+                    cancelamento.verificar()
+                    continue
+                cancelamento.verificar()
+                if tipo == "erro":
+                    concluido = True
+                    raise valor
+                if tipo == "fim":
+                    concluido = True
+                    self.metricas["tempo_ultimo_token"] = round(
+                        time.perf_counter() - inicio, 3
+                    )
+                    logger.info(f"Métricas do LLM: {self.metricas}")
+                    return
+                if "tempo_primeiro_token" not in self.metricas:
+                    self.metricas["tempo_primeiro_token"] = round(
+                        time.perf_counter() - inicio, 3
+                    )
+                yield valor
+        finally:
+            parar.set()
+            if not concluido:
+                # A leitura pode estar bloqueada esperando o primeiro trecho
+                self.conexoes.abortar(leitor.ident)
+
+    def _chat_com_cache(
+        self,
+        mensagens: List[Dict[str, str]],
+        cancelamento: Optional[TokenCancelamento] = None,
+        usar_cache: bool = True,
+        **opcoes,
+    ):
+        """
+        Como `_stream_chat`, mas consulta o cache antes: num acerto, a
+        resposta guardada é entregue inteira, sem chamar o Ollama. Uma
+        resposta nova só é guardada se o stream chegar ao fim.
+
+        Args:
+            usar_cache (bool): False não consulta o cache, mas guarda a
+                resposta nova.
+
+        Yields:
+            str: Trechos do conteúdo da resposta.
+
+        Raises:
+            OperacaoCancelada: Se o cancelamento for solicitado.
+        """
+        chave = None
+        if self.cache.ativo:
+            chave = self.cache.chave(self.model_name, opcoes, mensagens)
+            resposta = self.cache.obter(chave) if usar_cache else None
+            if resposta is not None:
+                self.metricas = {"modelo": self.model_name, "cache": True}
+                yield resposta
+                return
+
+        trechos = []
+        for trecho in self._stream_chat(mensagens, cancelamento, **opcoes):
+            trechos.append(trecho)
+            yield trecho
+        if chave is not None:
+            self.cache.guardar(chave, "".join(trechos))
+
+    def medir_avaliacao_prompt(self, mensagens: List[Dict[str, str]]) -> dict:
+        """
+        Envia as mensagens pedindo um único token e retorna quanto do prompt
+        o Ollama precisou avaliar (o que veio do cache KV não conta).
+
+        Returns:
+            dict: prompt_eval_count (tokens avaliados) e prompt_eval_ms.
+        """
+        response = self.client.chat(
+            model=self.model_name,
+            messages=mensagens,
+            options={"num_predict": 1},
+            keep_alive=self.keep_alive,
+        )
+        return {
+            "prompt_eval_count": response.get("prompt_eval_count") or 0,
+            "prompt_eval_ms": (response.get("prompt_eval_duration") or 0) / 1e6,
+        }
+
     def _limpa_relatorio(self, resposta: str) -> str:
         """
         Remove informações desnecessárias do relatório.
@@ -301,7 +595,7 @@ Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada
             # logger.info(f"Dados sendo inseridos no Redis: {dict_resposta_novo}")
             json_sucess = self._preencher_template_json(
                 dict_concatenados,
-                "/media/Dados/MVP_Acupuntura/src/models/perguntas_estruturadas.json",
+                TEMPLATE_PERGUNTAS,
                 "/tmp/teste_inserir_redis.json",
             )
 
@@ -403,12 +697,251 @@ Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada
             logger.error(f"Ocorreu um erro inesperado: {e}")
             return ""
 
+    def preparar_questionario(self, uuid: str) -> str:
+        """
+        Cria no Redis o questionário completo, com os dados pessoais já
+        gravados em `uuid` e as demais respostas vazias, para a extração em
+        streaming ir preenchendo.
+
+        Args:
+            uuid (str): Chave dos dados pessoais do paciente (apagada aqui).
+
+        Returns:
+            str: Chave do novo questionário no Redis.
+        """
+        dados_paciente = redis.get_value(uuid) or {}
+        with open(TEMPLATE_PERGUNTAS, "r", encoding="utf-8") as f:
+            template = json.load(f)
+        for dados in template.values():
+            dados["resposta"] = dados_paciente.get(dados["pergunta"], "")
+
+        key_redis = redis.set_value(template)
+        redis.delete_key(uuid)
+        logger.info(f"Questionário criado no Redis para UUID: {key_redis}")
+        return key_redis
+
+    def extrair_em_streaming(
+        self,
+        key_redis: str,
+        transcricao: Path,
+        questionario: Path,
+        ao_responder=None,
+        cancelamento: Optional[TokenCancelamento] = None,
+        usar_cache: bool = True,
+    ) -> dict:
+        """
+        Extrai as respostas com o stream do Ollama, gravando cada uma no
+        Redis assim que fica completa (ver ParserRespostas). Com
+        LLM_GRUPOS=true, as perguntas vão em grupos temáticos simultâneos
+        (ver _extrair_grupos); com LLM_FORMATO=json, a resposta é um objeto
+        JSON restrito por schema (ver _prepara_extracao).
+
+        Args:
+            key_redis (str): Questionário criado por `preparar_questionario`.
+            transcricao (Path): Caminho do arquivo com a transcrição.
+            questionario (Path): Caminho do arquivo com as perguntas do LLM.
+            ao_responder (callable, opcional): Recebe (id da pergunta,
+                resposta) a cada resposta, inclusive os 'NDA' do final.
+            cancelamento (TokenCancelamento, opcional): Aborta a requisição.
+            usar_cache (bool): False gera as respostas de novo mesmo que o
+                mesmo prompt já esteja no cache (ver _chat_com_cache).
+
+        Returns:
+            dict: id da pergunta -> resposta extraída.
+
+        Raises:
+            OperacaoCancelada: Se o cancelamento for solicitado.
+        """
+        with open(questionario, "r", encoding="utf-8") as f:
+            dados_perguntas = json.load(f)
+        template = redis.get_value(key_redis) or {}
+        ids = {dados["pergunta"]: chave_id for chave_id, dados in template.items()}
+
+        inicio = time.perf_counter()
+        respostas = {}
+
+        def registrar(pares):
+            for pergunta, resposta in pares:
+                chave_id = ids.get(pergunta)
+                if chave_id is None:
+                    continue
+                if not respostas:
+                    self.metricas["tempo_primeira_resposta"] = round(
+                        time.perf_counter() - inicio, 3
+                    )
+                respostas[chave_id] = resposta
+                redis.update_value(
+                    key_redis, {chave_id: {"pergunta": pergunta, "resposta": resposta}}
+                )
+                if ao_responder is not None:
+                    ao_responder(chave_id, resposta)
+
+        conteudo_transcricao = self._converte_transcricao(transcricao)
+        if self.extracao_em_grupos:
+            asyncio.run(
+                self._extrair_grupos(
+                    conteudo_transcricao,
+                    dados_perguntas,
+                    registrar,
+                    cancelamento,
+                    usar_cache,
+                )
+            )
+        else:
+            prompt, parser, opcoes = self._prepara_extracao(
+                conteudo_transcricao, dados_perguntas
+            )
+            for trecho in self._chat_com_cache(
+                prompt, cancelamento, usar_cache, **opcoes
+            ):
+                registrar(parser.alimentar(trecho))
+            registrar(parser.finalizar())
+        self.metricas["respostas"] = len(respostas)
+        self.metricas["formato"] = "json" if self.formato_json else "texto"
+
+        # Perguntas que o LLM não respondeu ficam como NDA
+        faltando = {
+            chave_id: {"pergunta": dados["pergunta"], "resposta": "NDA"}
+            for chave_id, dados in (redis.get_value(key_redis) or {}).items()
+            if not dados.get("resposta")
+        }
+        if faltando:
+            redis.update_value(key_redis, faltando)
+            if ao_responder is not None:
+                for chave_id in faltando:
+                    ao_responder(chave_id, "NDA")
+
+        logger.info(
+            f"{len(respostas)} resposta(s) extraída(s) em streaming para {key_redis}."
+        )
+        return respostas
+
+    async def _extrair_grupos(
+        self,
+        conteudo_transcricao: str,
+        dados_perguntas: dict,
+        registrar,
+        cancelamento: Optional[TokenCancelamento] = None,
+        usar_cache: bool = True,
+    ):
+        """
+        Envia cada grupo temático de perguntas (ver planejar_grupos) como
+        uma requisição própria, até `concorrencia` ao mesmo tempo, pelo
+        cliente assíncrono do Ollama. O servidor só atende em paralelo com
+        OLLAMA_NUM_PARALLEL > 1; acima disso as requisições esperam na fila.
+
+        Args:
+            conteudo_transcricao (str): Texto da transcrição.
+            dados_perguntas (dict): Perguntas do LLM (ID -> dados).
+            registrar (callable): Recebe a lista de pares (pergunta, resposta)
+                de cada trecho, como em extrair_em_streaming.
+            cancelamento (TokenCancelamento, opcional): Cancela os grupos em
+                andamento e fecha as conexões.
+            usar_cache (bool): Como em _chat_com_cache, por grupo.
+
+        Raises:
+            OperacaoCancelada: Se o cancelamento for solicitado.
+        """
+        cancelamento = cancelamento or TokenCancelamento()
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        plano = planejar_grupos(dados_perguntas)
+        inicio = time.perf_counter()
+        self.metricas = {
+            "modelo": self.model_name,
+            "grupos": len(plano),
+            "concorrencia": self.concorrencia,
+            "tempos_grupos": {},
+        }
+        logger.info(
+            f"Extraindo {len(dados_perguntas)} perguntas em {len(plano)} grupos "
+            f"({self.concorrencia} requisições simultâneas)."
+        )
+
+        async def extrair_grupo(cliente, nome, perguntas):
+            prompt, parser, opcoes = self._prepara_extracao(
+                conteudo_transcricao, perguntas
+            )
+            chave = None
+            if self.cache.ativo:
+                chave = self.cache.chave(self.model_name, opcoes, prompt)
+                resposta = self.cache.obter(chave) if usar_cache else None
+                if resposta is not None:
+                    registrar(parser.alimentar(resposta))
+                    registrar(parser.finalizar())
+                    self.metricas["tempos_grupos"][nome] = {"cache": True}
+                    return
+
+            trechos = []
+            async with semaforo:
+                inicio_grupo = time.perf_counter()
+                tempos = {}
+                stream = await cliente.chat(
+                    model=self.model_name,
+                    messages=prompt,
+                    stream=True,
+                    keep_alive=self.keep_alive,
+                    **opcoes,
+                )
+                try:
+                    async for parte in stream:
+                        cancelamento.verificar()
+                        if "primeiro_token" not in tempos:
+                            tempos["primeiro_token"] = round(
+                                time.perf_counter() - inicio_grupo, 3
+                            )
+                            self.metricas.setdefault(
+                                "tempo_primeiro_token",
+                                round(time.perf_counter() - inicio, 3),
+                            )
+                        trechos.append(parte["message"]["content"])
+                        registrar(parser.alimentar(trechos[-1]))
+                finally:
+                    await stream.aclose()
+                registrar(parser.finalizar())
+                if chave is not None:
+                    self.cache.guardar(chave, "".join(trechos))
+                tempos["ultimo_token"] = round(time.perf_counter() - inicio_grupo, 3)
+                self.metricas["tempos_grupos"][nome] = tempos
+
+        async def vigiar_cancelamento():
+            while not cancelamento.cancelado:
+                await asyncio.sleep(0.1)
+
+        async with ollama.AsyncClient(host=self.ollama_url) as cliente:
+            tarefas = [
+                asyncio.create_task(extrair_grupo(cliente, nome, perguntas))
+                for nome, perguntas in plano
+            ]
+            vigia = asyncio.create_task(vigiar_cancelamento())
+            pendentes = set(tarefas)
+            try:
+                while pendentes:
+                    feitas, pendentes = await asyncio.wait(
+                        pendentes | {vigia}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    cancelamento.verificar()
+                    pendentes.discard(vigia)
+                    for tarefa in feitas:
+                        tarefa.result()  # Propaga o erro de um grupo
+            finally:
+                # Cancelar as tarefas fecha os streams, e o Ollama para de gerar
+                vigia.cancel()
+                for tarefa in tarefas:
+                    tarefa.cancel()
+                await asyncio.gather(*tarefas, return_exceptions=True)
+
+        self.metricas["tempo_ultimo_token"] = round(time.perf_counter() - inicio, 3)
+        logger.info(f"Métricas do LLM: {self.metricas}")
+
     def inicio_llm(
         self,
         uuid: str,
         transcricao: Path,
         questionario: Path,
         bool_relatorio: bool = False,
+        cancelamento: Optional[TokenCancelamento] = None,
+        streaming: bool = False,
+        usar_cache: bool = True,
     ) -> str:
         """
         Inicia o processo de interação com o modelo LLM e retorna a resposta.
@@ -416,6 +949,13 @@ Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada
         Args:
             transcricao (Path): Caminho para o arquivo de transcrição.
             questionario (Path): Caminho para o arquivo de questionário.
+            cancelamento (TokenCancelamento, opcional): Aborta a requisição
+                em andamento ao Ollama.
+            streaming (bool): Grava cada resposta no Redis assim que ela
+                chega (ver extrair_em_streaming). Sempre usado com
+                LLM_FORMATO=json.
+            usar_cache (bool): False força uma resposta nova do LLM em vez da
+                guardada no cache (ver CacheLLM).
 
         Returns:
             str: Resposta do modelo LLM.
@@ -424,7 +964,19 @@ Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada
             FileNotFoundError: Se os arquivos não existirem.
             ValueError: Se os arquivos estiverem vazios.
             Exception: Erros gerais da interação com Ollama.
+            OperacaoCancelada: Se o cancelamento for solicitado.
         """
+        if (streaming or self.formato_json) and not bool_relatorio:
+            key_redis = self.preparar_questionario(uuid)
+            self.extrair_em_streaming(
+                key_redis,
+                transcricao,
+                questionario,
+                cancelamento=cancelamento,
+                usar_cache=usar_cache,
+            )
+            return key_redis
+
         if bool_relatorio:
             logger.info("Gerando relatório...")
             mensagem = self._monta_mensagem_relatorio(uuid)
@@ -432,7 +984,7 @@ Use o formato abaixo para cada pergunta. Pule exatamente duas linhas após cada
             mensagem = self._monta_mensagem(transcricao, questionario)
 
         prompt = self._monta_prompt(mensagem)
-        resposta = self._ollama_talk(prompt)
+        resposta = self._ollama_talk(prompt, cancelamento, usar_cache)
         if bool_relatorio:
             return_llm = self._limpa_relatorio(resposta)
         else:
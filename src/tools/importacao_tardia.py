@@ -0,0 +1,72 @@
+import importlib
+import threading
+
+
+class ModuloTardio:
+    """
+    Representa um módulo pesado (torch, whisperx, ollama, redis) que só é
+    importado no primeiro acesso a um atributo.
+
+    Uso:
+        whisperx = ModuloTardio("whisperx")
+        ...
+        whisperx.load_model(...)  # importa aqui, não ao abrir a aplicação
+    """
+
+    def __init__(self, nome: str):
+        self._nome = nome
+        self._modulo = None
+        self._lock = threading.Lock()
+
+    def _carregar(self):
+        if self._modulo is None:
+            with self._lock:
+                if self._modulo is None:
+                    self._modulo = importlib.import_module(self._nome)
+        return self._modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self._carregar(), atributo)
+
+    @property
+    def carregado(self) -> bool:
+        """Indica se o módulo já foi importado."""
+        return self._modulo is not None
+
+    def __repr__(self):
+        estado = "importado" if self._modulo is not None else "não importado"
+        return f"<ModuloTardio '{self._nome}' ({estado})>"
+
+
+class InstanciaTardia:
+    """
+    Singleton de módulo criado só no primeiro uso.
+
+    Uso:
+        llm_question = InstanciaTardia(OllamaClient)
+        ...
+        llm_question.inicio_llm(...)  # cria o OllamaClient aqui
+    """
+
+    def __init__(self, fabrica, *args, **kwargs):
+        object.__setattr__(self, "_fabrica", lambda: fabrica(*args, **kwargs))
+        object.__setattr__(self, "_objeto", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _obter(self):
+        if self._objeto is None:
+            with self._lock:
+                if self._objeto is None:
+                    object.__setattr__(self, "_objeto", self._fabrica())
+        return self._objeto
+
+    def __getattr__(self, atributo):
+        return getattr(self._obter(), atributo)
+
+    def __setattr__(self, atributo, valor):
+        setattr(self._obter(), atributo, valor)
+
+    @property
+    def criado(self) -> bool:
+        """Indica se o objeto já foi criado."""
+        return self._objeto is not None
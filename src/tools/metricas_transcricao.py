@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import logging
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressoTranscricao:
+    """
+    Calcula o progresso da transcrição pelos segundos de áudio já
+    processados sobre a duração total dos arquivos, com o fator de tempo
+    real (RTF) medido até aqui e a estimativa de tempo restante (ETA).
+
+    Arquivos resolvidos sem transcrever (cache ou transcrição incremental)
+    contam no progresso, mas não no RTF.
+    """
+
+    def __init__(self, duracoes: dict):
+        """
+        Args:
+            duracoes (dict): Nome do arquivo -> duração em segundos (None se
+                desconhecida; usa a média dos demais).
+        """
+        conhecidas = [d for d in duracoes.values() if d]
+        media = sum(conhecidas) / len(conhecidas) if conhecidas else 60.0
+        self.duracoes = {nome: d or media for nome, d in duracoes.items()}
+        self.total = sum(self.duracoes.values()) or 1.0
+        self.concluido = 0.0  # Segundos de arquivos já terminados
+        self.atual = 0.0  # Segundos processados do arquivo em andamento
+        self.transcrito = 0.0  # Segundos que passaram pelo modelo
+        self.tempo_transcricao = 0.0
+        self._inicio_arquivo = None
+
+    def iniciar_arquivo(self):
+        """Marca o início da transcrição de um arquivo pelo modelo."""
+        self.atual = 0.0
+        self._inicio_arquivo = time.perf_counter()
+
+    def avancar(self, nome: str, fracao: float):
+        """Atualiza quanto do arquivo em andamento já foi transcrito (0 a 1)."""
+        self.atual = self.duracoes[nome] * min(max(fracao, 0.0), 1.0)
+
+    def concluir_arquivo(self, nome: str, transcrito: bool = True):
+        """
+        Soma o arquivo ao progresso.
+
+        Args:
+            nome (str): Nome do arquivo.
+            transcrito (bool): False se veio do cache ou da transcrição
+                incremental (não entra no RTF).
+        """
+        if transcrito and self._inicio_arquivo is not None:
+            self.transcrito += self.duracoes[nome]
+            self.tempo_transcricao += time.perf_counter() - self._inicio_arquivo
+        self.concluido += self.duracoes[nome]
+        self.atual = 0.0
+        self._inicio_arquivo = None
+
+    @property
+    def percentual(self) -> float:
+        return 100.0 * min((self.concluido + self.atual) / self.total, 1.0)
+
+    @property
+    def rtf(self):
+        """Segundos de processamento por segundo de áudio (None sem medição)."""
+        tempo, audio = self.tempo_transcricao, self.transcrito
+        if self._inicio_arquivo is not None:
+            tempo += time.perf_counter() - self._inicio_arquivo
+            audio += self.atual
+        return tempo / audio if audio > 0 else None
+
+    @property
+    def eta(self):
+        """Segundos estimados até o fim (None enquanto não houver RTF)."""
+        rtf = self.rtf
+        if rtf is None:
+            return None
+        return rtf * (self.total - self.concluido - self.atual)
+
+
+def registrar_metricas(metricas: dict, caminho: str = None):
+    """
+    Acrescenta uma linha JSON com as métricas de um arquivo ao log de
+    métricas (TRANSCRICAO_METRICAS, padrão logs/metricas_transcricao.jsonl).
+    """
+    caminho = caminho or os.getenv(
+        "TRANSCRICAO_METRICAS", os.path.join("logs", "metricas_transcricao.jsonl")
+    )
+    linha = {"data": datetime.now().isoformat(timespec="seconds"), **metricas}
+    try:
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with open(caminho, "a", encoding="utf-8") as f:
+            f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning(f"Não foi possível registrar métricas em {caminho}: {e}")
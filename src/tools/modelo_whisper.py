@@ -0,0 +1,289 @@
+import gc
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from src.tools.importacao_tardia import ModuloTardio
+
+
+logger = logging.getLogger(__name__)
+
+# Importados só quando o modelo é carregado (a tela de gravação abre sem eles)
+torch = ModuloTardio("torch")
+whisperx = ModuloTardio("whisperx")
+
+
+class ModeloWhisper:
+    """
+    Mantém o modelo WhisperX carregado entre as consultas.
+
+    O modelo é carregado na primeira vez que alguém precisa dele e fica em
+    memória para as sessões seguintes. Depois de `tempo_ocioso` segundos sem
+    uso ele é descarregado para liberar memória (0 mantém o modelo sempre
+    carregado); `descarregar` faz isso na hora. `precarregar` começa a
+    carregar em segundo plano, enquanto a consulta ainda está sendo gravada,
+    e reserva o modelo até `liberar_reserva`: uma gravação mais longa que
+    `tempo_ocioso` não o descarrega antes de ser transcrita.
+
+    O carregamento (dezenas de segundos) roda fora do lock: quem chama da
+    interface nunca espera por ele; só a troca do estado é protegida.
+    """
+
+    def __init__(self, tempo_ocioso: float = None):
+        load_dotenv()
+        if tempo_ocioso is None:
+            tempo_ocioso = float(os.getenv("WHISPER_TEMPO_OCIOSO", "900"))
+        self.tempo_ocioso = tempo_ocioso
+        self._device = None  # Detectado no primeiro uso (importa o torch)
+        self._compute_type = None
+        self._perfil_cpu = None  # (compute_type, threads) pedido em `configurar`
+        self.threads = None  # Threads do CTranslate2 na CPU (None = padrão)
+        self.model = None
+        self.config = None  # (modelo, idioma) do modelo carregado
+        self._lock = threading.RLock()
+        self._carga_concluida = threading.Condition(self._lock)
+        self._carregando = None  # (modelo, idioma) sendo carregado agora
+        self._carga_descartada = False  # Configuração mudou durante a carga
+        self._em_uso = 0
+        self._reservado = False  # Pré-carregado para a sessão em gravação
+        self._ultimo_uso = time.monotonic()
+        self._timer = None
+        self._precarga = None
+        self.estado = "descarregado"  # descarregado | carregando | carregado | erro
+        self.inicio_carga = None
+
+    @property
+    def carregado(self) -> bool:
+        return self.model is not None
+
+    @property
+    def device(self) -> str:
+        """"cuda" ou "cpu"; a primeira consulta importa o torch."""
+        if self._device is None:
+            # Importa o torch fora do lock (leva segundos)
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            with self._lock:
+                if self._device is None:
+                    self._device = device
+                    self._aplicar_perfil()
+        return self._device
+
+    @property
+    def compute_type(self) -> str:
+        if self._compute_type is None:
+            return "float16" if self.device == "cuda" else "int8"
+        return self._compute_type
+
+    @compute_type.setter
+    def compute_type(self, valor: str):
+        self._compute_type = valor
+
+    def configurar(self, compute_type: str = None, threads: int = None):
+        """
+        Ajusta a inferência na CPU (ex.: perfil do autotune). Se o modelo já
+        estiver carregado com outra configuração, ele é descarregado e será
+        recarregado no próximo uso.
+
+        Enquanto o dispositivo não foi detectado, o ajuste fica guardado e é
+        aplicado na detecção, para não importar o torch ao abrir a aplicação.
+        """
+        with self._lock:
+            self._perfil_cpu = (compute_type, threads)
+            if self._device is not None:
+                self._aplicar_perfil()
+
+    def _aplicar_perfil(self):
+        if self._perfil_cpu is None or self._device != "cpu":
+            return
+        compute_type, threads = self._perfil_cpu
+        novo = (compute_type or self.compute_type, threads or self.threads)
+        if novo != (self.compute_type, self.threads):
+            self.descarregar()
+            self.compute_type, self.threads = novo
+            logger.info(f"Perfil do autotune aplicado: {novo[0]}, {novo[1]} threads.")
+
+    def precarregar(self, nome_modelo: str, idioma: str):
+        """
+        Começa a carregar o modelo numa thread, sem bloquear quem chamou.
+        Não carrega de novo se ele já estiver carregado ou carregando. Nos
+        dois casos o modelo fica reservado até `liberar_reserva`.
+        """
+        with self._lock:
+            self._reservado = True
+            if self.model is not None and self.config == (nome_modelo, idioma):
+                self._agendar_descarga()
+                return
+            if self._precarga is not None and self._precarga.is_alive():
+                return
+            self._precarga = threading.Thread(
+                target=self._executar_precarga, args=(nome_modelo, idioma), daemon=True
+            )
+            self.estado = "carregando"
+            self.inicio_carga = time.monotonic()
+            self._precarga.start()
+        logger.info(f"Pré-carregando o modelo WhisperX '{nome_modelo}'.")
+
+    def liberar_reserva(self):
+        """
+        Encerra a reserva feita por `precarregar` (a sessão foi transcrita);
+        o modelo volta a ser descarregado depois de `tempo_ocioso` sem uso.
+        """
+        with self._lock:
+            if not self._reservado:
+                return
+            self._reservado = False
+            if self.model is not None:
+                self._agendar_descarga()
+
+    def aguardar_precarga(self, timeout: float = None) -> bool:
+        """
+        Aguarda o pré-carregamento em andamento, se houver.
+
+        Returns:
+            bool: True se o modelo terminou de carregar.
+        """
+        precarga = self._precarga
+        if precarga is not None:
+            precarga.join(timeout)
+        return self.carregado
+
+    def _executar_precarga(self, nome_modelo, idioma):
+        try:
+            self.obter(nome_modelo, idioma)
+        except Exception as e:
+            logger.error(f"Erro ao pré-carregar o modelo WhisperX: {e}")
+
+    def obter(self, nome_modelo: str, idioma: str):
+        """
+        Retorna o modelo pedido, carregando-o se necessário. Se outro modelo
+        (ou idioma) estiver carregado, ele é trocado.
+
+        Args:
+            nome_modelo (str): Nome do modelo WhisperX (ex.: "large").
+            idioma (str): Idioma da transcrição (ex.: "pt").
+
+        Returns:
+            Modelo WhisperX pronto para transcrever.
+        """
+        return self._obter(nome_modelo, idioma)
+
+    def _obter(self, nome_modelo: str, idioma: str, reservar: bool = False):
+        """
+        Implementa `obter`. Com `reservar`, conta o uso (ver `em_uso`) no
+        mesmo trecho protegido em que o modelo é entregue.
+        """
+        config = (nome_modelo, idioma)
+        device = self.device
+        while True:
+            with self._lock:
+                # Outra thread carregando: espera e confere de novo
+                while self._carregando is not None:
+                    self._carga_concluida.wait()
+                if self.model is not None and self.config == config:
+                    if reservar:
+                        self._em_uso += 1
+                    self._agendar_descarga()
+                    return self.model
+                if self.model is not None:
+                    logger.info(f"Trocando o modelo {self.config} por {config}.")
+                    self.descarregar()
+
+                self._carregando = config
+                self._carga_descartada = False
+                self.estado = "carregando"
+                self.inicio_carga = self.inicio_carga or time.monotonic()
+                compute_type = self.compute_type
+                opcoes = {"threads": self.threads} if self.threads else {}
+
+            inicio = time.perf_counter()
+            try:
+                modelo = whisperx.load_model(
+                    nome_modelo,
+                    device=device,
+                    compute_type=compute_type,
+                    language=idioma,
+                    **opcoes,
+                )
+            except Exception:
+                with self._lock:
+                    self.estado = "erro"
+                    self.inicio_carga = None
+                    self._carregando = None
+                    self._carga_concluida.notify_all()
+                raise
+
+            with self._lock:
+                self._carregando = None
+                self._carga_concluida.notify_all()
+                if self._carga_descartada:
+                    # `configurar` mudou a inferência durante a carga: recarrega
+                    logger.info("Configuração alterada durante a carga; recarregando.")
+                    continue
+                self.model = modelo
+                self.config = config
+                self.estado = "carregado"
+                self.inicio_carga = None
+                logger.info(
+                    f"[INFO] Modelo WhisperX '{nome_modelo}' carregado com sucesso "
+                    f"em {time.perf_counter() - inicio:.1f}s."
+                )
+                if reservar:
+                    self._em_uso += 1
+                self._agendar_descarga()
+                return self.model
+
+    @contextmanager
+    def em_uso(self, nome_modelo: str, idioma: str):
+        """
+        Entrega o modelo e impede que ele seja descarregado enquanto estiver
+        em uso.
+        """
+        modelo = self._obter(nome_modelo, idioma, reservar=True)
+        try:
+            yield modelo
+        finally:
+            with self._lock:
+                self._em_uso -= 1
+                self._agendar_descarga()
+
+    def descarregar(self):
+        """Libera o modelo da memória (RAM e, se houver, GPU)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._carregando is not None:
+                self._carga_descartada = True
+            if self.model is None:
+                return
+            self.model = None
+            self.config = None
+            self.estado = "descarregado"
+            gc.collect()
+            if self.device == "cuda":
+                torch.cuda.empty_cache()
+            logger.info("Modelo WhisperX descarregado da memória.")
+
+    def _agendar_descarga(self):
+        self._ultimo_uso = time.monotonic()
+        if self.tempo_ocioso <= 0:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.tempo_ocioso, self._descarregar_se_ocioso)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _descarregar_se_ocioso(self):
+        with self._lock:
+            ocioso = time.monotonic() - self._ultimo_uso >= self.tempo_ocioso
+            if self._em_uso == 0 and not self._reservado and ocioso:
+                logger.info(
+                    f"Modelo WhisperX ocioso há {self.tempo_ocioso:.0f}s; descarregando."
+                )
+                self.descarregar()
+
+
+modelo_whisper = ModeloWhisper()
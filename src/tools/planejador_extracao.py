@@ -0,0 +1,51 @@
+from typing import Dict, List, Tuple
+
+
+# Grupos temáticos por ID de perguntas_estruturadas_llm.json. Cada grupo vira
+# uma requisição ao Ollama; perguntas fora dos grupos vão para "outros".
+GRUPOS_PERGUNTAS = {
+    "queixas": ["01", "02", "03", "04"],
+    "historico_familiar": ["05", "06", "07", "08"],
+    "alimentacao": ["09", "10", "11", "12", "13", "14", "15", "16"],
+    "sono_e_temperatura": ["17", "18", "19", "20", "21"],
+    "excrecoes": ["22", "23", "27", "69"],
+    "ginecologia_e_sexualidade": ["24", "25", "26", "28"],
+    "sistemas": ["29", "30", "31", "32", "38", "39"],
+    "emocional_e_habitos": ["33", "34", "35", "36", "37", "40"],
+    "inspecao": ["41", "42", "43", "44", "45", "46", "47", "48", "49"],
+    "orgaos_mtc": ["50", "51", "52", "53", "54", "55", "56", "57", "58"],
+    "palpacao_e_auscultacao": [
+        "59", "60", "61", "62", "63", "64", "65", "66", "67", "68",
+    ],
+}
+
+
+def planejar_grupos(
+    perguntas: Dict[str, dict], grupos: Dict[str, List[str]] = None
+) -> List[Tuple[str, Dict[str, dict]]]:
+    """
+    Divide as perguntas do LLM em grupos temáticos.
+
+    Args:
+        perguntas (dict): ID -> {"pergunta", "resposta"}, como no JSON de
+            perguntas.
+        grupos (dict, opcional): Nome do grupo -> IDs; GRUPOS_PERGUNTAS se None.
+
+    Returns:
+        list: (nome do grupo, perguntas do grupo), na ordem dos grupos, sem
+        grupos vazios. Cada pergunta aparece em um único grupo.
+    """
+    grupos = GRUPOS_PERGUNTAS if grupos is None else grupos
+    plano, usados = [], set()
+    for nome, ids in grupos.items():
+        selecionadas = {
+            i: perguntas[i] for i in ids if i in perguntas and i not in usados
+        }
+        if selecionadas:
+            plano.append((nome, selecionadas))
+            usados.update(selecionadas)
+
+    restantes = {i: dados for i, dados in perguntas.items() if i not in usados}
+    if restantes:
+        plano.append(("outros", restantes))
+    return plano
@@ -1,12 +1,13 @@
 import os
 import json
 import uuid
-import redis
 import logging
 from dotenv import load_dotenv
 from typing import Optional, cast
+from src.tools.importacao_tardia import ModuloTardio
 
 logger = logging.getLogger(__name__)
+redis = ModuloTardio("redis")
 
 
 class RedisConnection:
@@ -145,6 +146,133 @@ class RedisConnection:
             logger.error(f"Erro ao atualizar valor no Redis para chave {key}: {e}")
             return False
 
+    def get_texto(self, key: str) -> Optional[str]:
+        """
+        Recupera um texto gravado com `set_texto`.
+
+        Returns:
+            Optional[str]: O texto, ou None se a chave não existir ou houver
+            erro no Redis.
+        """
+        try:
+            self.connect()
+            if self.client:
+                return self.client.get(key)
+        except redis.RedisError as e:
+            logger.error("Erro ao recuperar a chave %s do Redis: %s", key, e)
+            return None
+
+    def set_texto(self, key: str, valor: str, ex: Optional[int] = None) -> bool:
+        """
+        Grava um texto numa chave escolhida, com expiração opcional (em segundos).
+
+        Returns:
+            bool: True se o valor foi gravado.
+        """
+        try:
+            self.connect()
+            if self.client:
+                return bool(self.client.set(key, valor, ex=ex))
+        except redis.RedisError as e:
+            logger.error("Erro ao gravar a chave %s no Redis: %s", key, e)
+            return False
+
+    def incrementar(self, key: str, campo: str, valor: int = 1) -> int:
+        """
+        Incrementa um contador guardado no hash `key`.
+
+        Returns:
+            int: O novo valor do contador (0 se houver erro).
+        """
+        try:
+            self.connect()
+            if self.client:
+                return cast(int, self.client.hincrby(key, campo, valor))
+        except redis.RedisError as e:
+            logger.error("Erro ao incrementar %s/%s no Redis: %s", key, campo, e)
+            return 0
+
+    def get_contadores(self, key: str) -> dict:
+        """Retorna os contadores do hash `key` (campo -> int)."""
+        try:
+            self.connect()
+            if self.client:
+                return {
+                    campo: int(valor)
+                    for campo, valor in self.client.hgetall(key).items()
+                }
+        except redis.RedisError as e:
+            logger.error("Erro ao ler os contadores %s do Redis: %s", key, e)
+        return {}
+
+    def expirar(self, key: str, segundos: int) -> bool:
+        """
+        Renova a expiração de uma chave existente.
+
+        Returns:
+            bool: True se a chave existe e a expiração foi definida.
+        """
+        try:
+            self.connect()
+            if self.client:
+                return bool(self.client.expire(key, segundos))
+        except redis.RedisError as e:
+            logger.error("Erro ao renovar a expiração da chave %s no Redis: %s", key, e)
+        return False
+
+    def registrar_em_indice(
+        self,
+        indice: str,
+        membro: str,
+        pontuacao: float,
+        limite: int,
+        pontuacao_minima: Optional[float] = None,
+    ) -> list:
+        """
+        Registra `membro` no sorted set `indice` e mantém só os `limite` de
+        maior pontuação (por exemplo, os usados mais recentemente).
+
+        Args:
+            pontuacao_minima (float, opcional): Membros com pontuação menor
+                saem do índice antes da contagem (por exemplo, os que já
+                expiraram), sem entrar na lista de removidos.
+
+        Returns:
+            list: Membros removidos por excederem o limite.
+        """
+        try:
+            self.connect()
+            if self.client:
+                if pontuacao_minima is not None:
+                    self.client.zremrangebyscore(indice, "-inf", f"({pontuacao_minima}")
+                self.client.zadd(indice, {membro: pontuacao})
+                excedentes = self.client.zcard(indice) - limite
+                if excedentes <= 0:
+                    return []
+                removidos = self.client.zrange(indice, 0, excedentes - 1)
+                self.client.zrem(indice, *removidos)
+                return removidos
+        except redis.RedisError as e:
+            logger.error("Erro ao atualizar o índice %s no Redis: %s", indice, e)
+        return []
+
+    def delete_keys(self, *keys: str) -> int:
+        """
+        Deleta várias chaves sem fechar a conexão (ao contrário de `delete_key`).
+
+        Returns:
+            int: O número de chaves deletadas.
+        """
+        if not keys:
+            return 0
+        try:
+            self.connect()
+            if self.client:
+                return cast(int, self.client.delete(*keys))
+        except redis.RedisError as e:
+            logger.error("Erro ao deletar chaves do Redis: %s", e)
+        return 0
+
     def __enter__(self):
         """Permite uso com 'with' statement."""
         self.connect()
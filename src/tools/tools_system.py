@@ -1,12 +1,13 @@
 import os
 import time
 import logging
-import requests
 import subprocess
 from pathlib import Path
 from dotenv import load_dotenv
+from src.tools.importacao_tardia import ModuloTardio
 
 logger = logging.getLogger(__name__)
+requests = ModuloTardio("requests")  # Só na verificação do Ollama
 
 
 class SetupSystem:
@@ -1,20 +1,35 @@
 import os
-import torch
+import json
+import time
+import queue
 import logging
-import whisperx
+import threading
+import contextlib
+import numpy as np
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 from tkinter import messagebox
 from src.gui.questionario import Questionario
 from src.tools.tools_system import SetupSystem
 from src.gui.loading_screen import LoadingScreen
 from src.tools.ia_preenche_forms import OllamaClient
+from src.tools import autotune, audio_transcricao
+from src.setup_audio.arquivador import ArquivadorSessao
+from src.setup_audio.formatos_audio import EXTENSOES_AUDIO
+from src.tools.transcricao_incremental import TranscritorIncremental
+from src.tools.modelo_whisper import modelo_whisper
+from src.tools.escalonador_transcricao import EscalonadorTranscricao
+from src.tools.cache_transcricao import CacheTranscricao
+from src.tools.metricas_transcricao import ProgressoTranscricao, registrar_metricas
+from src.tools.cancelamento import OperacaoCancelada, TokenCancelamento
+from src.tools.importacao_tardia import InstanciaTardia
 
 
 logger = logging.getLogger(__name__)
 
-setup = SetupSystem()
-llm_question = OllamaClient()
+setup = InstanciaTardia(SetupSystem)
+llm_question = InstanciaTardia(OllamaClient)
 
 
 class TranscricaoAudio:
@@ -31,11 +46,69 @@ class TranscricaoAudio:
         self.folder_audio = os.getenv("FOLDER_AUDIO", "src/audio")
         self.language = os.getenv("WHISPER_LANGUAGE", "pt")
         self.destino_folder = "src/transcricao"
-        self.model = None
+        self._lock_transcricao = threading.Lock()
         self.loading_screen = None
+        self.tempos_arquivo = {}  # Tempos da última transcrição por segmentos
         self.transcription_success = False  # Atributo para armazenar o resultado
+        self.cancelamento = TokenCancelamento()  # Acionado pelo botão Cancelar
+        self.usar_cache_llm = True  # False gera as respostas do LLM de novo
+        self.em_andamento = False  # Uma transcrição (com o questionário) rodando
+        self.ao_concluir = None
         self.questionario = str(os.getenv("MODELO_PERGUNTAS"))
 
+        # Transcreve as partes da sessão enquanto a gravação continua
+        incremental = os.getenv("TRANSCRICAO_INCREMENTAL", "false").lower()
+        if incremental in ("1", "true", "sim"):
+            self.incremental = TranscritorIncremental(self)
+        else:
+            self.incremental = None
+
+        # Perfil de inferência medido pelo autotune (python -m src.tools.autotune),
+        # aplicado só na CPU, quando o dispositivo for detectado
+        self.perfil = autotune.carregar_perfil(self.model_name)
+        if self.perfil:
+            modelo_whisper.configurar(self.perfil["compute_type"], self.perfil["threads"])
+
+        # Duração das janelas da transcrição segmento a segmento
+        self.janela_s = float(os.getenv("TRANSCRICAO_JANELA_S", "120"))
+
+        # Arquivos mais longos que isso são lidos do disco em blocos (0 desativa)
+        self.blocos_acima_s = float(os.getenv("TRANSCRICAO_BLOCOS_ACIMA_S", "1800"))
+        # Áudio lido além do corte sem silêncio (mínimo de um chunk de 30 s)
+        self.sobreposicao_s = float(os.getenv("TRANSCRICAO_SOBREPOSICAO_S", "30"))
+
+        # Cache de transcrições por conteúdo do áudio (vazio desativa)
+        pasta_cache = os.getenv("TRANSCRICAO_CACHE", "src/cache_transcricao")
+        if pasta_cache:
+            self.cache = CacheTranscricao(
+                pasta_cache, float(os.getenv("TRANSCRICAO_CACHE_MB", "200"))
+            )
+        else:
+            self.cache = None
+
+        # Processos usados quando há vários arquivos para transcrever
+        self.processos = int(os.getenv("TRANSCRICAO_PROCESSOS", "1"))
+
+        # Carrega o modelo enquanto a consulta é gravada
+        self.precarregar = os.getenv("WHISPER_PRECARREGAR", "true").lower() in (
+            "1",
+            "true",
+            "sim",
+        )
+
+        # Preenche o questionário à medida que o LLM responde
+        self.llm_streaming = os.getenv("LLM_STREAMING", "true").lower() in (
+            "1",
+            "true",
+            "sim",
+        )
+
+        # Compacta em FLAC as sessões já transcritas e apaga as partes
+        if os.getenv("ARQUIVAR_SESSOES", "false").lower() in ("1", "true", "sim"):
+            self.arquivador = ArquivadorSessao()
+        else:
+            self.arquivador = None
+
         os.makedirs(self.destino_folder, exist_ok=True)
 
         if not all([self.model_name, self.folder_audio]):
@@ -43,54 +116,93 @@ class TranscricaoAudio:
                 "⚠️ Variáveis de ambiente WHISPER_MODEL ou FOLDER_AUDIO não definidas."
             )
 
-    def carregar_modelo(self, key: str) -> bool:
-        """Inicia a transcrição com a Tela 2 (LoadingScreen) e
-        retorna True se bem-sucedida.
+    @property
+    def batch_size(self) -> int:
+        """Batch do perfil do autotune na CPU; 16 nos demais casos."""
+        if self.perfil and modelo_whisper.device == "cpu":
+            return self.perfil["batch_size"]
+        return 16
+
+    def precarregar_modelo(self):
+        """
+        Começa a carregar o modelo WhisperX em segundo plano, para que ele
+        já esteja pronto quando a gravação terminar.
+        """
+        if self.precarregar:
+            modelo_whisper.precarregar(self.model_name, self.language)
+
+    def encerrar(self):
+        """
+        Chamado ao fechar a aplicação: espera o arquivamento das sessões
+        em andamento, que roda numa thread daemon.
+        """
+        if self.arquivador is not None:
+            self.arquivador.aguardar()
+
+    def carregar_modelo(
+        self, key: str, usar_cache_llm: bool = True, ao_concluir=None
+    ) -> None:
+        """Inicia a transcrição com a Tela 2 (LoadingScreen), sem bloquear a
+        tela que chamou: a Tela 2 roda no mesmo loop de eventos do Tk.
+
+        Args:
+            key (str): Dados do paciente no Redis.
+            usar_cache_llm (bool): False ignora as respostas do LLM guardadas
+                no cache e as gera de novo (ver CacheLLM).
+            ao_concluir (callable, opcional): Recebe True se a transcrição deu
+                certo. Chamado da thread de transcrição quando ela termina,
+                depois de o questionário ser fechado.
         """
         self.key_redis = key
+        self.usar_cache_llm = usar_cache_llm
+        self.ao_concluir = ao_concluir
+        self.em_andamento = True
+        self.cancelamento = TokenCancelamento()
         self.loading_screen = LoadingScreen(transcritor=self)
         self.loading_screen.iniciar_transcricao()  # Inicia a transcrição na Tela 2
-        self.loading_screen.mainloop()  # Mostra a Tela 2 na frente da Tela 1
-        return self.transcription_success  # Retorna o resultado após o término
 
-    def transcrever_audio(self):
+    def concluir_execucao(self, sucesso: bool):
+        """Chamado pela Tela 2 quando a transcrição iniciada em carregar_modelo termina."""
+        self.em_andamento = False
+        if self.ao_concluir is not None:
+            self.ao_concluir(sucesso)
+
+    def transcrever_audio(self, cancelamento: Optional[TokenCancelamento] = None):
         """
         Transcreve os arquivos de áudio filtrados por '_completo' usando WhisperX,
         focando apenas na transcrição do texto.
+
+        Args:
+            cancelamento (TokenCancelamento, opcional): Interrompe a
+                transcrição e a consulta ao LLM; usa `self.cancelamento` se None.
         """
+        cancelamento = cancelamento or self.cancelamento
 
         def progress_callback(valor, mensagem):
             if self.loading_screen:
                 self.loading_screen.atualizar_progresso(valor, mensagem)
 
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        compute_type = "float16" if device == "cuda" else "int8"
+        def mostrar_progresso(mensagem):
+            progress_callback(progresso.percentual, mensagem)
+            if self.loading_screen:
+                self.loading_screen.atualizar_desempenho(progresso.rtf, progresso.eta)
 
+        paralelo = None
         try:
-            progress_callback(10, "Carregando modelo para transcrição...")
-            self.model = whisperx.load_model(
-                self.model_name,
-                device=device,
-                compute_type=compute_type,
-                language=self.language,
-            )
-            progress_callback(30, "Modelo WhisperX carregado.")
-            logger.info(
-                f"[INFO] Modelo WhisperX '{self.model_name}' carregado com sucesso."
-            )
-
             list_audio_files = [
                 f
                 for f in os.listdir(self.folder_audio)
-                if f.endswith(".wav") and "_completo" in f
+                if f.endswith(EXTENSOES_AUDIO)
+                and "_completo" in f
+                and not self._ja_transcrito(f)
             ]
 
             if not list_audio_files:
                 progress_callback(
-                    0, "Erro: Nenhum arquivo .wav com '_completo' encontrado."
+                    0, "Erro: Nenhum arquivo de áudio com '_completo' a transcrever."
                 )
                 logger.info(
-                    "Nenhum arquivo .wav com '_completo' encontrado para processar."
+                    "Nenhum arquivo de áudio com '_completo' pendente de transcrição."
                 )
                 self.transcription_success = False
                 return
@@ -100,44 +212,443 @@ class TranscricaoAudio:
                 f"Encontrados {total_files} arquivo(s) com '_completo' para processar."
             )
 
+            # Progresso pelos segundos de áudio, não pelo número de arquivos
+            progresso = ProgressoTranscricao(
+                {
+                    f: audio_transcricao.duracao_audio(
+                        os.path.join(self.folder_audio, f)
+                    )
+                    for f in list_audio_files
+                }
+            )
+
+            # Sessões já transcritas durante a gravação
+            resultados, origens = {}, {}
+            if self.incremental is not None:
+                mostrar_progresso("Finalizando transcrição incremental...")
+                for audio_filename in list_audio_files:
+                    result = self.incremental.resultado(audio_filename)
+                    if result is not None:
+                        resultados[audio_filename] = result
+                        origens[audio_filename] = "incremental"
+
+            # Mesmo áudio já transcrito com as mesmas opções
+            chaves = {}
+            if self.cache is not None:
+                opcoes = self._opcoes_cache()
+                for audio_filename in list_audio_files:
+                    caminho = os.path.join(self.folder_audio, audio_filename)
+                    chaves[audio_filename] = self.cache.gerar_chave(caminho, opcoes)
+                    if audio_filename in resultados:
+                        continue
+                    result = self.cache.obter(chaves[audio_filename])
+                    if result is not None:
+                        resultados[audio_filename] = result
+                        origens[audio_filename] = "cache"
+
+            # Vários arquivos pendentes: transcreve em paralelo na CPU
+            pendentes = [
+                os.path.join(self.folder_audio, f)
+                for f in list_audio_files
+                if f not in resultados
+            ]
+            if (
+                self.processos > 1
+                and len(pendentes) > 1
+                and modelo_whisper.device == "cpu"
+            ):
+                escalonador = EscalonadorTranscricao(
+                    self.model_name,
+                    self.language,
+                    processos=self.processos,
+                    compute_type=modelo_whisper.compute_type,
+                    batch_size=self.batch_size,
+                )
+                mostrar_progresso(
+                    f"Transcrevendo {len(pendentes)} arquivos em "
+                    f"{escalonador.processos} processos..."
+                )
+                paralelo = escalonador.transcrever(pendentes, cancelamento)
+
             for i, audio_filename in enumerate(list_audio_files):
+                cancelamento.verificar()
                 current_file_path = os.path.join(self.folder_audio, audio_filename)
                 progress_prefix = f"[{i + 1}/{total_files}]"
                 logger.info(f"\n{progress_prefix} Processando: {audio_filename}")
+                metricas = {
+                    "arquivo": audio_filename,
+                    "duracao_audio": round(progresso.duracoes[audio_filename], 2),
+                    "modelo": self.model_name,
+                }
 
-                progress_callback(
-                    40 + int(i * (60 / total_files * 0.1)),
-                    f"{progress_prefix} Carregando áudio...",
-                )
-                audio = whisperx.load_audio(current_file_path)
+                result = resultados.pop(audio_filename, None)
+                origem = origens.get(audio_filename)
+                if result is None and paralelo is not None:
+                    # Resultados chegam na ordem de `pendentes`
+                    origem = "paralelo"
+                    progresso.iniciar_arquivo()
+                    mostrar_progresso(f"{progress_prefix} Transcrevendo em paralelo...")
+                    _, result, metricas_worker = next(paralelo)
+                    metricas["tempo_worker"] = round(metricas_worker["tempo"], 3)
 
-                progress_callback(
-                    40 + int(i * (60 / total_files * 0.2)),
-                    f"{progress_prefix} Transcrevendo áudio...",
-                )
-                result = self.model.transcribe(
-                    audio,
-                    batch_size=16,
+                if result is None:
+                    origem = "sequencial"
+                    if not modelo_whisper.carregado:
+                        inicio = time.perf_counter()
+                        if modelo_whisper.estado == "carregando":
+                            # Pré-carregamento iniciado junto com a gravação
+                            mostrar_progresso("Aguardando o pré-carregamento do modelo...")
+                            modelo_whisper.aguardar_precarga()
+                        else:
+                            mostrar_progresso("Carregando modelo para transcrição...")
+                        self._obter_modelo()
+                        metricas["carga_modelo"] = round(time.perf_counter() - inicio, 3)
+                        mostrar_progresso("Modelo WhisperX carregado.")
+
+                    def avancar(fracao):
+                        progresso.avancar(audio_filename, fracao)
+                        mostrar_progresso(f"{progress_prefix} Transcrevendo áudio...")
+
+                    mostrar_progresso(f"{progress_prefix} Carregando áudio...")
+                    progresso.iniciar_arquivo()
+                    # Segmentos saem (e vão para o disco) janela a janela
+                    segmentos = []
+                    for segment in self.transcrever_segmentos(
+                        current_file_path,
+                        ao_progredir=avancar,
+                        cancelamento=cancelamento,
+                    ):
+                        segmentos.append(segment)
+                        if self.loading_screen:
+                            self.loading_screen.mostrar_parcial(segment["text"])
+                    result = {"segments": segmentos}
+                    metricas.update(
+                        {k: round(v, 3) for k, v in self.tempos_arquivo.items()}
+                    )
+
+                progresso.concluir_arquivo(
+                    audio_filename, transcrito=origem in ("sequencial", "paralelo")
                 )
+                metricas["origem"] = origem
+                if progresso.rtf is not None:
+                    metricas["rtf_acumulado"] = round(progresso.rtf, 4)
+
+                if self.cache is not None and origem != "cache":
+                    self.cache.salvar(chaves[audio_filename], result, audio_filename)
 
                 logger.debug(f"Chaves disponíveis no resultado: {list(result.keys())}")
-                self._salvar_transcricao_pura(result, audio_filename)
+                inicio = time.perf_counter()
+                caminho_txt = self._escrever_transcricao(result, audio_filename)
+                metricas["salvar"] = round(time.perf_counter() - inicio, 3)
+                mostrar_progresso(f"{progress_prefix} Transcrição salva.")
+
+                # As métricas são registradas quando a extração pelo LLM termina
+                self._preencher_questionario(
+                    caminho_txt, cancelamento, metricas, self.usar_cache_llm
+                )
+
+                if self.arquivador is not None:
+                    self.arquivador.arquivar(current_file_path)
 
             progress_callback(100, "Todos os arquivos de áudio completos processados!")
             self.transcription_success = True
             return
 
+        except OperacaoCancelada:
+            # O modelo volta ao ModeloWhisper (em_uso) e segue carregado
+            progress_callback(0, "Transcrição cancelada pelo usuário.")
+            logger.info("Transcrição cancelada pelo usuário.")
+            self.transcription_success = False
+            return
+
         except Exception as e:
             progress_callback(0, f"Erro fatal durante a transcrição: {str(e)}")
             logger.error(f"Erro fatal: {e}")
             self.transcription_success = False
             return
 
+        finally:
+            if paralelo is not None:
+                # Encerra o pool e registra o RTF agregado
+                paralelo.close()
+            # A sessão pré-carregada foi transcrita: volta o tempo ocioso
+            modelo_whisper.liberar_reserva()
+
+    def transcrever_segmentos(
+        self,
+        caminho_audio: str,
+        salvar: bool = True,
+        ao_progredir=None,
+        cancelamento: Optional[TokenCancelamento] = None,
+    ):
+        """
+        Transcreve um arquivo em janelas (cortadas em pontos de pouca
+        energia) e devolve cada segmento assim que a sua janela termina.
+
+        Arquivos mais longos que `blocos_acima_s` são lidos do disco janela
+        a janela (ver audio_transcricao.janelas_do_arquivo), com memória
+        limitada ao tamanho da janela. Cada segmento pertence à janela em
+        que começa, e a janela seguinte continua no fim do último segmento
+        mantido: nada é perdido nem repetido nas sobreposições.
+
+        Args:
+            caminho_audio (str): Arquivo de áudio.
+            salvar (bool): Acrescenta cada segmento, à medida que chega, ao
+                '_transcrito_bruto.txt' e ao '_segmentos.jsonl'.
+            ao_progredir (callable, opcional): Recebe a fração do arquivo
+                já transcrita (0 a 1) ao fim de cada janela.
+            cancelamento (TokenCancelamento, opcional): Verificado antes de
+                cada janela e de cada lote do modelo.
+
+        Os tempos de leitura e de transcrição ficam em `self.tempos_arquivo`.
+
+        Yields:
+            dict: {"text", "start", "end"}, com tempos em segundos no áudio
+            original.
+
+        Raises:
+            OperacaoCancelada: Se o cancelamento for solicitado.
+        """
+        self.tempos_arquivo = {"decodificacao": 0.0, "transcricao": 0.0}
+        inicio = time.perf_counter()
+        duracao = audio_transcricao.duracao_audio(caminho_audio)
+        if self.blocos_acima_s and duracao and duracao > self.blocos_acima_s:
+            logger.info(
+                f"{os.path.basename(caminho_audio)} tem {duracao / 60:.0f} min; "
+                "transcrevendo em blocos lidos do disco."
+            )
+            janelas = audio_transcricao.janelas_do_arquivo(
+                caminho_audio, self.janela_s, self.sobreposicao_s
+            )
+            mapa_fala = []
+            total = duracao
+        else:
+            janelas, mapa_fala = self._janelas_em_memoria(caminho_audio)
+            total = sum(len(j[0]) for j in janelas) / audio_transcricao.TAXA_WHISPER
+        self.tempos_arquivo["decodificacao"] += time.perf_counter() - inicio
+
+        txt = jsonl = None
+        if salvar:
+            caminho_txt, caminho_jsonl = self._caminhos_saida(caminho_audio)
+            txt = open(caminho_txt, "w", encoding="utf-8")
+            jsonl = open(caminho_jsonl, "w", encoding="utf-8")
+        try:
+            separador = ""
+            fim_coberto = None  # Fim do último segmento mantido
+            janelas = iter(janelas)
+            while True:
+                inicio = time.perf_counter()
+                try:
+                    if hasattr(janelas, "send"):
+                        janela = janelas.send(fim_coberto)
+                    else:
+                        janela = next(janelas)
+                except StopIteration:
+                    janela = None
+                self.tempos_arquivo["decodificacao"] += time.perf_counter() - inicio
+                if janela is None:
+                    break
+                audio, deslocamento, corte_inicial, corte_final = janela
+                if cancelamento is not None:
+                    cancelamento.verificar()
+
+                inicio = time.perf_counter()
+                result = self._transcrever(audio, cancelamento)
+                self.tempos_arquivo["transcricao"] += time.perf_counter() - inicio
+                if ao_progredir is not None and total:
+                    fim = deslocamento + len(audio) / audio_transcricao.TAXA_WHISPER
+                    ao_progredir(fim / total)
+                for segment in result.get("segments", []):
+                    segment["start"] = segment.get("start", 0.0) + deslocamento
+                    segment["end"] = segment.get("end", 0.0) + deslocamento
+                if mapa_fala:
+                    self._restaurar_tempos(result, mapa_fala)
+
+                for segment in result.get("segments", []):
+                    # Sobreposição: cada segmento pertence à janela em que começa
+                    if not corte_inicial <= segment["start"] < corte_final:
+                        continue
+                    segmento = {
+                        "text": segment.get("text", "").strip(),
+                        "start": round(float(segment["start"]), 3),
+                        "end": round(float(segment["end"]), 3),
+                    }
+                    fim_coberto = float(segment["end"])
+
+                    if salvar:
+                        txt.write(separador + segmento["text"])
+                        txt.flush()
+                        jsonl.write(json.dumps(segmento, ensure_ascii=False) + "\n")
+                        jsonl.flush()
+                        separador = " "
+                    yield segmento
+        finally:
+            if salvar:
+                txt.close()
+                jsonl.close()
+
+    def _janelas_em_memoria(self, caminho_audio: str):
+        """
+        Carrega o arquivo inteiro, recorta a fala e o divide em janelas.
+
+        Returns:
+            tuple: (lista de janelas no formato de
+            audio_transcricao.janelas_do_arquivo, mapa de tempos da fala).
+        """
+        audio = self._carregar_audio(caminho_audio)
+        audio, mapa_fala = self._recortar_fala(audio, caminho_audio)
+        taxa = audio_transcricao.TAXA_WHISPER
+        cortes = audio_transcricao.pontos_de_corte(audio, self.janela_s)
+        logger.info(
+            f"Transcrevendo {os.path.basename(caminho_audio)} "
+            f"em {len(cortes)} janela(s)."
+        )
+        janelas = [
+            (audio[inicio:fim], inicio / taxa, float("-inf"), float("inf"))
+            for inicio, fim in cortes
+        ]
+        return janelas, mapa_fala
+
+    def _caminhos_saida(self, nome_arquivo: str):
+        """Caminhos do '_transcrito_bruto.txt' e do '_segmentos.jsonl'."""
+        os.makedirs(self.destino_folder, exist_ok=True)
+        base = os.path.join(
+            self.destino_folder, os.path.splitext(os.path.basename(nome_arquivo))[0]
+        )
+        return base + "_transcrito_bruto.txt", base + "_segmentos.jsonl"
+
+    def _salvar_segmentos(self, result: dict, nome_arquivo: str):
+        """
+        Grava o '_segmentos.jsonl' definitivo: um segmento por linha e, no
+        fim, a linha {"fim": true} que marca a transcrição como concluída.
+        """
+        _, caminho_jsonl = self._caminhos_saida(nome_arquivo)
+        segmentos = result.get("segments", [])
+        with open(caminho_jsonl, "w", encoding="utf-8") as f:
+            for segment in segmentos:
+                segmento = {
+                    "text": segment.get("text", "").strip(),
+                    "start": round(float(segment.get("start", 0.0)), 3),
+                    "end": round(float(segment.get("end", 0.0)), 3),
+                }
+                f.write(json.dumps(segmento, ensure_ascii=False) + "\n")
+            f.write(json.dumps({"fim": True, "segmentos": len(segmentos)}) + "\n")
+
+    def _obter_modelo(self):
+        """
+        Retorna o modelo WhisperX mantido carregado entre as sessões
+        (ver src/tools/modelo_whisper.py).
+        """
+        return modelo_whisper.obter(self.model_name, self.language)
+
+    def _transcrever(
+        self, audio: np.ndarray, cancelamento: Optional[TokenCancelamento] = None
+    ) -> dict:
+        """Transcreve um array de áudio, uma chamada ao modelo por vez."""
+        with modelo_whisper.em_uso(self.model_name, self.language) as modelo:
+            with self._lock_transcricao, self._verificar_por_lote(
+                modelo, cancelamento
+            ):
+                return modelo.transcribe(
+                    audio,
+                    batch_size=self.batch_size,
+                )
+
+    @contextlib.contextmanager
+    def _verificar_por_lote(self, modelo, cancelamento):
+        """
+        Verifica o cancelamento antes de cada lote enviado ao CTranslate2,
+        que não pode ser interrompido no meio. Assim o cancelamento espera no
+        máximo um lote (`batch_size` trechos de até 30 s), e não a janela
+        inteira.
+        """
+        interno = getattr(modelo, "model", None)
+        if cancelamento is None or not hasattr(interno, "generate_segment_batched"):
+            yield
+            return
+
+        gerar = interno.generate_segment_batched
+
+        def gerar_verificando(*args, **kwargs):
+            cancelamento.verificar()
+            return gerar(*args, **kwargs)
+
+        interno.generate_segment_batched = gerar_verificando
+        try:
+            yield
+        finally:
+            # Volta ao método da classe; o modelo segue carregado para a próxima sessão
+            del interno.generate_segment_batched
+
+    def _opcoes_cache(self) -> dict:
+        """Opções que entram na chave do cache de transcrições."""
+        return {
+            "modelo": self.model_name,
+            "idioma": self.language,
+            "compute_type": modelo_whisper.compute_type,
+            "batch_size": self.batch_size,
+        }
+
+    def _ja_transcrito(self, nome_arquivo: str) -> bool:
+        """
+        Indica se o arquivo já tem '_transcrito_bruto.txt' de outra sessão.
+        Uma transcrição interrompida no meio (sem a linha de fim no
+        '_segmentos.jsonl') não conta, nem uma cujo questionário ainda não
+        foi preenchido pelo LLM (ver _marcador_questionario): o arquivo é
+        processado de novo, com a transcrição vinda do cache.
+        """
+        caminho_txt, caminho_jsonl = self._caminhos_saida(nome_arquivo)
+        if not os.path.exists(caminho_txt):
+            return False
+        if os.path.exists(self._marcador_questionario(caminho_txt)):
+            return False
+        if not os.path.exists(caminho_jsonl):
+            return True
+        with open(caminho_jsonl, "rb") as f:
+            linhas = f.read().splitlines()
+        return bool(linhas) and b'"fim"' in linhas[-1]
+
+    def _marcador_questionario(self, caminho_txt: str) -> str:
+        """
+        Arquivo criado ao lado da transcrição quando ela vai para o LLM e
+        apagado quando o questionário é preenchido. Se a extração falhar ou
+        for cancelada, ele fica, e a sessão é processada de novo.
+        """
+        base = os.path.splitext(caminho_txt)[0]
+        if base.endswith("_transcrito_bruto"):
+            base = base[: -len("_transcrito_bruto")]
+        return base + "_questionario_pendente"
+
+    def _questionario_preenchido(self, caminho_txt: str):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._marcador_questionario(caminho_txt))
+
+    def _carregar_audio(self, caminho: str) -> np.ndarray:
+        """Ver audio_transcricao.carregar_audio."""
+        return audio_transcricao.carregar_audio(caminho)
+
+    def _carregar_trecho(
+        self, caminho: str, frame_inicial: int = 0, frames: Optional[int] = None
+    ) -> np.ndarray:
+        """Ver audio_transcricao.carregar_trecho."""
+        return audio_transcricao.carregar_trecho(caminho, frame_inicial, frames)
+
+    def _recortar_fala(self, audio: np.ndarray, caminho: str):
+        """Ver audio_transcricao.recortar_fala."""
+        return audio_transcricao.recortar_fala(audio, caminho)
+
+    def _restaurar_tempos(self, result: dict, mapa: list):
+        """Ver audio_transcricao.restaurar_tempos."""
+        audio_transcricao.restaurar_tempos(result, mapa)
+
     def _salvar_transcricao_pura(self, result, nome_arquivo_original):
+        """Salva o resultado da transcrição pura e preenche o questionário."""
+        caminho_txt = self._escrever_transcricao(result, nome_arquivo_original)
+        return self._preencher_questionario(caminho_txt)
+
+    def _escrever_transcricao(self, result, nome_arquivo_original):
         """Salva o resultado da transcrição pura em um arquivo de texto."""
-        os.makedirs(self.destino_folder, exist_ok=True)
-        nome_txt = os.path.splitext(nome_arquivo_original)[0] + "_transcrito_bruto.txt"
-        caminho_txt = os.path.join(self.destino_folder, nome_txt)
+        caminho_txt, _ = self._caminhos_saida(nome_arquivo_original)
 
         with open(caminho_txt, "w", encoding="utf-8") as f:
             if "segments" in result and result["segments"]:
@@ -157,21 +668,131 @@ class TranscricaoAudio:
                 f.write("❌ Erro: Resultado não contém 'segments' ou está vazio.")
                 logger.debug(f"Chaves do resultado: {list(result.keys())}")
 
+        self._salvar_segmentos(result, nome_arquivo_original)
         logger.info(f"Transcrição salva em: {caminho_txt}")
+        return caminho_txt
+
+    def _preencher_em_streaming(
+        self, caminho_txt, cancelamento, metricas=None, usar_cache=True
+    ):
+        """
+        Abre o questionário já e o preenche enquanto o LLM responde: a
+        extração roda numa thread e manda cada resposta para a tela. A
+        própria thread registra as métricas quando termina.
+
+        Cada extração tem o seu token, também acionado por `cancelamento`:
+        o questionário cancela só a extração (botão Cancelar ou ao fechar)
+        e pode tentar de novo depois de uma falha. O retorno espera a
+        extração terminar, para a próxima não começar por cima desta.
+        """
+        inicio = time.perf_counter()
+        key_redis_llm = llm_question.preparar_questionario(self.key_redis)
+        extracoes = []
+
+        def iniciar(metricas=None):
+            respostas = queue.Queue()
+            token = TokenCancelamento()
+            cancelamento.ao_cancelar(token.cancelar)
+
+            def extrair():
+                fim = None  # Sucesso; a exceção, se a extração falhar
+                try:
+                    llm_question.extrair_em_streaming(
+                        key_redis_llm,
+                        Path(caminho_txt),
+                        Path(self.questionario),
+                        ao_responder=lambda chave_id, r: respostas.put((chave_id, r)),
+                        cancelamento=token,
+                        usar_cache=usar_cache,
+                    )
+                    self._questionario_preenchido(caminho_txt)
+                except OperacaoCancelada as e:
+                    logger.info("Extração do questionário cancelada.")
+                    fim = e
+                except Exception as e:
+                    logger.error(f"Erro na extração em streaming: {e}")
+                    fim = e
+                finally:
+                    cancelamento.remover(token.cancelar)
+                    self._registrar_metricas_llm(metricas, inicio)
+                    respostas.put(fim)
+
+            thread = threading.Thread(target=extrair, daemon=True)
+            extracoes.append(thread)
+            thread.start()
+            return respostas, token
+
+        respostas, token = iniciar(metricas)
+        questao = Questionario(
+            key_redis_llm,
+            self.loading_screen,
+            respostas,
+            cancelamento=token,
+            reextrair=iniciar,
+        )
+        questao.gera_tela_questionario()
+        for thread in extracoes:
+            thread.join()
+
+    def _registrar_metricas_llm(self, metricas: Optional[dict], inicio: float):
+        """
+        Completa as métricas do arquivo com os tempos da extração pelo LLM
+        (sem o tempo em que o questionário fica aberto) e as registra.
+        """
+        if metricas is None:
+            return
+        metricas["questionario"] = round(time.perf_counter() - inicio, 3)
+        metricas["llm"] = dict(llm_question.metricas)
+        metricas["cache_llm"] = llm_question.cache.estatisticas()
+        registrar_metricas(metricas)
+
+    def _preencher_questionario(
+        self,
+        caminho_txt,
+        cancelamento: Optional[TokenCancelamento] = None,
+        metricas: Optional[dict] = None,
+        usar_cache: bool = True,
+    ):
+        """
+        Envia a transcrição ao LLM e abre o questionário preenchido.
+
+        Args:
+            caminho_txt (str): Transcrição salva.
+            cancelamento (TokenCancelamento, opcional): Aborta a requisição.
+            metricas (dict, opcional): Métricas do arquivo, registradas
+                quando a extração termina (ver _registrar_metricas_llm).
+            usar_cache (bool): False gera as respostas de novo em vez de
+                usar as guardadas no cache do LLM.
+        """
         if setup.verificar_arquivo_existe(caminho_txt):
 
             logger.info(f"Arquivo {caminho_txt} verificado e existente.")
+            open(self._marcador_questionario(caminho_txt), "w").close()
 
-            key_redis_llm = llm_question.inicio_llm(
-                self.key_redis,
-                Path(caminho_txt),
-                Path(self.questionario),
-            )
+            if self.llm_streaming:
+                return self._preencher_em_streaming(
+                    caminho_txt, cancelamento, metricas, usar_cache
+                )
+
+            inicio = time.perf_counter()
+            try:
+                key_redis_llm = llm_question.inicio_llm(
+                    self.key_redis,
+                    Path(caminho_txt),
+                    Path(self.questionario),
+                    cancelamento=cancelamento,
+                    usar_cache=usar_cache,
+                )
+                self._questionario_preenchido(caminho_txt)
+            finally:
+                self._registrar_metricas_llm(metricas, inicio)
 
             questao = Questionario(key_redis_llm, self.loading_screen)
             questao.gera_tela_questionario()
 
         else:
+            if metricas is not None:
+                registrar_metricas(metricas)
             logger.error(f"Arquivo {caminho_txt} não encontrado após a gravação.")
             messagebox.showerror(
                 "Erro", "Falha ao salvar a transcrição. O arquivo não foi encontrado."
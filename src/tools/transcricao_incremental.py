@@ -0,0 +1,139 @@
+import os
+import queue
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_FIM_SESSAO = "fim_sessao"
+TAXA_WHISPER = 16000  # Taxa do áudio devolvido por _carregar_trecho
+
+
+class TranscritorIncremental:
+    """
+    Transcreve, em segundo plano, cada parte (ou trecho, no modo streaming)
+    assim que ela termina de ser gravada.
+
+    O GravadorAudio chama `enfileirar` a cada parte salva e
+    `finalizar_sessao` ao parar. Quando o TranscricaoAudio for processar o
+    `_completo.wav`, basta juntar os segmentos que já estão prontos.
+    """
+
+    def __init__(self, transcritor):
+        self.transcritor = transcritor
+        self.fila = queue.Queue()
+        self._thread = None
+        self._condicao = threading.Condition()
+        self._resultados = {}  # nome do _completo -> resultado (ou None se falhou)
+        self._pendentes = set()  # sessões finalizadas ainda na fila
+        self._renomeados = {}  # arquivo de origem -> _completo
+        self._segmentos = []
+        self._deslocamento = 0.0  # Início do próximo trecho na sessão (s)
+        self._falhou = False
+
+    def enfileirar(self, caminho: str, frame_inicial: int = 0, frames=None):
+        """
+        Agenda a transcrição de uma parte ou trecho já gravado em disco.
+
+        Args:
+            caminho (str): Arquivo WAV da parte (ou do streaming).
+            frame_inicial (int): Primeiro frame do trecho no arquivo.
+            frames (int, opcional): Número de frames; o arquivo todo se None.
+        """
+        self._iniciar_thread()
+        self.fila.put((caminho, frame_inicial, frames))
+        logger.info(f"Trecho agendado para transcrição: {os.path.basename(caminho)}")
+
+    def finalizar_sessao(self, caminho_completo: str, arquivos_origem: list):
+        """
+        Marca o fim da sessão. Os segmentos transcritos até aqui passam a
+        ser o resultado de `caminho_completo`.
+
+        Args:
+            caminho_completo (str): Arquivo '_completo.wav' gerado.
+            arquivos_origem (list): Partes que deram origem a ele (uma parte
+                pode ter sido renomeada para o '_completo.wav').
+        """
+        nome = os.path.basename(caminho_completo)
+        with self._condicao:
+            self._pendentes.add(nome)
+            for arquivo in arquivos_origem:
+                self._renomeados[arquivo] = caminho_completo
+            self._condicao.notify_all()
+        self._iniciar_thread()
+        self.fila.put((_FIM_SESSAO, nome, None))
+
+    def resultado(self, nome_arquivo: str, timeout: Optional[float] = None):
+        """
+        Aguarda e retorna o resultado da sessão gravada em `nome_arquivo`.
+
+        Returns:
+            dict | None: Resultado no formato do WhisperX ({"segments": [...]}),
+            ou None se o arquivo não passou pela transcrição incremental ou
+            se ela falhou (nesse caso o arquivo deve ser transcrito inteiro).
+        """
+        with self._condicao:
+            if nome_arquivo not in self._pendentes | set(self._resultados):
+                return None
+            self._condicao.wait_for(
+                lambda: nome_arquivo in self._resultados, timeout=timeout
+            )
+            return self._resultados.pop(nome_arquivo, None)
+
+    def _iniciar_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._executar, daemon=True)
+            self._thread.start()
+
+    def _executar(self):
+        while True:
+            caminho, frame_inicial, frames = self.fila.get()
+            if caminho == _FIM_SESSAO:
+                self._concluir_sessao(frame_inicial)
+                continue
+            if self._falhou:
+                continue
+            try:
+                self._transcrever_trecho(caminho, frame_inicial, frames)
+            except Exception as e:
+                logger.error(f"Erro na transcrição incremental de {caminho}: {e}")
+                self._falhou = True
+
+    def _transcrever_trecho(self, caminho, frame_inicial, frames):
+        try:
+            audio = self.transcritor._carregar_trecho(caminho, frame_inicial, frames)
+        except FileNotFoundError:
+            # A parte pode ter sido renomeada para o _completo.wav
+            with self._condicao:
+                self._condicao.wait_for(
+                    lambda: caminho in self._renomeados, timeout=10
+                )
+                novo = self._renomeados.get(caminho)
+            if novo is None:
+                raise
+            audio = self.transcritor._carregar_trecho(novo, frame_inicial, frames)
+
+        result = self.transcritor._transcrever(audio)
+        for segment in result.get("segments", []):
+            segment["start"] = segment.get("start", 0.0) + self._deslocamento
+            segment["end"] = segment.get("end", 0.0) + self._deslocamento
+            self._segmentos.append(segment)
+
+        duracao = len(audio) / TAXA_WHISPER
+        logger.info(
+            f"Trecho de {duracao:.1f}s transcrito ({os.path.basename(caminho)}, "
+            f"início {self._deslocamento:.1f}s)."
+        )
+        self._deslocamento += duracao
+
+    def _concluir_sessao(self, nome):
+        resultado = None if self._falhou else {"segments": self._segmentos}
+        with self._condicao:
+            self._pendentes.discard(nome)
+            self._resultados[nome] = resultado
+            self._renomeados.clear()
+            self._condicao.notify_all()
+        self._segmentos = []
+        self._deslocamento = 0.0
+        self._falhou = False
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Teste do buffer de captura pré-alocado (BufferAudio)
+"""
+
+import sys
+import numpy as np
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.setup_audio.buffer_audio import BufferAudio
+
+
+def teste_buffer_audio():
+    """Testa escrita por blocos, visões sem cópia e reaproveitamento da arena"""
+
+    print("🧪 TESTE DO BUFFER DE CAPTURA")
+    print("=" * 50)
+
+    buffer = BufferAudio(taxa_amostragem=1000, canais=1, segundos_por_bloco=1)
+    sinal = np.arange(3500, dtype=np.int16).reshape(-1, 1)
+
+    # Teste 1: escrever blocos que atravessam a fronteira da arena
+    print("\n1. Escrevendo 3500 frames em blocos de 300...")
+    for i in range(0, len(sinal), 300):
+        buffer.escrever(sinal[i:i + 300])
+    print(f"Stats: {buffer.get_stats()}")
+    assert len(buffer) == 3500
+
+    # Teste 2: as visões devem reconstruir o sinal original
+    print("\n2. Conferindo visões do buffer...")
+    visoes = buffer.visoes()
+    assert np.array_equal(np.concatenate(visoes), sinal)
+    assert all(
+        any(np.shares_memory(v, b) for b in buffer._blocos) for v in visoes
+    ), "Visões não devem copiar dados"
+    print(f"Visões: {[len(v) for v in visoes]}")
+
+    # Teste 3: limpar mantém os blocos alocados
+    print("\n3. Limpando e reaproveitando a arena...")
+    blocos = buffer.get_stats()["blocos_alocados"]
+    buffer.limpar()
+    buffer.escrever(sinal[:10])
+    assert buffer.get_stats()["blocos_alocados"] == blocos
+    print(f"Stats: {buffer.get_stats()}")
+
+    print("\n✅ Teste do buffer concluído!")
+
+
+if __name__ == "__main__":
+    teste_buffer_audio()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Teste do cache de respostas do LLM: acertos, faltas, expiração, limite de
+tamanho e bypass, com o Redis real e um modelo falso no lugar do Ollama.
+Sem o Redis rodando, só a chave é testada.
+"""
+
+import sys
+import time
+import redis
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.tools.cache_llm import CacheLLM
+from src.tools.redis_connection import RedisConnection
+from src.tools.ia_preenche_forms import OllamaClient
+
+PREFIXO = "teste:llm:cache"
+
+
+class ModeloFalso:
+    """Responde devagar, como o Ollama, e conta as chamadas"""
+
+    def __init__(self):
+        self.chamadas = 0
+
+    def chat(self, model, messages, stream, **opcoes):
+        self.chamadas += 1
+        return self._gerar(messages)
+
+    def _gerar(self, messages):
+        time.sleep(0.5)
+        resposta = f"Relatório para: {messages[-1]['content']}"
+        yield {"message": {"content": resposta}}
+
+
+def limpar(conexao: RedisConnection, cache: CacheLLM):
+    """Remove as chaves criadas pelo teste"""
+    membros = conexao.connect().zrange(cache.indice, 0, -1)
+    conexao.delete_keys(cache.indice, cache.contadores, *membros)
+
+
+def teste_cache_llm():
+    """Testa o cache de respostas do LLM"""
+
+    print("🧪 TESTE DO CACHE DE RESPOSTAS DO LLM")
+    print("=" * 50)
+
+    conexao = RedisConnection()
+    cliente = OllamaClient()
+    cliente.client = ModeloFalso()
+    cliente.cache = CacheLLM(conexao, prefixo=PREFIXO, ttl=60, limite=2)
+    prompt = cliente._monta_prompt("questionário validado")
+
+    # Teste 1: chave muda com modelo e opções (não usa o Redis)
+    print("\n1. Conferindo a chave...")
+    chave = cliente.cache.chave("modelo", {"temperature": 0}, prompt)
+    assert chave == cliente.cache.chave("modelo", {"temperature": 0}, prompt)
+    assert chave != cliente.cache.chave("outro", {"temperature": 0}, prompt)
+    assert chave != cliente.cache.chave("modelo", {"temperature": 1}, prompt)
+    print("✅ Chave depende de modelo, opções e mensagens")
+
+    try:
+        conexao.connect()
+    except redis.RedisError as e:
+        print(f"\n⚠️ Redis indisponível ({e}): testes do cache pulados")
+        return
+    limpar(conexao, cliente.cache)
+
+    try:
+        # Teste 2: a mesma requisição só vai ao modelo uma vez
+        print("\n2. Repetindo a mesma requisição...")
+        inicio = time.perf_counter()
+        primeira = cliente._ollama_talk(prompt)
+        tempo_modelo = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        segunda = cliente._ollama_talk(prompt)
+        tempo_cache = time.perf_counter() - inicio
+        print(f"Modelo: {tempo_modelo * 1000:.1f} ms | Cache: {tempo_cache * 1000:.1f} ms")
+        assert primeira == segunda
+        assert cliente.client.chamadas == 1, "A repetição chamou o modelo"
+        assert tempo_cache < 0.05, "Acerto no cache lento demais"
+
+        # Teste 3: bypass força uma resposta nova
+        print("\n3. Forçando uma nova resposta...")
+        cliente._ollama_talk(prompt, usar_cache=False)
+        assert cliente.client.chamadas == 2, "O bypass usou o cache"
+        print("✅ Bypass chamou o modelo")
+
+        # Teste 4: limite de tamanho remove as usadas há mais tempo
+        print("\n4. Passando do limite de 2 respostas...")
+        cliente._ollama_talk(cliente._monta_prompt("outro questionário"))
+        cliente._ollama_talk(cliente._monta_prompt("mais um questionário"))
+        assert conexao.connect().zcard(cliente.cache.indice) == 2
+        cliente._ollama_talk(prompt)
+        assert cliente.client.chamadas == 5, "A resposta mais antiga não saiu"
+        print("✅ Resposta mais antiga removida")
+
+        # Teste 5: contadores
+        estatisticas = cliente.cache.estatisticas()
+        print(f"\n5. Estatísticas: {estatisticas}")
+        assert estatisticas["acertos"] == 1 and estatisticas["faltas"] == 4
+
+        # Teste 6: o acerto renova a expiração
+        print("\n6. Renovando a expiração num acerto...")
+        redis_cliente = conexao.connect()
+        chave = redis_cliente.zrange(cliente.cache.indice, -1, -1)[0]
+        redis_cliente.expire(chave, 5)
+        cliente.cache.obter(chave)
+        assert redis_cliente.ttl(chave) > 5, "O acerto não renovou a expiração"
+        print("✅ Expiração renovada")
+
+        # Teste 7: respostas expiradas saem do índice e não ocupam o limite
+        print("\n7. Guardando com uma resposta expirada no índice...")
+        cliente.cache.limite = 10  # Abaixo do limite, nada sairia por LRU
+        expirada = f"{PREFIXO}:expirada"
+        redis_cliente.zadd(cliente.cache.indice, {expirada: time.time() - 120})
+        cliente.cache.guardar(f"{PREFIXO}:nova", "resposta nova")
+        membros = redis_cliente.zrange(cliente.cache.indice, 0, -1)
+        assert expirada not in membros, "A resposta expirada ficou no índice"
+        assert len(membros) == 3, f"Respostas válidas removidas: {membros}"
+        print("✅ Resposta expirada removida do índice")
+    finally:
+        limpar(conexao, cliente.cache)
+
+    print("\n✅ Teste do cache de respostas do LLM concluído!")
+
+
+if __name__ == "__main__":
+    teste_cache_llm()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Teste do cancelamento de uma requisição ao Ollama ainda sem resposta: um
+servidor local aceita a conexão e não responde nada, como o Ollama enquanto
+avalia um prompt longo. O cancelamento precisa derrubar a conexão na hora.
+"""
+
+import os
+import sys
+import time
+import socket
+import threading
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.tools.cancelamento import OperacaoCancelada, TokenCancelamento
+
+
+def servidor_mudo():
+    """Aceita conexões e nunca responde; retorna (porta, conexões aceitas)"""
+    servidor = socket.socket()
+    servidor.bind(("127.0.0.1", 0))
+    servidor.listen()
+    conexoes = []
+
+    def aceitar():
+        while True:
+            conexao, _ = servidor.accept()
+            conexoes.append(conexao)
+
+    threading.Thread(target=aceitar, daemon=True).start()
+    return servidor.getsockname()[1], conexoes
+
+
+def teste_cancelamento_ollama():
+    """Cancela uma requisição enquanto o servidor ainda não respondeu"""
+
+    print("🧪 TESTE DO CANCELAMENTO DA REQUISIÇÃO AO OLLAMA")
+    print("=" * 50)
+
+    porta, conexoes = servidor_mudo()
+    os.environ["OLLAMA_URL"] = f"http://127.0.0.1:{porta}"
+    from src.tools.ia_preenche_forms import OllamaClient
+
+    cliente = OllamaClient()
+    cancelamento = TokenCancelamento()
+    threading.Timer(1.0, cancelamento.cancelar).start()
+
+    # Teste 1: o consumidor sai logo depois do cancelamento
+    print("\n1. Cancelando durante a 'avaliação do prompt'...")
+    inicio = time.perf_counter()
+    try:
+        list(cliente._stream_chat([{"role": "user", "content": "x"}], cancelamento))
+        raise AssertionError("A requisição não foi cancelada")
+    except OperacaoCancelada:
+        pass
+    tempo = time.perf_counter() - inicio
+    print(f"Cancelado em {tempo:.2f}s")
+    assert tempo < 1.5, "O cancelamento demorou"
+
+    # Teste 2: o servidor vê a conexão fechada (o Ollama para de processar)
+    print("\n2. Conferindo a conexão no servidor...")
+    assert len(conexoes) == 1
+    conexoes[0].settimeout(2)
+    recebido = conexoes[0].recv(65536)
+    while recebido:
+        recebido = conexoes[0].recv(65536)
+    assert not cliente.conexoes._sockets, "Sockets da requisição não liberados"
+    print("✅ Conexão fechada pelo cliente")
+
+    print("\n✅ Teste do cancelamento concluído!")
+
+
+if __name__ == "__main__":
+    teste_cancelamento_ollama()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Teste de desempenho do prompt de extração: compara quantos tokens o Ollama
+precisa avaliar a cada chamada com o layout "prefixo" (instruções e
+perguntas antes da transcrição) e com o "legado". Precisa do Ollama rodando.
+"""
+
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.tools.ia_preenche_forms import OllamaClient
+
+load_dotenv()
+
+# Mesmas perguntas que a transcrição envia ao LLM (TranscricaoAudio.questionario)
+PERGUNTAS_LLM = Path(
+    os.getenv("MODELO_PERGUNTAS", "src/models/perguntas_estruturadas_llm.json")
+)
+
+# Transcrições diferentes alternadas, como consultas seguidas
+TRANSCRICOES = [
+    "Paciente relata dor lombar há três meses, pior pela manhã. Dorme mal, "
+    "acorda às três da madrugada. Prefere bebidas quentes e sente frio nos pés.",
+    "Paciente com enxaqueca frequente do lado direito, piora com estresse. "
+    "Intestino preso, língua avermelhada e pulso rápido. Sente muita sede.",
+]
+REPETICOES = 3
+
+
+def medir_layout(cliente: OllamaClient, perguntas: str, layout: str) -> dict:
+    """
+    Faz uma chamada de aquecimento e REPETICOES chamadas alternando as
+    transcrições, medindo o prompt avaliado em cada uma.
+
+    Returns:
+        dict: Médias de prompt_eval_count e prompt_eval_ms.
+    """
+    def mensagens(transcricao):
+        mensagem = cliente._monta_mensagem_conteudo(transcricao, perguntas, layout)
+        return cliente._monta_prompt(mensagem)
+
+    cliente.medir_avaliacao_prompt(mensagens(TRANSCRICOES[-1]))
+    medidas = [
+        cliente.medir_avaliacao_prompt(mensagens(TRANSCRICOES[i % len(TRANSCRICOES)]))
+        for i in range(REPETICOES)
+    ]
+    return {
+        chave: sum(m[chave] for m in medidas) / len(medidas)
+        for chave in ("prompt_eval_count", "prompt_eval_ms")
+    }
+
+
+def teste_desempenho_prompt():
+    """Compara os layouts de prompt no Ollama"""
+
+    print("🧪 TESTE DE DESEMPENHO DO PROMPT")
+    print("=" * 50)
+
+    cliente = OllamaClient()
+    perguntas = cliente._converte_perguntas(PERGUNTAS_LLM)
+    print(f"Perguntas: {PERGUNTAS_LLM}")
+
+    # Teste 1: o início da mensagem não depende da transcrição
+    print("\n1. Conferindo o prefixo fixo...")
+    a, b = (
+        cliente._monta_mensagem_conteudo(t, perguntas, "prefixo")
+        for t in TRANSCRICOES
+    )
+    fixo = a.index("**TRANSCRIÇÃO FORNECIDA:**")
+    assert a[:fixo] == b[:fixo], "Prefixo muda com a transcrição"
+    print(f"Prefixo fixo: {fixo} caracteres")
+
+    # Teste 2: prompt avaliado por chamada em cada layout
+    print(f"\n2. Medindo no Ollama ({cliente.model_name})...")
+    resultados = {}
+    for layout in ("legado", "prefixo"):
+        resultados[layout] = medir_layout(cliente, perguntas, layout)
+        print(
+            f"   {layout:8s} {resultados[layout]['prompt_eval_count']:7.0f} tokens"
+            f" {resultados[layout]['prompt_eval_ms']:9.1f} ms"
+        )
+
+    ganho = resultados["legado"]["prompt_eval_ms"] / max(
+        resultados["prefixo"]["prompt_eval_ms"], 1e-3
+    )
+    print(f"Avaliação do prompt {ganho:.1f}x mais rápida com o prefixo fixo")
+    assert (
+        resultados["prefixo"]["prompt_eval_count"]
+        < resultados["legado"]["prompt_eval_count"]
+    ), "O cache do prefixo não foi reaproveitado"
+
+    print("\n✅ Teste de desempenho do prompt concluído!")
+
+
+if __name__ == "__main__":
+    teste_desempenho_prompt()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Teste do modo de extração JSON (LLM_FORMATO=json): schema das respostas,
+leitura do JSON em streaming e mapeamento dos IDs do LLM para o questionário
+"""
+
+import sys
+import json
+import random
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.tools.extracao_streaming import ParserRespostasJSON, montar_schema_respostas
+
+PERGUNTAS_LLM = "src/models/perguntas_estruturadas_llm.json"
+TEMPLATE = "src/models/perguntas_estruturadas.json"
+
+
+def alimentar_em_trechos(parser: ParserRespostasJSON, texto: str, semente: int):
+    """Entrega o texto ao parser em trechos de tamanho aleatório, como o stream"""
+    random.seed(semente)
+    pares, i = [], 0
+    while i < len(texto):
+        tamanho = random.randint(1, 12)
+        pares.extend(parser.alimentar(texto[i : i + tamanho]))
+        i += tamanho
+    return pares + parser.finalizar()
+
+
+def teste_extracao_json():
+    """Testa o modo de extração JSON"""
+
+    print("🧪 TESTE DA EXTRAÇÃO EM JSON")
+    print("=" * 50)
+
+    with open(PERGUNTAS_LLM, "r", encoding="utf-8") as f:
+        perguntas = json.load(f)
+    with open(TEMPLATE, "r", encoding="utf-8") as f:
+        template = json.load(f)
+    textos = {chave_id: dados["pergunta"] for chave_id, dados in perguntas.items()}
+
+    # Teste 1: schema com uma string obrigatória por pergunta
+    print("\n1. Montando o schema...")
+    schema = montar_schema_respostas(perguntas)
+    assert schema["required"] == list(perguntas)
+    assert all(p["type"] == "string" for p in schema["properties"].values())
+    print(f"✅ {len(schema['required'])} respostas no schema")
+
+    # Teste 2: todas as perguntas do LLM existem no questionário
+    print("\n2. Conferindo o mapeamento dos IDs...")
+    ids_template = {dados["pergunta"]: chave_id for chave_id, dados in template.items()}
+    sem_par = [i for i, texto in textos.items() if texto not in ids_template]
+    assert not sem_par, f"Perguntas sem par no questionário: {sem_par}"
+    print(f"✅ {len(textos)} IDs do LLM mapeados no questionário")
+
+    # Teste 3: stream em trechos aleatórios, com <think> e aspas escapadas
+    print("\n3. Lendo o JSON em streaming...")
+    respostas = {i: f'Resposta {i} com "aspas"' for i in perguntas}
+    respostas["05"] = "NDA"
+    resposta_llm = (
+        '<think>{"01": "rascunho"}</think>\n'
+        + json.dumps(respostas, ensure_ascii=False, indent=2)
+    )
+    esperado = {textos[i]: r for i, r in respostas.items()}
+    for semente in range(20):
+        pares = alimentar_em_trechos(ParserRespostasJSON(textos), resposta_llm, semente)
+        assert dict(pares) == esperado, f"Respostas diferentes (semente {semente})"
+        assert len(pares) == len(esperado), "Resposta entregue mais de uma vez"
+    print("✅ Respostas iguais às do json.loads em todas as divisões")
+
+    # Teste 4: JSON cortado entrega só as respostas completas
+    print("\n4. Lendo um JSON incompleto...")
+    cortado = resposta_llm[: resposta_llm.index('"03"') + 12]
+    pares = alimentar_em_trechos(ParserRespostasJSON(textos), cortado, 0)
+    assert [p for p, _ in pares] == [textos["01"], textos["02"]]
+    print("✅ Só as respostas completas foram entregues")
+
+    print("\n✅ Teste da extração em JSON concluído!")
+
+
+if __name__ == "__main__":
+    teste_extracao_json()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Teste da leitura em streaming das respostas do LLM (ParserRespostas):
+trechos partidos em qualquer ponto, blocos <think> partidos entre trechos
+e respostas na mesma linha da pergunta
+"""
+
+import sys
+import random
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.tools.extracao_streaming import ParserRespostas
+
+PERGUNTAS = [
+    "Qual a idade do paciente?",
+    "Quais são as principais queixas do paciente?",
+    "Observações sobre:",
+    "Observações sobre a língua:",
+]
+
+# Formato pedido no prompt, com <think> do deepseek-r1 no começo
+RESPOSTA_LLM = (
+    "<think>O paciente disse **Pergunta:** Qual a idade do paciente?\n"
+    "talvez 30</think>\n"
+    "**Pergunta:** Qual a idade do paciente?\n"
+    "[45 anos]\n"
+    "\n"
+    "\n"
+    "**Pergunta:** Quais são as principais queixas do paciente?\n"
+    "Dor lombar há três meses,\n"
+    "pior pela manhã\n"
+    "\n"
+    "**Observações sobre a língua:** Avermelhada, sem saburra\n"
+    "\n"
+    "**Pergunta:** Observações sobre:\n"
+    "NDA\n"
+)
+
+ESPERADO = {
+    "Qual a idade do paciente?": "45 anos",
+    "Quais são as principais queixas do paciente?": "Dor lombar há três meses, pior pela manhã",
+    "Observações sobre a língua:": "Avermelhada, sem saburra",
+    "Observações sobre:": "NDA",
+}
+
+
+def alimentar_em_trechos(texto: str, semente: int):
+    """Entrega o texto em trechos de tamanho aleatório, como o stream do Ollama"""
+    random.seed(semente)
+    parser = ParserRespostas(PERGUNTAS)
+    pares, i = [], 0
+    while i < len(texto):
+        tamanho = random.randint(1, 9)
+        pares.extend(parser.alimentar(texto[i : i + tamanho]))
+        i += tamanho
+    return parser, pares + parser.finalizar()
+
+
+def teste_extracao_streaming():
+    """Testa o ParserRespostas"""
+
+    print("🧪 TESTE DA EXTRAÇÃO EM STREAMING")
+    print("=" * 50)
+
+    # Teste 1: tudo de uma vez
+    print("\n1. Resposta inteira num só trecho...")
+    parser = ParserRespostas(PERGUNTAS)
+    pares = parser.alimentar(RESPOSTA_LLM) + parser.finalizar()
+    assert dict(pares) == ESPERADO, f"Respostas diferentes: {dict(pares)}"
+    print(f"✅ {len(pares)} respostas extraídas")
+
+    # Teste 2: trechos partidos em qualquer ponto (inclusive dentro de <think>)
+    print("\n2. Trechos de tamanho aleatório...")
+    for semente in range(50):
+        parser, pares = alimentar_em_trechos(RESPOSTA_LLM, semente)
+        assert parser.respostas == ESPERADO, f"Semente {semente}: {parser.respostas}"
+        assert "talvez 30" not in [r for _, r in pares], "Leu dentro do <think>"
+    print("✅ Mesmas respostas em todas as divisões")
+
+    # Teste 3: a resposta sai assim que fica completa, não só no fim
+    print("\n3. Entrega antes do fim do stream...")
+    parser = ParserRespostas(PERGUNTAS)
+    corte = RESPOSTA_LLM.index("**Pergunta:** Quais")
+    pares = parser.alimentar(RESPOSTA_LLM[:corte])
+    assert pares == [("Qual a idade do paciente?", "45 anos")], pares
+    print("✅ Primeira resposta entregue antes da segunda pergunta")
+
+    # Teste 4: pergunta e resposta na mesma linha, sem rótulo 'Pergunta:'
+    print("\n4. Resposta na mesma linha...")
+    parser = ParserRespostas(PERGUNTAS)
+    pares = parser.alimentar("**Qual a idade do paciente?** 52 anos\n\n")
+    pares += parser.finalizar()
+    assert pares == [("Qual a idade do paciente?", "52 anos")], pares
+    print("✅ Resposta na mesma linha reconhecida")
+
+    # Teste 5: pergunta desconhecida não herda a resposta anterior
+    print("\n5. Pergunta desconhecida...")
+    parser = ParserRespostas(PERGUNTAS)
+    pares = parser.alimentar(
+        "**Pergunta:** Qual a idade do paciente?\n30\n"
+        "**Pergunta:** Qual a cor preferida?\nazul\n"
+    )
+    pares += parser.finalizar()
+    assert pares == [("Qual a idade do paciente?", "30")], pares
+    print("✅ Resposta de pergunta desconhecida ignorada")
+
+    print("\n✅ Teste da extração em streaming concluído!")
+
+
+if __name__ == "__main__":
+    teste_extracao_streaming()
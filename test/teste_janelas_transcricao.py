@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Teste das janelas lidas do disco na transcrição de arquivos longos: com
+fala contínua, os segmentos costurados cobrem o áudio inteiro, sem buracos
+nem repetições nos cortes entre janelas
+"""
+
+import os
+import sys
+import random
+import tempfile
+import numpy as np
+import soundfile as sf
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.tools.transcricao import TranscricaoAudio
+from src.tools.audio_transcricao import TAXA_WHISPER, CHUNK_WHISPER_S
+
+DURACAO_S = 437.3
+
+
+def whisperx_falso(audio, cancelamento=None):
+    """
+    Imita o WhisperX com fala do começo ao fim da janela: segmentos de até
+    30 s (um chunk do VAD), começando no início do áudio recebido
+    """
+    duracao = len(audio) / TAXA_WHISPER
+    segmentos, inicio = [], 0.0
+    while inicio < duracao:
+        fim = min(inicio + random.uniform(5.0, CHUNK_WHISPER_S), duracao)
+        segmentos.append({"text": f"fala {inicio:.1f}", "start": inicio, "end": fim})
+        inicio = fim
+    return {"segments": segmentos}
+
+
+def lacunas(segmentos: list, duracao: float, tolerancia: float = 0.01) -> list:
+    """Trechos do áudio sem segmento ou com dois segmentos ao mesmo tempo"""
+    problemas, coberto = [], 0.0
+    for segmento in segmentos:
+        if abs(segmento["start"] - coberto) > tolerancia:
+            problemas.append((round(coberto, 2), segmento["start"]))
+        coberto = segmento["end"]
+    if abs(coberto - duracao) > tolerancia:
+        problemas.append((round(coberto, 2), duracao))
+    return problemas
+
+
+def teste_janelas_transcricao():
+    """Costura janelas sintéticas e confere a cobertura do áudio"""
+
+    print("🧪 TESTE DAS JANELAS DA TRANSCRIÇÃO")
+    print("=" * 50)
+
+    pasta = tempfile.mkdtemp()
+    caminho = os.path.join(pasta, "sessao_completo.wav")
+    ruido = np.random.default_rng(0).normal(0, 0.1, int(DURACAO_S * TAXA_WHISPER))
+    sf.write(caminho, ruido.astype(np.float32), TAXA_WHISPER, subtype="PCM_16")
+
+    transcritor = TranscricaoAudio()
+    transcritor._transcrever = whisperx_falso
+    transcritor.blocos_acima_s = 60  # Força a leitura em blocos do disco
+
+    for janela_s in (45.0, 120.0):
+        for semente in range(5):
+            print(f"\n🔹 Janela de {janela_s:.0f}s, semente {semente}...")
+            random.seed(semente)
+            transcritor.janela_s = janela_s
+            segmentos = list(transcritor.transcrever_segmentos(caminho, salvar=False))
+            problemas = lacunas(segmentos, DURACAO_S)
+            print(f"   {len(segmentos)} segmentos, problemas: {problemas or 'nenhum'}")
+            assert not problemas, f"Fala perdida ou repetida em {problemas}"
+
+    os.remove(caminho)
+    print("\n✅ Teste das janelas da transcrição concluído!")
+
+
+if __name__ == "__main__":
+    teste_janelas_transcricao()
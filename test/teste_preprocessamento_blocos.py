@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Teste do pré-processamento em blocos (streaming): o arquivo gerado precisa
+ser igual ao do processamento do áudio inteiro em memória, com e sem
+redução de ruído
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+import soundfile as sf
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.setup_audio.preprocessador_audio import PreprocessadorAudio
+
+TOLERANCIA = 1e-4
+
+
+def gerar_audio(caminho: str, rate: int = 16000, segundos: float = 6.0):
+    """Voz sintética (tons na faixa da fala) com ruído de fundo, em estéreo"""
+    rng = np.random.default_rng(7)
+    t = np.arange(int(rate * segundos)) / rate
+    voz = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.2 * np.sin(2 * np.pi * 1500 * t)
+    voz[: rate] = 0.0  # Primeiro segundo só com ruído, para o perfil
+    ruido = 0.05 * rng.standard_normal(len(t))
+    sinal = (voz + ruido).astype(np.float32)
+    sf.write(caminho, np.column_stack([sinal, sinal * 0.9]), rate)
+
+
+def processar(preprocessador, caminho, **kwargs):
+    """Processa e devolve as amostras do arquivo gerado"""
+    saida = preprocessador.processar(caminho, **kwargs)
+    data, _ = sf.read(saida, dtype="float32")
+    os.remove(saida)
+    return data
+
+
+def teste_preprocessamento_blocos():
+    """Compara o modo em blocos com o processamento em memória"""
+
+    print("🧪 TESTE DO PRÉ-PROCESSAMENTO EM BLOCOS")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "sessao.wav")
+        gerar_audio(caminho)
+        original, _ = sf.read(caminho, dtype="float32")
+
+        for reducao_ruido in (False, True):
+            rotulo = "com" if reducao_ruido else "sem"
+            print(f"\n{'2' if reducao_ruido else '1'}. {rotulo.capitalize()} redução de ruído...")
+            preprocessador = PreprocessadorAudio(reducao_ruido=reducao_ruido)
+
+            em_memoria = processar(preprocessador, caminho)
+            assert "realce" in preprocessador.tempos, "Processamento em memória falhou"
+            assert em_memoria.ndim == 1 and len(em_memoria) == len(original)
+            assert not np.allclose(em_memoria, original[:, 0], atol=TOLERANCIA), (
+                "Saída igual ao original (cópia de fallback?)"
+            )
+
+            # Blocos de tamanhos que não dividem o arquivo, inclusive bem pequenos
+            for tamanho_bloco in (1000, 4097, 65536):
+                em_blocos = processar(
+                    preprocessador, caminho, streaming=True, tamanho_bloco=tamanho_bloco
+                )
+                assert "realce" in preprocessador.tempos, "Processamento em blocos falhou"
+                assert em_blocos.shape == em_memoria.shape, (
+                    f"Tamanhos diferentes: {em_blocos.shape} != {em_memoria.shape}"
+                )
+                diferenca = float(np.max(np.abs(em_blocos - em_memoria)))
+                print(f"Bloco {tamanho_bloco}: diferença máxima {diferenca:.2e}")
+                assert diferenca <= TOLERANCIA, (
+                    f"Bloco {tamanho_bloco} {rotulo} redução de ruído: "
+                    f"diferença {diferenca:.2e} acima da tolerância"
+                )
+            print(f"✅ Blocos iguais ao processamento em memória ({rotulo} redução de ruído)")
+
+    print("\n✅ Teste do pré-processamento em blocos concluído!")
+
+
+if __name__ == "__main__":
+    teste_preprocessamento_blocos()
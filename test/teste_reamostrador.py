@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Teste do reamostrador polifásico usado na captura em 16 kHz
+"""
+
+import sys
+import numpy as np
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+from src.setup_audio.reamostrador import ReamostradorPolifasico
+
+
+def teste_reamostrador():
+    """Testa se a reamostragem por blocos equivale à do sinal inteiro"""
+
+    print("🧪 TESTE DO REAMOSTRADOR 44.1 kHz -> 16 kHz")
+    print("=" * 50)
+
+    fs = 44100
+    t = np.arange(fs * 2) / fs
+    sinal = (
+        8000 * np.sin(2 * np.pi * 440 * t) + 2000 * np.sin(2 * np.pi * 12000 * t)
+    ).astype(np.int16)
+    estereo = np.stack([sinal, sinal], axis=1)
+
+    reamostrador = ReamostradorPolifasico(fs, 16000)
+
+    # Teste 1: sinal inteiro de uma vez
+    print("\n1. Reamostrando o sinal inteiro...")
+    inteiro = reamostrador.processar(estereo)
+    print(f"Frames de saída: {len(inteiro)}")
+    assert len(inteiro) == 32000
+
+    # Teste 2: blocos de tamanhos variados devem gerar a mesma saída
+    print("\n2. Reamostrando em blocos de tamanho variado...")
+    reamostrador.reiniciar()
+    rng = np.random.default_rng(0)
+    blocos, i = [], 0
+    while i < len(estereo):
+        n = int(rng.integers(1, 2048))
+        blocos.append(reamostrador.processar(estereo[i:i + n]))
+        i += n
+    por_blocos = np.concatenate(blocos)
+    assert np.array_equal(inteiro, por_blocos)
+
+    # Teste 3: o tom de 12 kHz não pode reaparecer como alias em 4 kHz
+    print("\n3. Conferindo o filtro anti-aliasing...")
+    espectro = np.abs(np.fft.rfft(inteiro[4000:20000, 0].astype(float))) / 8000
+    freqs = np.fft.rfftfreq(16000, 1 / 16000)
+    tom = espectro[np.argmin(np.abs(freqs - 440))]
+    alias = espectro[np.argmin(np.abs(freqs - 4000))]
+    print(f"Tom 440 Hz: {tom:.0f}, alias 4 kHz: {alias:.1f}")
+    assert tom > 7900 and alias < 10
+
+    print("\n✅ Teste do reamostrador concluído!")
+
+
+if __name__ == "__main__":
+    teste_reamostrador()
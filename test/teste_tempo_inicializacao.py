@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Teste do tempo de inicialização: a tela de gravação não pode importar as
+dependências pesadas (torch, whisperx, ollama, redis, scipy.signal)
+"""
+
+import os
+import sys
+import subprocess
+sys.path.append('/media/Dados/MVP_Acupuntura')
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos carregados ao abrir a aplicação (main.py -> tela_inicial)
+MODULOS_INICIAIS = [
+    "src.tools.transcricao",
+    "src.gui.questionario",
+    "src.tools.modelo_whisper",
+    "src.tools.redis_connection",
+    "src.tools.tools_system",
+]
+
+# Só podem ser importados quando a transcrição ou o LLM forem usados
+PESADOS = ["torch", "whisperx", "ollama", "redis", "scipy.signal", "requests"]
+
+LIMITE_MS = float(os.getenv("LIMITE_INICIALIZACAO_MS", "300"))
+
+
+def medir_importacao(modulos: list):
+    """
+    Importa os módulos num interpretador novo com -X importtime.
+
+    Returns:
+        tuple: (tempo total em ms, dict módulo -> tempo acumulado em ms).
+    """
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    saida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    acumulado, total_ms = {}, 0.0
+    for linha in saida.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, total, nome = linha.split("|")
+        acumulado.setdefault(nome.strip(), int(total) / 1000)
+        # Filhos aparecem indentados; só o nível mais alto entra no total
+        if not nome.startswith("  "):
+            total_ms += int(total) / 1000
+    return total_ms, acumulado
+
+
+def teste_tempo_inicializacao():
+    """Mede a importação dos módulos da tela inicial"""
+
+    print("🧪 TESTE DO TEMPO DE INICIALIZAÇÃO")
+    print("=" * 50)
+
+    # Teste 1: nenhuma dependência pesada na importação
+    print("\n1. Conferindo as dependências importadas...")
+    total_ms, acumulado = medir_importacao(MODULOS_INICIAIS)
+    importados = [m for m in PESADOS if m in acumulado]
+    print(f"Pesados importados: {importados or 'nenhum'}")
+    assert not importados, f"Importados na inicialização: {importados}"
+
+    # Teste 2: tempo total de importação
+    print("\n2. Medindo o tempo de importação...")
+    maiores = sorted(acumulado.items(), key=lambda x: x[1], reverse=True)[:5]
+    for nome, ms in maiores:
+        print(f"   {nome:40s} {ms:8.1f} ms")
+    print(f"Total: {total_ms:.1f} ms (limite {LIMITE_MS:.0f} ms)")
+    assert total_ms < LIMITE_MS, f"Inicialização lenta: {total_ms:.1f} ms"
+
+    print("\n✅ Teste do tempo de inicialização concluído!")
+
+
+if __name__ == "__main__":
+    teste_tempo_inicializacao()